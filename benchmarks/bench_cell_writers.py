@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+bench_cell_writers.py — SWMS_BASE_GENERAL 9pt cell writer benchmark
+
+Times the per-cell cost of the four 9pt cell writers two ways:
+
+  legacy     — the previous python-docx writers: remove paragraphs through
+               cell.paragraphs, add_paragraph()/add_run(), then set
+               font.size / font.name / font.bold / font.color.rgb one
+               property at a time; parse_xml() for every risk w:shd
+  prototype  — the current writers: raw lxml on the w:tc, run rPr and
+               risk shd deep-copied from the prototype cache
+
+Each writer is run on the same cell content both ways and must produce
+identical XML.
+
+USAGE:
+    python benchmarks/bench_cell_writers.py
+    python benchmarks/bench_cell_writers.py --cells 2000 --repeat 10
+"""
+
+import argparse
+import os
+import sys
+import time
+from docx import Document
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import qn, nsdecls
+from docx.shared import Pt, RGBColor
+from lxml import etree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'src'))
+import SWMS_BASE_GENERAL as base  # noqa: E402
+
+TEXT = 'Barricade exclusion zone\nSignage at every entry\tpoint'
+CCVS_TEXT = ('CCVS HOLD POINTS Work must not commence until:\n'
+             '1. Anchors tested. STOP WORK: if any anchor fails.\n'
+             'Engineering: guardrails. Admin: permit. PPE: harness.')
+
+
+# ── Legacy writers (replicas of the pre-prototype implementation) ──────────
+
+def legacy_text_cell(cell, text):
+    for para in cell.paragraphs:
+        p = para._element
+        p.getparent().remove(p)
+    para = cell.add_paragraph()
+    run = para.add_run(text)
+    run.font.size = Pt(9)
+    run.font.name = "Calibri"
+
+
+def legacy_ccvs_cell(cell, text):
+    def _add_run(para, txt, bold=False, highlight=False):
+        if not txt:
+            return
+        run = para.add_run(txt)
+        run.font.size = Pt(9)
+        run.font.name = "Calibri"
+        run.font.bold = bold
+        if highlight:
+            rPr = run._r.get_or_add_rPr()
+            hl = OxmlElement("w:highlight")
+            hl.set(qn("w:val"), "yellow")
+            rPr.append(hl)
+
+    for para in cell.paragraphs:
+        para._element.getparent().remove(para._element)
+    para = cell.add_paragraph()
+    cursor = 0
+    for start, end, index in base._CCVS_CELL_MATCHER.finditer(text):
+        if start > cursor:
+            _add_run(para, text[cursor:start], bold=False)
+        _add_run(para, text[start:end], bold=True, highlight=index == 0)
+        cursor = end
+    if cursor < len(text):
+        _add_run(para, text[cursor:], bold=False)
+
+
+def legacy_risk_cell(cell, score):
+    risk_label, hex_color = base.RISK_SCORES[score]
+    tcPr = cell._element.get_or_add_tcPr()
+    for shd in tcPr.findall(qn("w:shd")):
+        tcPr.remove(shd)
+    tcPr.append(parse_xml(
+        f'<w:shd {nsdecls("w")} w:val="clear" w:color="auto" w:fill="{hex_color}"/>'
+    ))
+    for para in cell.paragraphs:
+        p = para._element
+        p.getparent().remove(p)
+    para = cell.add_paragraph()
+    run = para.add_run(risk_label)
+    run.font.size = Pt(9)
+    run.font.name = "Calibri"
+    run.font.bold = True
+    run.font.color.rgb = (
+        RGBColor(255, 255, 255) if hex_color == "FF0000" else RGBColor(0, 0, 0)
+    )
+
+
+def legacy_short_code_cell(cell, audit, pre):
+    prefix, suffix = base._generate_short_code(audit, pre)
+    for para in cell.paragraphs:
+        p = para._element
+        p.getparent().remove(p)
+    para = cell.add_paragraph()
+    for text, bold in ((prefix, False), (suffix, suffix.startswith("H"))):
+        run = para.add_run(text)
+        run.font.size = Pt(9)
+        run.font.name = "Calibri"
+        run.font.bold = bold
+        run.font.color.rgb = RGBColor(0, 0, 0)
+
+
+WRITERS = [
+    # name, legacy, prototype, args for cell i
+    ('text', legacy_text_cell, base._set_cell_text_9pt,
+     lambda i: (TEXT,)),
+    ('ccvs', legacy_ccvs_cell, base._set_cell_text_9pt_ccvs,
+     lambda i: (CCVS_TEXT,)),
+    ('risk', legacy_risk_cell, base._inject_risk_cell,
+     lambda i: ((1, 3, 6, 9)[i % 4],)),
+    ('short code', legacy_short_code_cell, base._write_short_code_cell,
+     lambda i: ('STD-6-3-WAH', (2, 4, 6)[i % 3])),
+]
+
+
+def make_cells(n_cells):
+    """Return n_cells python-docx cells in a fresh one-column table."""
+    doc = Document()
+    table = doc.add_table(rows=n_cells, cols=1)
+    return [row.cells[0] for row in table.rows]
+
+
+def time_writer(writer, args_for, n_cells, repeat):
+    """Return (best seconds per cell, xml of the written cells)."""
+    best = None
+    for _ in range(repeat):
+        cells = make_cells(n_cells)
+        start = time.perf_counter()
+        for i, cell in enumerate(cells):
+            writer(cell, *args_for(i))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    xml = b''.join(etree.tostring(cell._tc) for cell in cells)
+    return best / n_cells, xml
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    ap.add_argument('--cells', type=int, default=500,
+                    help='cells written per timed repetition (default 500)')
+    ap.add_argument('--repeat', type=int, default=5,
+                    help='timed repetitions, best is reported (default 5)')
+    args = ap.parse_args()
+
+    print(f'Per-cell cost over {args.cells} cells (best of {args.repeat}):')
+    print(f'  {"writer":<12}{"legacy":>12}{"prototype":>12}')
+    for name, legacy, proto, args_for in WRITERS:
+        old_t, old_xml = time_writer(legacy, args_for, args.cells, args.repeat)
+        new_t, new_xml = time_writer(proto, args_for, args.cells, args.repeat)
+        if old_xml != new_xml:
+            print(f'ERROR: {name} legacy and prototype output differ')
+            sys.exit(1)
+        print(f'  {name:<12}{old_t * 1e6:>9.1f} us{new_t * 1e6:>9.1f} us'
+              f'   ({old_t / new_t:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
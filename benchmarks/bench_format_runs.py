@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+bench_format_runs.py — format_swms run-splitting benchmark
+
+Two cases, each timed two ways:
+
+  rewrite  — format_swms.rewrite_runs(): collect replacements, rebuild
+             the paragraph's child list once
+  legacy   — the previous approach (_split_and_insert): per match,
+             list(p).index(r), p.remove(r) and p.insert() for each
+             replacement run
+
+Paragraph — a synthetic paragraph of N runs (default 200) where every run
+needs splitting, the shape of a long CCVS control cell. Only the run
+splitting differs between the two timings: the label rule's run pass and
+the run rules are applied to the detached paragraph with each splitter.
+
+Document — docs/SWMS_Template.docx populated for a real job (default:
+screed pump, ~590 paragraphs) and formatted whole: format_swms() against
+the per-rule functions with the legacy splitter. This is the equivalence
+check over every paragraph; its timing also includes the single pass
+over the paragraphs, so it is not a measure of run splitting alone.
+
+Both cases must produce identical counts and identical XML.
+
+USAGE:
+    python benchmarks/bench_format_runs.py
+    python benchmarks/bench_format_runs.py --runs 1000 --repeat 20
+    python benchmarks/bench_format_runs.py --job 22smith
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import os
+import sys
+import time
+from lxml import etree
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+import format_swms as fs  # noqa: E402
+import swms_22smith_spalling  # noqa: E402
+import swms_screed_pump  # noqa: E402
+from SWMS_BASE_GENERAL import _build_document  # noqa: E402
+from swms_docx_io import clone_document  # noqa: E402
+
+TEMPLATE = os.path.join(ROOT, 'docs', 'SWMS_Template.docx')
+JOBS = {
+    'screed': swms_screed_pump,
+    '22smith': swms_22smith_spalling,
+}
+
+# The baseline format_swms() call sequence
+PER_RULE = [
+    ('p2_normalise', fs.normalise_p2_respirator),
+    ('em_dashes', fs.bold_em_dashes),
+    ('fonts', fs.standardise_fonts),
+    ('labels', fs.bold_control_labels),
+    ('sub_labels', fs.bold_sub_labels),
+    ('italic_desc', fs.italic_bracketed_descriptions),
+    ('emergency', fs.highlight_emergency_response),
+]
+
+
+def make_document(job_name):
+    """Return the populated, unformatted document for a job."""
+    job = JOBS[job_name]
+    with contextlib.redirect_stdout(io.StringIO()):
+        doc, _ = _build_document(
+            TEMPLATE, job.TASKS, job.PROJECT, job.PPE_CONTENT,
+            job.PERMITS_CONTENT, job.QUALS_CONTENT, job.PLANT_CONTENT,
+            job.SUBSTANCES_CONTENT, job.LEGISLATION_APPEND, bullets=False,
+        )
+    return doc
+
+
+# One run per entry — each triggers at least one rule
+RUN_TEXTS = [
+    'Engineering: barricade exclusion zone — signage at entry',
+    'Anchor verification: test each anchor before use',
+    'Inspect plant [pre-start checklist] before operation',
+    'Emergency Response per site plan — muster at gate',
+]
+
+RUN_RULES = [fs.RULE_EM_DASHES, fs.RULE_SUB_LABELS,
+             fs.RULE_ITALIC_DESC, fs.RULE_EMERGENCY]
+
+
+def make_paragraph(n_runs):
+    """Return a w:p with n_runs runs cycling through RUN_TEXTS."""
+    p = etree.Element(fs.W_P)
+    for i in range(n_runs):
+        r = etree.SubElement(p, fs.W_R)
+        rPr = etree.SubElement(r, fs.W_RPR)
+        etree.SubElement(rPr, fs.W_RFONTS).set(fs.qn('w:ascii'), 'Aptos')
+        t = etree.SubElement(r, fs.W_T)
+        t.text = RUN_TEXTS[i % len(RUN_TEXTS)]
+    return p
+
+
+def legacy_rewrite_runs(p, rewrite):
+    """Replica of the pre-rewrite strategy: index lookup + remove +
+    insert for every run that is split."""
+    count = 0
+    for r in list(p.findall(fs.W_R)):
+        result = rewrite(r)
+        if result is None:
+            continue
+        runs, n = result
+        idx = list(p).index(r)
+        p.remove(r)
+        for run in runs:
+            p.insert(idx, run)
+            idx += 1
+        count += n
+    return count
+
+
+@contextlib.contextmanager
+def legacy_splitting():
+    """Swap format_swms.rewrite_runs for the legacy splitter."""
+    saved = fs.rewrite_runs
+    fs.rewrite_runs = legacy_rewrite_runs
+    try:
+        yield
+    finally:
+        fs.rewrite_runs = saved
+
+
+def format_paragraph(p, rewrite_runs):
+    """Apply the run rules plus the label rule's run pass to p."""
+    ctx = fs._FormatContext()
+    count = rewrite_runs(p, fs._label_run)
+    for rule in RUN_RULES:
+        count += rewrite_runs(p, lambda r: rule.handler(r, ctx))
+    return count
+
+
+def time_paragraph(proto, rewrite_runs, repeat):
+    """Return (best seconds, count, result xml) over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        p = copy.deepcopy(proto)
+        start = time.perf_counter()
+        count = format_paragraph(p, rewrite_runs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count, etree.tostring(p)
+
+
+def format_legacy(doc):
+    """Run each rule over the whole document in turn, splitting in place."""
+    with legacy_splitting():
+        return {key: rule(doc) for key, rule in PER_RULE}
+
+
+def time_document(proto, format_doc, repeat):
+    """Return (best seconds, counts, body xml) over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        doc = clone_document(proto)
+        start = time.perf_counter()
+        counts = format_doc(doc)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, counts, etree.tostring(doc.element.body)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    ap.add_argument('--runs', type=int, default=200,
+                    help='runs in the synthetic paragraph (default 200)')
+    ap.add_argument('--job', choices=sorted(JOBS), default='screed',
+                    help='job to populate the template for (default screed)')
+    ap.add_argument('--repeat', type=int, default=10,
+                    help='timed repetitions, best is reported (default 10)')
+    args = ap.parse_args()
+
+    # ── Paragraph: run splitting alone ──
+    proto = make_paragraph(args.runs)
+    new_t, new_n, new_xml = time_paragraph(proto, fs.rewrite_runs,
+                                           args.repeat)
+    old_t, old_n, old_xml = time_paragraph(proto, legacy_rewrite_runs,
+                                           args.repeat)
+    if (new_n, new_xml) != (old_n, old_xml):
+        print('ERROR: paragraph rewrite and legacy output differ')
+        sys.exit(1)
+
+    print(f'Paragraph: {args.runs} runs -> {len(etree.fromstring(new_xml))}'
+          f' runs, {new_n} splits')
+    print(f'  legacy   {old_t * 1000:8.2f} ms')
+    print(f'  rewrite  {new_t * 1000:8.2f} ms   ({old_t / new_t:.1f}x)')
+
+    # ── Document: whole-document equivalence ──
+    proto = make_document(args.job)
+    paragraphs = sum(1 for _ in proto.element.body.iter(fs.W_P))
+    with contextlib.redirect_stdout(io.StringIO()):
+        new_t, new_n, new_xml = time_document(proto, fs.format_swms,
+                                              args.repeat)
+        old_t, old_n, old_xml = time_document(proto, format_legacy,
+                                              args.repeat)
+
+    if (new_n, new_xml) != (old_n, old_xml):
+        print('ERROR: document rewrite and legacy output differ')
+        sys.exit(1)
+
+    print(f'\nDocument: {args.job}, {paragraphs} paragraphs, '
+          f'{sum(new_n.values())} changes')
+    for key, n in new_n.items():
+        print(f'  {key:<13s} {n:5d}')
+    print(f'  legacy   {old_t * 1000:8.2f} ms')
+    print(f'  rewrite  {new_t * 1000:8.2f} ms   ({old_t / new_t:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+bench_numbering.py — build_swms numbering strategy comparison
+
+Builds the same master SWMS under each build_all_swms numbering strategy
+and reports numbering.xml size and definition counts, .docx size, build
+time and open time:
+
+  per-task  — one decimal + one bullet abstractNum/num pair per CCVS task
+              and per fixed reused row (the original builder output)
+  shared    — one abstractNum per list style; each hold-point list gets
+              a <w:num> with a startOverride, bullets share one <w:num>
+
+Workloads: the 20-task Abrasive Blasting master from BUILDS plus
+synthetic masters of N new CCVS tasks (default 20, 50, 200).
+
+Open time is python-docx Document() on the saved file followed by
+resolving every list paragraph's numId to its level-0 numFmt — what a
+renderer does for each list item. Word itself cannot be timed here; this
+is the proxy that scales with numbering.xml the same way.
+
+Requires the master template (build_all_swms.TEMPLATE).
+
+USAGE:
+    python benchmarks/bench_numbering.py
+    python benchmarks/bench_numbering.py --ccvs 20 100 --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import build_all_swms as B                   # noqa: E402
+from docx import Document                        # noqa: E402
+from docx.oxml.ns import qn                      # noqa: E402
+
+import bench_suite                               # noqa: E402
+
+
+def ccvs_task_list(size):
+    """(task_list, new_tasks_dict) of size new CCVS rows."""
+    _, new_tasks = bench_suite.master_task_list(1)
+    keys = sorted(k for k, t in new_tasks.items() if t['type'] == 'CCVS')
+    return [('new', keys[i % len(keys)]) for i in range(size)], new_tasks
+
+
+def workloads(sizes):
+    """[(label, task_list, new_tasks_dict)]"""
+    name, _, tasks, new_dict = next(b for b in B.BUILDS
+                                    if b[0] == 'Abrasive Blasting')
+    loads = [(f'{name} ({len(tasks)} tasks)', tasks, new_dict)]
+    for size in sizes:
+        task_list, new_tasks = ccvs_task_list(size)
+        loads.append((f'{size} CCVS tasks', task_list, new_tasks))
+    return loads
+
+
+def open_document(path):
+    """Load path and resolve every list paragraph's numFmt; return count."""
+    doc = Document(path)
+    numbering = doc.part.numbering_part.element
+    abs_fmt = {}
+    for absNum in numbering.findall(qn('w:abstractNum')):
+        fmt = absNum.find(f"{qn('w:lvl')}/{qn('w:numFmt')}")
+        abs_fmt[absNum.get(qn('w:abstractNumId'))] = (
+            fmt.get(qn('w:val')) if fmt is not None else None)
+    num_fmt = {num.get(qn('w:numId')):
+               abs_fmt.get(num.find(qn('w:abstractNumId')).get(qn('w:val')))
+               for num in numbering.findall(qn('w:num'))}
+    resolved = 0
+    for numId in doc.element.body.iter(qn('w:numId')):
+        if num_fmt.get(numId.get(qn('w:val'))) is not None:
+            resolved += 1
+    return resolved
+
+
+def best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure(strategy, task_list, new_tasks, workdir, repeat):
+    filename = f'numbering_{strategy}.docx'
+    path = os.path.join(workdir, filename)
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_t = best_of(lambda: B.build_swms(
+            'Benchmark', filename, task_list, new_tasks,
+            numbering_strategy=strategy), repeat)
+    with zipfile.ZipFile(path) as z:
+        numbering_xml = z.read('word/numbering.xml')
+    numbering = Document(path).part.numbering_part.element
+    open_document(path)   # warm-up
+    return {
+        'numbering_kb': len(numbering_xml) / 1024,
+        'abstract_nums': len(numbering.findall(qn('w:abstractNum'))),
+        'nums': len(numbering.findall(qn('w:num'))),
+        'docx_kb': os.path.getsize(path) / 1024,
+        'build_ms': build_t * 1000,
+        'open_ms': best_of(lambda: open_document(path), repeat) * 1000,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    ap.add_argument('--ccvs', type=int, nargs='+', default=[20, 50, 200],
+                    help='synthetic CCVS task counts (default 20 50 200)')
+    ap.add_argument('--repeat', type=int, default=3,
+                    help='timed repetitions, best is reported (default 3)')
+    args = ap.parse_args()
+
+    if not os.path.exists(B.TEMPLATE):
+        print(f'SKIP: master template not found: {B.TEMPLATE}')
+        return 0
+
+    print(f"{'workload':<34}{'strategy':<10}{'numbering':>11}{'abs':>6}"
+          f"{'num':>6}{'docx':>11}{'build':>11}{'open':>10}")
+    with tempfile.TemporaryDirectory(prefix='swms_numbering_') as workdir:
+        B.OUTDIR = workdir
+        for label, task_list, new_tasks in workloads(args.ccvs):
+            rows = {s: measure(s, task_list, new_tasks, workdir, args.repeat)
+                    for s in ('per-task', 'shared')}
+            for strategy, m in rows.items():
+                print(f"{label:<34}{strategy:<10}{m['numbering_kb']:>8.1f} KB"
+                      f"{m['abstract_nums']:>6}{m['nums']:>6}"
+                      f"{m['docx_kb']:>8.1f} KB{m['build_ms']:>8.1f} ms"
+                      f"{m['open_ms']:>7.1f} ms")
+                label = ''
+            old, new = rows['per-task'], rows['shared']
+            print(f"{'':<34}{'change':<10}"
+                  f"{(new['numbering_kb'] / old['numbering_kb'] - 1) * 100:>+9.1f}%"
+                  f"{'':>12}{(new['docx_kb'] / old['docx_kb'] - 1) * 100:>+9.1f}%"
+                  f"{(new['build_ms'] / old['build_ms'] - 1) * 100:>+10.1f}%"
+                  f"{(new['open_ms'] / old['open_ms'] - 1) * 100:>+9.1f}%")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
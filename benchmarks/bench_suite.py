@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+bench_suite.py — end-to-end SWMS pipeline benchmark suite
+
+Synthetic workloads of 10, 50, 200 and 1000 tasks, built from the
+swms_generator *_NEW task dicts converted to SWMS_BASE_GENERAL job dicts
+(SWMS_TASK_LIBRARY.md shape: task / hazard / pre / controls /
+control_summary / post / resp / audit). Every fifth task carries control
+text padded to just under or over the 1400-char detail truncation limit.
+
+Benchmarks (each timed per workload size):
+
+  generate_swms    SWMS_BASE_GENERAL.generate_swms() — STANDARD, saved
+  build_swms       build_all_swms.build_swms() on the master template
+                   (skipped if the template is not present)
+  format_swms      format_swms.format_swms() on a generated document
+  bulletize        swms_bulletize.bulletize_bytes() on a generated .docx
+  validate         swms_ppe_validator.check_ppe() on a generated .docx
+  risk_register_docx / risk_register_xlsx
+                   the risk register exporters with the register scaled
+                   to the workload size
+
+Results are written as JSON with a machine fingerprint (platform, CPU,
+Python and library versions, git commit). compare flags any benchmark
+whose median got slower than the baseline by more than the threshold.
+
+USAGE:
+    python benchmarks/bench_suite.py run
+    python benchmarks/bench_suite.py run --sizes 10 50 --repeat 5 -o base.json
+    python benchmarks/bench_suite.py run --only generate_swms validate
+    python benchmarks/bench_suite.py compare base.json new.json --threshold 0.10
+
+EXIT CODES (compare):
+    0 — no regressions
+    1 — one or more benchmarks regressed beyond the threshold
+"""
+
+import argparse
+import contextlib
+import datetime
+import hashlib
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from importlib import metadata
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+SRC = os.path.join(ROOT, 'src')
+sys.path.insert(0, SRC)
+sys.path.insert(0, ROOT)   # risk register modules import as src.*
+
+TEMPLATE = os.path.join(ROOT, 'docs', 'SWMS_Template.docx')
+RESULTS_DIR = os.path.join(HERE, 'results')
+RESULTS_VERSION = 1
+
+SIZES = (10, 50, 200, 1000)
+DETAIL_LIMIT = 1400          # SWMS_BASE_GENERAL detail control truncation
+LIBRARIES = ('python-docx', 'lxml', 'openpyxl')
+
+
+# ============================================================
+# SYNTHETIC WORKLOADS
+# ============================================================
+
+_SCORE = re.compile(r'\((\d+)\)')
+_BASE_SCORES = (1, 2, 3, 4, 6, 9)
+
+
+def _score(risk):
+    """'High (6)' -> 6, snapped to the nearest SWMS_BASE_GENERAL score."""
+    m = _SCORE.search(risk or '')
+    value = int(m.group(1)) if m else 2
+    return min(_BASE_SCORES, key=lambda s: (abs(s - value), s))
+
+
+def _controls(entry):
+    """Flatten a *_NEW entry's controls into one control text."""
+    if entry['type'] == 'CCVS':
+        lines = [f"{entry['code'].split('-')[0]} CCVS HOLD POINTS:",
+                 'Work must not commence until:']
+        lines += [f'{i}. {hp}' for i, hp in enumerate(entry['hold_points'], 1)]
+        lines += ['Engineering: ' + ' '.join(entry['eng']),
+                  'Admin: ' + ' '.join(entry['admin']),
+                  'PPE: ' + ' '.join(entry['ppe']),
+                  'STOP WORK: ' + ' '.join(entry['stop_work'])]
+        return '\n'.join(lines)
+    return '\n'.join(f'{label} {text}' for label, text in entry['control'])
+
+
+def _pad(text, length):
+    """Pad text with admin sentences to exactly length chars."""
+    filler = ' Admin: supervisor re-confirms controls at each shift change.'
+    while len(text) < length:
+        text += filler
+    return text[:length]
+
+
+def library_tasks():
+    """Every swms_generator *_NEW task as a SWMS_BASE_GENERAL job dict."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import swms_generator
+    tasks = []
+    for name in sorted(dir(swms_generator)):
+        if not name.endswith('_NEW'):
+            continue
+        for entry in getattr(swms_generator, name).values():
+            pre, post = _score(entry['risk_pre']), _score(entry['risk_post'])
+            category = entry['code'].split('-')[0]
+            kind = 'CCVS' if entry['type'] == 'CCVS' else 'STD'
+            title = entry['task']
+            if entry.get('task_desc'):
+                title += '\n' + entry['task_desc']
+            tasks.append({
+                'task': title,
+                'hazard': entry['hazard'],
+                'pre': pre,
+                'controls': _controls(entry),
+                'post': post,
+                'resp': entry['resp'],
+                'audit': f'{kind}-{pre}-{post}-{category}',
+            })
+    return tasks
+
+
+def make_tasks(size, library=None):
+    """Return size synthetic job tasks cycling through the library.
+    Every fifth task's controls sit at the 1400-char limit: alternately
+    just under (kept) and just over (truncated)."""
+    library = library or library_tasks()
+    tasks = []
+    for i in range(size):
+        t = dict(library[i % len(library)])
+        t['task'] = f"{t['task']} ({i + 1})"
+        if i % 5 == 4:
+            t['controls'] = _pad(t['controls'], DETAIL_LIMIT + (-10 if i % 10 == 4 else 20))
+        if i % 2:
+            t['control_summary'] = t['controls'].split('\n')[0][:200]
+        tasks.append(t)
+    return tasks
+
+
+def master_task_list(size):
+    """(task_list, new_tasks_dict) of size 'new' rows for build_swms()."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import swms_generator
+    new_tasks = {}
+    for name in sorted(dir(swms_generator)):
+        if name.endswith('_NEW'):
+            for key, entry in getattr(swms_generator, name).items():
+                new_tasks[f'{name}:{key}'] = entry
+    keys = sorted(new_tasks)
+    return [('new', keys[i % len(keys)]) for i in range(size)], new_tasks
+
+
+def risk_register_config(size):
+    """The default risk register config with its risks cycled to size."""
+    from src.risk_register_to_docx import DEFAULT_CONFIG
+    risks = DEFAULT_CONFIG['risks']
+    scaled = [dict(risks[i % len(risks)], no=i + 1) for i in range(size)]
+    return dict(DEFAULT_CONFIG, risks=scaled)
+
+
+# ============================================================
+# BENCHMARKS
+# ============================================================
+# Each benchmark is setup(size, workdir) -> callable; only the callable
+# is timed. Setup returns None to skip the benchmark (reason printed).
+
+def _job_kwargs():
+    import swms_screed_pump as job
+    return dict(project=job.PROJECT, ppe=job.PPE_CONTENT,
+                permits=job.PERMITS_CONTENT, quals=job.QUALS_CONTENT,
+                plant=job.PLANT_CONTENT, substances=job.SUBSTANCES_CONTENT,
+                leg_append=job.LEGISLATION_APPEND)
+
+
+def _generated_docx(size, workdir):
+    """Path of a STANDARD output for size tasks, generated once per size."""
+    path = os.path.join(workdir, f'generated_{size}.docx')
+    if not os.path.exists(path):
+        from SWMS_BASE_GENERAL import generate_swms
+        generate_swms(TEMPLATE, path, make_tasks(size), False,
+                      validators=[], **_job_kwargs())
+    return path
+
+
+def setup_generate_swms(size, workdir):
+    from SWMS_BASE_GENERAL import generate_swms
+    tasks, kwargs = make_tasks(size), _job_kwargs()
+    out = os.path.join(workdir, 'generate_swms.docx')
+    # Validation is timed separately; synthetic text is not PPE-normalised
+    return lambda: generate_swms(TEMPLATE, out, tasks, False,
+                                 validators=[], **kwargs)
+
+
+def setup_build_swms(size, workdir):
+    import build_all_swms
+    if not os.path.exists(build_all_swms.TEMPLATE):
+        return 'master template not found: ' + build_all_swms.TEMPLATE
+    build_all_swms.OUTDIR = workdir
+    task_list, new_tasks = master_task_list(size)
+    return lambda: build_all_swms.build_swms(
+        'Benchmark', 'build_swms.docx', task_list, new_tasks)
+
+
+def setup_format_swms(size, workdir):
+    from format_swms import format_swms
+    from swms_docx_io import load_template
+    path = _generated_docx(size, workdir)
+    load_template(path)   # parse once — each run formats a fresh clone
+    return lambda: format_swms(load_template(path))
+
+
+def setup_bulletize(size, workdir):
+    from swms_bulletize import bulletize_bytes
+    with open(_generated_docx(size, workdir), 'rb') as f:
+        data = f.read()
+    return lambda: bulletize_bytes(data)
+
+
+def setup_validate(size, workdir):
+    from swms_ppe_validator import check_ppe
+    path = _generated_docx(size, workdir)
+    return lambda: check_ppe(path)
+
+
+def setup_risk_register_docx(size, workdir):
+    from src.risk_register_to_docx import build_document
+    config, out = risk_register_config(size), os.path.join(workdir, 'rr.docx')
+    return lambda: build_document(config).save(out)
+
+
+def setup_risk_register_xlsx(size, workdir):
+    from src.risk_register_to_xlsx import build_workbook
+    config, out = risk_register_config(size), os.path.join(workdir, 'rr.xlsx')
+    return lambda: build_workbook(config).save(out)
+
+
+BENCHMARKS = {
+    'generate_swms': setup_generate_swms,
+    'build_swms': setup_build_swms,
+    'format_swms': setup_format_swms,
+    'bulletize': setup_bulletize,
+    'validate': setup_validate,
+    'risk_register_docx': setup_risk_register_docx,
+    'risk_register_xlsx': setup_risk_register_xlsx,
+}
+
+
+# ============================================================
+# RUN
+# ============================================================
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def machine_fingerprint():
+    """Describe the machine and software stack the results came from.
+    id hashes everything except the git commit, so runs of two commits
+    on the same machine share an id."""
+    libraries = {}
+    for name in LIBRARIES:
+        try:
+            libraries[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            libraries[name] = None
+    machine = {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or None,
+        'cpu_count': os.cpu_count(),
+        'python': f'{platform.python_implementation()} {platform.python_version()}',
+        'libraries': libraries,
+    }
+    machine['id'] = hashlib.sha256(
+        json.dumps(machine, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    machine['git_commit'] = _git_commit()
+    return machine
+
+
+def time_benchmark(func, repeat):
+    """Run func repeat times (plus one untimed warm-up); return seconds."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            runs.append(time.perf_counter() - start)
+    return runs
+
+
+def run_suite(names, sizes, repeat):
+    """Time every benchmark in names at every size; return results dict."""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='swms_bench_') as workdir:
+        for name in names:
+            for size in sizes:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    func = BENCHMARKS[name](size, workdir)
+                if isinstance(func, str):
+                    print(f'  SKIP  {name}: {func}')
+                    break
+                runs = time_benchmark(func, repeat)
+                key = f'{name}/{size}'
+                results[key] = {
+                    'benchmark': name,
+                    'tasks': size,
+                    'runs': [round(r, 6) for r in runs],
+                    'min': round(min(runs), 6),
+                    'median': round(statistics.median(runs), 6),
+                }
+                print(f'  {key:<26}{statistics.median(runs) * 1000:>11.1f} ms'
+                      f'  (min {min(runs) * 1000:.1f} ms, n={repeat})')
+    return results
+
+
+def cmd_run(args):
+    unknown = [n for n in args.only or () if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)} "
+                         f"(choose from {', '.join(BENCHMARKS)})")
+    names = args.only or list(BENCHMARKS)
+    machine = machine_fingerprint()
+    print(f"Benchmarks — sizes {', '.join(map(str, args.sizes))}, "
+          f"median of {args.repeat} (machine {machine['id']})")
+    results = run_suite(names, args.sizes, args.repeat)
+
+    out = args.output
+    if out is None:
+        stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        out = os.path.join(RESULTS_DIR, f'bench_{stamp}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': RESULTS_VERSION,
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'machine': machine,
+            'config': {'sizes': args.sizes, 'repeat': args.repeat},
+            'results': results,
+        }, f, indent=2)
+        f.write('\n')
+    print(f'Results → {out}')
+    return 0
+
+
+# ============================================================
+# COMPARE
+# ============================================================
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != RESULTS_VERSION:
+        raise ValueError(f'{path}: unsupported results version {data.get("version")!r}')
+    return data
+
+
+def compare_results(base, new, threshold, metric='median'):
+    """Return [(key, base s, new s, ratio, status)] for keys in both.
+    status is REGRESSED (slower by more than threshold), IMPROVED
+    (faster by more than threshold) or OK."""
+    rows = []
+    for key in base['results']:
+        if key not in new['results']:
+            continue
+        old_t = base['results'][key][metric]
+        new_t = new['results'][key][metric]
+        ratio = new_t / old_t if old_t else float('inf')
+        if ratio > 1 + threshold:
+            status = 'REGRESSED'
+        elif ratio < 1 - threshold:
+            status = 'IMPROVED'
+        else:
+            status = 'OK'
+        rows.append((key, old_t, new_t, ratio, status))
+    return rows
+
+
+def cmd_compare(args):
+    base, new = load_results(args.base), load_results(args.new)
+    if base['machine']['id'] != new['machine']['id']:
+        print(f"WARNING: results come from different machines "
+              f"({base['machine']['id']} vs {new['machine']['id']}) — "
+              f"timings are not directly comparable")
+
+    rows = compare_results(base, new, args.threshold, args.metric)
+    print(f"{'benchmark':<26}{'base':>11}{'new':>11}{'change':>9}")
+    for key, old_t, new_t, ratio, status in rows:
+        flag = '' if status == 'OK' else f'  {status}'
+        print(f'{key:<26}{old_t * 1000:>8.1f} ms{new_t * 1000:>8.1f} ms'
+              f'{(ratio - 1) * 100:>+8.1f}%{flag}')
+    only_base = sorted(set(base['results']) - set(new['results']))
+    if only_base:
+        print(f"Not in new results: {', '.join(only_base)}")
+
+    regressed = [row[0] for row in rows if row[4] == 'REGRESSED']
+    if regressed:
+        print(f'{len(regressed)} regression(s) beyond {args.threshold:.0%}: '
+              f"{', '.join(regressed)}")
+        return 1
+    print(f'No regressions beyond {args.threshold:.0%}.')
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='run the suite and write JSON results')
+    run.add_argument('--sizes', type=int, nargs='+', default=list(SIZES),
+                     help=f"task counts (default {' '.join(map(str, SIZES))})")
+    run.add_argument('--repeat', type=int, default=3,
+                     help='timed runs per benchmark, median reported (default 3)')
+    run.add_argument('--only', nargs='+', metavar='NAME',
+                     help=f"benchmarks to run ({', '.join(BENCHMARKS)})")
+    run.add_argument('-o', '--output',
+                     help='results file (default benchmarks/results/bench_<time>.json)')
+    run.set_defaults(func=cmd_run)
+
+    cmp_ = sub.add_parser('compare', help='compare two results files')
+    cmp_.add_argument('base', help='baseline results JSON')
+    cmp_.add_argument('new', help='new results JSON')
+    cmp_.add_argument('--threshold', type=float, default=0.10,
+                      help='relative slowdown flagged as a regression (default 0.10)')
+    cmp_.add_argument('--metric', choices=('median', 'min'), default='median',
+                      help='statistic compared (default median)')
+    cmp_.set_defaults(func=cmd_compare)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
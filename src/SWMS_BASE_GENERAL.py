@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-SWMS_BASE_GENERAL.py — v16.4 General Purpose Engine
+SWMS_BASE_GENERAL.py — v16.5 General Purpose Engine
 SWMS Generator — Australian Construction, Any Industry
 
 USE THIS FILE FOR ALL JOBS.
@@ -61,6 +61,25 @@ POST-PROCESSING — swms_bulletize.py:
   Calibri 9pt, indent left=360/hanging=180). CCVS HOLD POINTS bold + yellow
   preserved in bullet output. Usage:
     python3 swms_bulletize.py input.docx output.docx
+  Or in-process: generate_swms(..., bullets=True) applies the same transform
+  before saving (swms_bulletize.bulletize_document) — no second file pass.
+
+VALIDATION (before save):
+  generate_swms() runs every registered task validator against the in-memory
+  task dicts before the template is loaded, then every registered validator
+  against the populated document before doc.save(). Any problem raises
+  SWMSValidationError and no file is written. The PPE rules from
+  swms_ppe_validator.py are registered for both (validate_ppe_tasks,
+  validate_ppe_tables). Add rules with @register_task_validator —
+  task_validator(tasks) — or @register_validator — validator(doc, tasks);
+  both return a list of problem dicts. validators=[...] replaces the
+  document validators per call and skips the task validators; [] skips all.
+
+STANDARD + CCVS IN ONE PASS:
+  generate_swms_variants(template, out_std, out_ccvs, tasks, ...) populates
+  the document once, forks it in memory and writes both versions — only the
+  title's [STANDARD VERSION] / [CCVS VERSION] label differs. Output is
+  identical to two generate_swms() calls.
 
 PAINTING SURFACE PREP RULE (locked — applies to all painting SWMS):
   Surface preparation (scrape, sand, spot-fill, clean painted surfaces)
@@ -69,6 +88,24 @@ PAINTING SURFACE PREP RULE (locked — applies to all painting SWMS):
   Pressure washing is always a separate task — never combined with surface prep.
 
 VERSION HISTORY:
+  v16.5 — 17/10/2026 — Template cache: generate_swms() loads the template through
+           swms_docx_io.load_template() — parsed once per process, cloned per call.
+           _set_cell_text_9pt_ccvs label regex compiled once at import
+           (phrase_matcher.PhraseMatcher) instead of on every cell.
+           generate_swms(bullets=True) bulletizes in-process before saving.
+           Validator pipeline: PPE rules run on the populated document before
+           doc.save() — SWMSValidationError, nothing written, on any violation.
+           generate_swms_variants(): STANDARD and CCVS built from one populated
+           document. Job runners switched over.
+           Consolidated / Detail rows written by the fast table writer (raw
+           lxml on w:tc, rows cloned from one add_row() prototype) — XML
+           identical to the FROZEN cell writers (tests/test_table_writer.py).
+           rPr / shd prototype cache: one prebuilt element per style variant,
+           deep-copied onto each run. FROZEN cell writers delegate to it.
+           Stage tracing (swms_trace): every pipeline stage timed when
+           GATEKEEPER_PROFILE is set — no-op otherwise.
+           Per-task console lines (PPE normaliser, truncation, short codes)
+           are swms_log events — same text by default, JSON or off on request.
   v16.4 — 27/02/2026 — PPE normaliser added: _normalise_ppe_in_tasks() runs
            automatically before _inject_tasks(). Enforces locked PPE standard:
            steel-capped footwear | hi-vis vest or shirt | cut-resistant gloves.
@@ -93,11 +130,25 @@ Cross-reference:
   swms_bulletize.py              — consolidated table bullet post-processor
 """
 
-from docx import Document
 from docx.shared import Pt, RGBColor
-from docx.oxml import OxmlElement, parse_xml
-from docx.oxml.ns import qn, nsdecls
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.table import _Row
+from lxml import etree
+import copy
 import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from swms_docx_io import clone_document, load_template
+from phrase_matcher import PhraseMatcher
+from swms_bulletize import bulletize_document
+from swms_ppe_validator import check_cell, scan_element
+from swms_log import INFO, WARNING, event, get_logger
+from swms_trace import stage
+
+_log = get_logger("base")
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -443,18 +494,22 @@ def _normalise_ppe_in_tasks(user_tasks):
             text = re.sub(r'\bgloves\b', replace_bare_gloves, text)
 
             if text != original:
-                violations.append(f"  ✎ Normalised [{task_name}] → {field}")
+                violations.append((task_name, field))
 
             t[field] = text
 
         normalised.append(t)
 
     if violations:
-        print("\n  PPE NORMALISER — corrections applied:")
-        for v in violations:
-            print(v)
+        event(_log, INFO, "ppe_normaliser",
+              "\n  PPE NORMALISER — corrections applied:", count=len(violations))
+        for task_name, field in violations:
+            event(_log, INFO, "ppe_normalised", "  ✎ Normalised [{task}] → {field}",
+                  task=task_name, field=field)
     else:
-        print("\n  PPE NORMALISER — all tasks clean, no corrections needed.")
+        event(_log, INFO, "ppe_normaliser",
+              "\n  PPE NORMALISER — all tasks clean, no corrections needed.",
+              count=0)
 
     return normalised
 
@@ -512,22 +567,7 @@ def _write_short_code_cell(cell, audit, pre):
     Suffix (e.g. H6):   9pt Calibri, black, BOLD if H tier
                         9pt Calibri, black, normal if M or L tier
     """
-    prefix, suffix = _generate_short_code(audit, pre)
-    is_high = suffix.startswith("H")
-    for para in cell.paragraphs:
-        p = para._element
-        p.getparent().remove(p)
-    para = cell.add_paragraph()
-    run_prefix = para.add_run(prefix)
-    run_prefix.font.size = Pt(9)
-    run_prefix.font.name = "Calibri"
-    run_prefix.font.bold = False
-    run_prefix.font.color.rgb = RGBColor(0, 0, 0)
-    run_suffix = para.add_run(suffix)
-    run_suffix.font.size = Pt(9)
-    run_suffix.font.name = "Calibri"
-    run_suffix.font.bold = is_high
-    run_suffix.font.color.rgb = RGBColor(0, 0, 0)
+    _fast_short_code_cell(cell._tc, audit, pre)
 
 
 def _set_paragraph_text_14pt(paragraph, text):
@@ -542,13 +582,41 @@ def _set_paragraph_text_14pt(paragraph, text):
 
 def _set_cell_text_9pt(cell, text):
     """FROZEN: Replace all cell content with 9pt Calibri plain text."""
-    for para in cell.paragraphs:
-        p = para._element
-        p.getparent().remove(p)
-    para = cell.add_paragraph()
-    run = para.add_run(text)
-    run.font.size = Pt(9)
-    run.font.name = "Calibri"
+    _fast_text_cell(cell._tc, text)
+
+
+CCVS_MARKER = "CCVS HOLD POINTS"
+
+# All bold label tokens — matched as whole phrase + colon
+# Order matters: longer/more specific phrases first
+CCVS_BOLD_LABELS = [
+    "CCVS HOLD POINTS:",          # colon variant — bold only (no highlight)
+    "Work must not commence until:",
+    "HARD STOP",                   # no colon — bold as standalone phrase
+    "STOP WORK:",
+    "STOP-WORK:",
+    "HOLD POINT:",
+    "REFUELLING:",
+    "IRA ROPE RESCUE:",
+    "EWP RESCUE:",
+    "EWP EMERGENCY:",
+    "ROPE ACCESS RESCUE:",
+    "SUSPENSION TRAUMA (IRA + EWP):",
+    "SUSPENSION TRAUMA:",
+    "CHEMICAL SPILL:",
+    "MUSTER POINT:",
+    "GENERAL:",
+    "FIRE:",
+    "MEDICAL:",
+    "Engineering:",
+    "Admin:",
+    "PPE:",
+    "ELE:",
+    "ENE:",
+]
+
+# CCVS_MARKER first — it wins over any label starting at the same position
+_CCVS_CELL_MATCHER = PhraseMatcher([CCVS_MARKER] + CCVS_BOLD_LABELS)
 
 
 def _set_cell_text_9pt_ccvs(cell, text):
@@ -566,118 +634,23 @@ def _set_cell_text_9pt_ccvs(cell, text):
 
     All text: 9pt Calibri. Yellow highlight is character-level only.
     """
-    import re
-
-    CCVS_MARKER  = "CCVS HOLD POINTS"
-
-    # All bold label tokens — matched as whole phrase + colon
-    # Order matters: longer/more specific phrases first
-    BOLD_LABELS = [
-        "CCVS HOLD POINTS:",          # colon variant — bold only (no highlight)
-        "Work must not commence until:",
-        "HARD STOP",                   # no colon — bold as standalone phrase
-        "STOP WORK:",
-        "STOP-WORK:",
-        "HOLD POINT:",
-        "REFUELLING:",
-        "IRA ROPE RESCUE:",
-        "EWP RESCUE:",
-        "EWP EMERGENCY:",
-        "ROPE ACCESS RESCUE:",
-        "SUSPENSION TRAUMA (IRA + EWP):",
-        "SUSPENSION TRAUMA:",
-        "CHEMICAL SPILL:",
-        "MUSTER POINT:",
-        "GENERAL:",
-        "FIRE:",
-        "MEDICAL:",
-        "Engineering:",
-        "Admin:",
-        "PPE:",
-        "ELE:",
-        "ENE:",
-    ]
-
-    def _add_run(para, txt, bold=False, highlight=False):
-        if not txt:
-            return
-        run = para.add_run(txt)
-        run.font.size  = Pt(9)
-        run.font.name  = "Calibri"
-        run.font.bold  = bold
-        if highlight:
-            rPr = run._r.get_or_add_rPr()
-            hl  = OxmlElement("w:highlight")
-            hl.set(qn("w:val"), "yellow")
-            rPr.append(hl)
-
-    # Build a regex that matches CCVS_MARKER or any BOLD_LABELS entry
-    # Group 1 = CCVS_MARKER, Group 2 = bold label
-    escaped_ccvs   = re.escape(CCVS_MARKER)
-    escaped_labels = "|".join(re.escape(lbl) for lbl in BOLD_LABELS)
-    pattern = re.compile(
-        f"({escaped_ccvs})|({escaped_labels})"
-    )
-
-    # Clear existing paragraphs
-    for para in cell.paragraphs:
-        para._element.getparent().remove(para._element)
-
-    para = cell.add_paragraph()
-    cursor = 0
+    _fast_ccvs_cell(cell._tc, text)
 
-    for m in pattern.finditer(text):
-        start, end = m.start(), m.end()
-        # Normal text before this match
-        if start > cursor:
-            _add_run(para, text[cursor:start], bold=False)
-        if m.group(1):
-            # CCVS HOLD POINTS — bold + yellow highlight
-            _add_run(para, m.group(1), bold=True, highlight=True)
-        else:
-            # Bold label — bold only
-            _add_run(para, m.group(2), bold=True, highlight=False)
-        cursor = end
 
-    # Remaining text after last match
-    if cursor < len(text):
-        _add_run(para, text[cursor:], bold=False)
+# Risk score → (label, cell fill)
+RISK_SCORES = {
+    1: ("Low (1)",    "00FF00"),
+    2: ("Low (2)",    "00FF00"),
+    3: ("Medium (3)", "FFFF00"),
+    4: ("Medium (4)", "FFFF00"),
+    6: ("High (6)",   "FF0000"),
+    9: ("High (9)",   "FF0000"),
+}
 
 
 def _inject_risk_cell(cell, score):
     """FROZEN: Color cell background and write risk score label."""
-    RISK_SCORES = {
-        1: ("Low (1)",    "00FF00"),
-        2: ("Low (2)",    "00FF00"),
-        3: ("Medium (3)", "FFFF00"),
-        4: ("Medium (4)", "FFFF00"),
-        6: ("High (6)",   "FF0000"),
-        9: ("High (9)",   "FF0000"),
-    }
-    if score not in RISK_SCORES:
-        raise ValueError(f"Invalid risk score: {score}")
-    risk_label, hex_color = RISK_SCORES[score]
-    tc = cell._element
-    tcPr = tc.get_or_add_tcPr()
-    for shd in tcPr.findall(
-        "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}shd"
-    ):
-        tcPr.remove(shd)
-    shd = parse_xml(
-        f'<w:shd {nsdecls("w")} w:val="clear" w:color="auto" w:fill="{hex_color}"/>'
-    )
-    tcPr.append(shd)
-    for para in cell.paragraphs:
-        p = para._element
-        p.getparent().remove(p)
-    para = cell.add_paragraph()
-    run = para.add_run(risk_label)
-    run.font.size = Pt(9)
-    run.font.name = "Calibri"
-    run.font.bold = True
-    run.font.color.rgb = (
-        RGBColor(255, 255, 255) if hex_color == "FF0000" else RGBColor(0, 0, 0)
-    )
+    _fast_risk_cell(cell._tc, score)
 
 
 def _tick_hrcw_boxes(table, hrcw_dict):
@@ -736,7 +709,7 @@ def _add_audit_metadata(doc, audit_codes):
     run.font.color.rgb = RGBColor(255, 255, 255)
 
 
-def _populate_header(doc, project, version_label):
+def _populate_header(doc, project):
     """FROZEN: Populate header table (tables[0]) with project data."""
     t0 = doc.tables[0]
     _set_cell_text_9pt(t0.rows[0].cells[1], project["pbcu_line"])
@@ -764,27 +737,216 @@ def _populate_header(doc, project, version_label):
     print("  ✓ Header populated")
 
 
+# ── Fast table writer ─────────────────────────────────────────────────────────
+# Raw lxml versions of the FROZEN cell writers above, used for the per-task
+# rows of the Consolidated and Detail tables. Each writes exactly the XML the
+# python-docx calls produce (golden output: tests/test_table_writer.py) but
+# works on w:tc elements directly — no row.cells grid walk per cell, no
+# paragraph/run proxies, no per-property rPr setters. Run rPr and risk shd
+# are deep-copied from a prototype per style variant. The FROZEN writers
+# delegate here, so every 9pt cell in the document shares one code path.
+
+_W_TR = qn("w:tr")
+_W_TC = qn("w:tc")
+_W_TCPR = qn("w:tcPr")
+_W_SHD = qn("w:shd")
+_W_P = qn("w:p")
+_W_R = qn("w:r")
+_W_RPR = qn("w:rPr")
+_W_RFONTS = qn("w:rFonts")
+_W_B = qn("w:b")
+_W_COLOR = qn("w:color")
+_W_SZ = qn("w:sz")
+_W_HIGHLIGHT = qn("w:highlight")
+_W_T = qn("w:t")
+_W_TAB = qn("w:tab")
+_W_BR = qn("w:br")
+_W_VAL = qn("w:val")
+_W_FILL = qn("w:fill")
+_W_ASCII = qn("w:ascii")
+_W_HANSI = qn("w:hAnsi")
+_W_GRIDSPAN = qn("w:gridSpan")
+_W_VMERGE = qn("w:vMerge")
+_W_GRIDBEFORE = qn("w:gridBefore")
+_XML_SPACE = qn("xml:space")
+
+# Run text is split on the characters python-docx maps to w:tab / w:br
+_RUN_TEXT_SPLIT = re.compile(r"([\t\r\n])")
+
+_SubElement = etree.SubElement
+
+
+def _make_rpr(bold=None, color=None, highlight=False):
+    """Build the 9pt Calibri w:rPr that font.size / font.name / font.bold /
+    font.color.rgb (+ w:highlight) produce on a new run."""
+    rPr = OxmlElement("w:rPr")
+    fonts = _SubElement(rPr, _W_RFONTS)
+    fonts.set(_W_ASCII, "Calibri")
+    fonts.set(_W_HANSI, "Calibri")
+    if bold is not None:
+        b = _SubElement(rPr, _W_B)
+        if not bold:
+            b.set(_W_VAL, "0")
+    if color is not None:
+        _SubElement(rPr, _W_COLOR).set(_W_VAL, color)
+    _SubElement(rPr, _W_SZ).set(_W_VAL, "18")
+    if highlight:
+        _SubElement(rPr, _W_HIGHLIGHT).set(_W_VAL, "yellow")
+    return rPr
+
+
+def _make_shd(fill):
+    """Build the risk cell w:shd for a fill colour."""
+    shd = OxmlElement("w:shd")
+    shd.set(_W_VAL, "clear")
+    shd.set(qn("w:color"), "auto")
+    shd.set(_W_FILL, fill)
+    return shd
+
+
+# Prototype cache — one prebuilt element per style variant, deep-copied onto
+# each new run / risk cell. Keys: (bold, color, highlight) and fill colour.
+_RPR_PROTOTYPES = {
+    key: _make_rpr(*key) for key in (
+        (None, None, False),        # plain 9pt
+        (False, None, False),       # CCVS cell body text
+        (True, None, False),        # CCVS cell bold label
+        (True, None, True),         # CCVS HOLD POINTS — bold + yellow
+        (True, "000000", False),    # risk label on green / yellow
+        (True, "FFFFFF", False),    # risk label on red
+        (False, "000000", False),   # short code prefix / M, L suffix
+    )
+}
+_SHD_PROTOTYPES = {fill: _make_shd(fill) for _, fill in RISK_SCORES.values()}
+
+
+def _rpr_prototype(bold, color, highlight):
+    """Return the cached w:rPr prototype for a style, building it on first use."""
+    key = (bold, color, highlight)
+    rPr = _RPR_PROTOTYPES.get(key)
+    if rPr is None:
+        rPr = _RPR_PROTOTYPES[key] = _make_rpr(*key)
+    return rPr
+
+
+def _fast_run(p, text, bold=None, color=None, highlight=False):
+    """Append a 9pt Calibri w:r to p — same XML as para.add_run(text) plus
+    font.size / font.name / font.bold / font.color.rgb / w:highlight."""
+    r = _SubElement(p, _W_R)
+    r.append(copy.deepcopy(_rpr_prototype(bold, color, highlight)))
+
+    for piece in _RUN_TEXT_SPLIT.split(text):
+        if piece == "\t":
+            _SubElement(r, _W_TAB)
+        elif piece == "\n" or piece == "\r":
+            _SubElement(r, _W_BR)
+        elif piece:
+            t = _SubElement(r, _W_T)
+            t.text = piece
+            if len(piece.strip()) < len(piece):
+                t.set(_XML_SPACE, "preserve")
+    return r
+
+
+def _fast_clear_tc(tc):
+    """Remove the cell's paragraphs and append one empty w:p."""
+    for p in tc.findall(_W_P):
+        tc.remove(p)
+    return _SubElement(tc, _W_P)
+
+
+def _fast_text_cell(tc, text):
+    """_set_cell_text_9pt on a w:tc."""
+    _fast_run(_fast_clear_tc(tc), text)
+
+
+def _fast_ccvs_cell(tc, text):
+    """_set_cell_text_9pt_ccvs on a w:tc."""
+    p = _fast_clear_tc(tc)
+    cursor = 0
+    for start, end, index in _CCVS_CELL_MATCHER.finditer(text):
+        if start > cursor:
+            _fast_run(p, text[cursor:start], bold=False)
+        # index 0 is CCVS HOLD POINTS — bold + yellow highlight
+        _fast_run(p, text[start:end], bold=True, highlight=index == 0)
+        cursor = end
+    if cursor < len(text):
+        _fast_run(p, text[cursor:], bold=False)
+
+
+def _fast_risk_cell(tc, score):
+    """_inject_risk_cell on a w:tc."""
+    if score not in RISK_SCORES:
+        raise ValueError(f"Invalid risk score: {score}")
+    risk_label, hex_color = RISK_SCORES[score]
+    tcPr = tc.get_or_add_tcPr()
+    for shd in tcPr.findall(_W_SHD):
+        tcPr.remove(shd)
+    tcPr.append(copy.deepcopy(_SHD_PROTOTYPES[hex_color]))
+    _fast_run(_fast_clear_tc(tc), risk_label, bold=True,
+              color="FFFFFF" if hex_color == "FF0000" else "000000")
+
+
+def _fast_short_code_cell(tc, audit, pre):
+    """_write_short_code_cell on a w:tc."""
+    prefix, suffix = _generate_short_code(audit, pre)
+    p = _fast_clear_tc(tc)
+    _fast_run(p, prefix, bold=False, color="000000")
+    _fast_run(p, suffix, bold=suffix.startswith("H"), color="000000")
+
+
+def _is_plain_row(tr, ncols):
+    """True if tr is ncols unmerged cells — row.cells[i] is then simply the
+    i-th w:tc, no grid walk needed."""
+    tcs = tr.findall(_W_TC)
+    if len(tcs) != ncols:
+        return False
+    if tr.find(f"{qn('w:trPr')}/{_W_GRIDBEFORE}") is not None:
+        return False
+    for tc in tcs:
+        tcPr = tc.find(_W_TCPR)
+        if tcPr is not None and (tcPr.find(_W_GRIDSPAN) is not None
+                                 or tcPr.find(_W_VMERGE) is not None):
+            return False
+    return True
+
+
+def _task_row_cells(table, count):
+    """Return the w:tc list of each of the first count data rows (rows 1..count).
+    Adds count - 1 rows like table.add_row() does: the first via add_row(),
+    the rest deep-copied from it and appended in one operation."""
+    tbl = table._tbl
+    if count > 1:
+        proto = table.add_row()._tr
+        tbl.extend(copy.deepcopy(proto) for _ in range(count - 2))
+    ncols = len(tbl.tblGrid.gridCol_lst)
+    rows = []
+    for tr in tbl.findall(_W_TR)[1:count + 1]:
+        if _is_plain_row(tr, ncols):
+            rows.append(tr.findall(_W_TC))
+        else:
+            rows.append([cell._tc for cell in _Row(tr, table).cells])
+    return rows
+
+
 def _populate_consolidated_table(doc, tasks):
     """FROZEN: Populate tables[2] Consolidated summary — one row per task."""
     con_table = doc.tables[2]
     _set_header_repeat(con_table)
-    for _ in range(len(tasks) - 1):
-        con_table.add_row()
-    for i, t in enumerate(tasks):
-        row = con_table.rows[i + 1]
+    for cells, t in zip(_task_row_cells(con_table, len(tasks)), tasks):
         task_title = t["task"].split("\n")[0].strip()
-        _set_cell_text_9pt(row.cells[0], task_title)
+        _fast_text_cell(cells[0], task_title)
         hazard_text = t.get("hazard_summary") or t["hazard"][:200]
-        _set_cell_text_9pt(row.cells[1], hazard_text)
-        _inject_risk_cell(row.cells[2], t["pre"])
+        _fast_text_cell(cells[1], hazard_text)
+        _fast_risk_cell(cells[2], t["pre"])
         control_text = t.get("control_summary") or t["controls"][:200]
         # Auto-prepend CCVS HOLD POINTS marker for CCVS-coded tasks
         if t.get("audit", "").startswith("CCVS") and not control_text.startswith("CCVS HOLD POINTS"):
             control_text = "CCVS HOLD POINTS " + control_text
-        _set_cell_text_9pt_ccvs(row.cells[3], control_text)
-        _inject_risk_cell(row.cells[4], t["post"])
-        _set_cell_text_9pt(row.cells[5], t["resp"])
-        _write_short_code_cell(row.cells[6], t["audit"], t["pre"])
+        _fast_ccvs_cell(cells[3], control_text)
+        _fast_risk_cell(cells[4], t["post"])
+        _fast_text_cell(cells[5], t["resp"])
+        _fast_short_code_cell(cells[6], t["audit"], t["pre"])
     print(f"  ✓ Consolidated table populated ({len(tasks)} tasks)")
 
 
@@ -795,21 +957,21 @@ def _populate_detail_table(doc, tasks):
     """
     det_table = doc.tables[3]
     _set_header_repeat(det_table)
-    for _ in range(len(tasks) - 1):
-        det_table.add_row()
-    for i, t in enumerate(tasks):
-        row = det_table.rows[i + 1]
-        _set_cell_text_9pt(row.cells[0], t["task"])
-        _set_cell_text_9pt(row.cells[1], t["hazard"])
-        _inject_risk_cell(row.cells[2], t["pre"])
+    rows = _task_row_cells(det_table, len(tasks))
+    for i, (cells, t) in enumerate(zip(rows, tasks)):
+        _fast_text_cell(cells[0], t["task"])
+        _fast_text_cell(cells[1], t["hazard"])
+        _fast_risk_cell(cells[2], t["pre"])
         ctrl = t["controls"]
         if len(ctrl) > 1400:
-            print(f"  ⚠ Task {i+1} control text {len(ctrl)} chars — truncated to 1400")
+            event(_log, WARNING, "control_truncated",
+                  "  ⚠ Task {task} control text {chars} chars — truncated to 1400",
+                  task=i + 1, chars=len(ctrl))
             ctrl = ctrl[:1397] + "..."
-        _set_cell_text_9pt_ccvs(row.cells[3], ctrl)
-        _inject_risk_cell(row.cells[4], t["post"])
-        _set_cell_text_9pt(row.cells[5], t["resp"])
-        _write_short_code_cell(row.cells[6], t["audit"], t["pre"])
+        _fast_ccvs_cell(cells[3], ctrl)
+        _fast_risk_cell(cells[4], t["post"])
+        _fast_text_cell(cells[5], t["resp"])
+        _fast_short_code_cell(cells[6], t["audit"], t["pre"])
     print(f"  ✓ Detail table populated ({len(tasks)} tasks)")
 
 
@@ -832,42 +994,227 @@ def _populate_requirements(doc, ppe, permits, quals, plant, substances, leg_appe
     print("  ✓ Requirements populated (Table 1 + Table 7)")
 
 
-def generate_swms(template_path, output_path, user_tasks, use_ccvs, project,
-                  ppe, permits, quals, plant, substances, leg_append):
-    """
-    FROZEN: Main generation function.
-    Injects SYS and EMR automatically — do not pass them in user_tasks.
-    """
-    version_label = "CCVS VERSION" if use_ccvs else "STANDARD VERSION"
-    print(f"\n  Generating {version_label}...")
-
+# ── Validator pipeline ────────────────────────────────────────────────────────
+
+class SWMSValidationError(ValueError):
+    """Raised by generate_swms() when a validator reports problems.
+    Nothing is written to output_path."""
+
+    def __init__(self, output_path, problems):
+        self.output_path = output_path
+        self.problems = problems
+        lines = [f"{len(problems)} validation problem(s) — not saved: {output_path}"]
+        for i, p in enumerate(problems, 1):
+            if "table" in p:
+                lines.append(f"  [{i}] {p['table']} | Row {p['row']} | Col {p['col']}"
+                             f" | {p['violation']}")
+            else:
+                lines.append(f"  [{i}] {p['violation']}")
+            if p.get("snippet"):
+                lines.append(f"      Context : ...{p['snippet']}...")
+        super().__init__("\n".join(lines))
+
+
+# Validators run in order by generate_swms() before doc.save().
+# validator(doc, tasks) -> list of problem dicts; each has "violation" and,
+# for table checks, "table" / "row" / "col" / "snippet".
+VALIDATORS = []
+
+# Task validators run on the task dicts (SYS + EMR included) before the
+# template is loaded, so a bad task fails without building the document.
+# task_validator(tasks) -> list of problem dicts, as above.
+TASK_VALIDATORS = []
+
+# Task fields written into the Consolidated and Detail tables
+PPE_TASK_FIELDS = ("task", "hazard", "hazard_summary", "controls",
+                   "control_summary", "resp")
+
+
+def register_validator(func):
+    """Decorator: add func to the default generate_swms() validator list."""
+    VALIDATORS.append(func)
+    return func
+
+
+def register_task_validator(func):
+    """Decorator: add func to the default task validator list."""
+    TASK_VALIDATORS.append(func)
+    return func
+
+
+@register_task_validator
+def validate_ppe_tasks(tasks):
+    """PPE rules (swms_ppe_validator) on each task's table text, after
+    _normalise_ppe_in_tasks() — catches what normalisation cannot fix."""
+    problems = []
+    for i, t in enumerate(tasks, 1):
+        title = t["task"].split("\n")[0].strip()
+        name = f"Task {i}: {title}"
+        for field in PPE_TASK_FIELDS:
+            problems.extend(check_cell(t.get(field) or "", name, i, field))
+    return problems
+
+
+@register_validator
+def validate_ppe_tables(doc, tasks):
+    """PPE rules (swms_ppe_validator) on the populated Consolidated and
+    Detail tables — same checks as the post-generation QA gate. tasks are
+    checked separately, before population (validate_ppe_tasks)."""
+    violations, _ = scan_element(doc.element)
+    return violations
+
+
+def _run_validators(doc, tasks, output_path, validators):
+    """Run validators; raise SWMSValidationError if any report problems."""
+    if not validators:
+        return
+    problems = []
+    for validator in validators:
+        with stage("validate", check=validator.__name__):
+            problems.extend(validator(doc, tasks))
+    if problems:
+        raise SWMSValidationError(output_path, problems)
+    print(f"  ✓ Validated ({len(validators)} check(s))")
+
+
+def _run_task_validators(tasks, output_path, task_validators):
+    """Run task validators; raise SWMSValidationError if any report problems."""
+    problems = []
+    for validator in task_validators:
+        with stage("validate_tasks", check=validator.__name__):
+            problems.extend(validator(tasks))
+    if problems:
+        raise SWMSValidationError(output_path, problems)
+
+
+def _build_document(template_path, user_tasks, project, ppe, permits, quals,
+                    plant, substances, leg_append, bullets, task_validators=(),
+                    output_path=None):
+    """Populate everything the STANDARD and CCVS versions share.
+    task_validators run on the task dicts before the template is loaded
+    (output_path names the output(s) in a validation error).
+    Returns (doc, tasks) — the title paragraph is left for _finish_variant()."""
     # Normalise PPE across all user tasks (before SYS/EMR injection)
-    user_tasks = _normalise_ppe_in_tasks(user_tasks)
+    with stage("normalise_ppe", tasks=len(user_tasks)):
+        user_tasks = _normalise_ppe_in_tasks(user_tasks)
 
     # Inject SYS and EMR
-    tasks = _inject_tasks(user_tasks)
+    with stage("inject_tasks"):
+        tasks = _inject_tasks(user_tasks)
+    _run_task_validators(tasks, output_path, task_validators)
     audit_codes = [t["audit"] for t in tasks]
 
-    doc = Document(template_path)
+    with stage("load_template"):
+        doc = load_template(template_path)
+    with stage("populate_header"):
+        _populate_header(doc, project)
+    with stage("populate_consolidated_table", tasks=len(tasks)):
+        _populate_consolidated_table(doc, tasks)
+    with stage("populate_detail_table", tasks=len(tasks)):
+        _populate_detail_table(doc, tasks)
+    with stage("populate_requirements"):
+        _populate_requirements(doc, ppe, permits, quals, plant, substances, leg_append)
+    with stage("audit_metadata"):
+        _add_audit_metadata(doc, audit_codes)
+    if bullets:
+        rows = bulletize_document(doc)
+        print(f"  Consolidated table: {rows} rows bulletized")
+    return doc, tasks
+
+
+def _finish_variant(doc, tasks, output_path, project, use_ccvs, validators):
+    """Apply the per-version title, validate and save one output."""
+    version_label = "CCVS VERSION" if use_ccvs else "STANDARD VERSION"
     _set_paragraph_text_14pt(
         doc.paragraphs[0],
         f"{project['title_prefix']} [{version_label}]"
     )
-    _populate_header(doc, project, version_label)
-    _populate_consolidated_table(doc, tasks)
-    _populate_detail_table(doc, tasks)
-    _populate_requirements(doc, ppe, permits, quals, plant, substances, leg_append)
-    _add_audit_metadata(doc, audit_codes)
+    _run_validators(doc, tasks, output_path,
+                    VALIDATORS if validators is None else validators)
 
-    doc.save(output_path)
+    with stage("save", path=os.path.basename(output_path)):
+        doc.save(output_path)
     print(f"  ✓ Saved → {output_path}")
     print(f"  Tasks: {len(tasks)} total (incl. SYS + EMR auto-injected)")
-    print("  Short codes:")
+    event(_log, INFO, "short_codes", "  Short codes:", count=len(tasks))
+    for name, code in short_codes(tasks):
+        flag = " ◀ BOLD" if code.split("-")[-1].startswith("H") else ""
+        event(_log, INFO, "short_code", "    {task:<45} {code}{flag}",
+              task=name[:45], code=code, flag=flag)
+
+
+def _task_validators(validators):
+    """Task validators for a generate call: the registered ones unless
+    validation is overridden (validators=[...] or [])."""
+    return TASK_VALIDATORS if validators is None else ()
+
+
+def short_codes(tasks):
+    """Return [(task title, short code)] for generated tasks, in order."""
+    codes = []
     for t in tasks:
         prefix, suffix = _generate_short_code(t["audit"], t["pre"])
-        name = t["task"].split("\n")[0].strip()[:45]
-        flag = " ◀ BOLD" if suffix.startswith("H") else ""
-        print(f"    {name:<45} {prefix}{suffix}{flag}")
+        codes.append((t["task"].split("\n")[0].strip(), prefix + suffix))
+    return codes
+
+
+def generate_swms(template_path, output_path, user_tasks, use_ccvs, project,
+                  ppe, permits, quals, plant, substances, leg_append,
+                  bullets=False, validators=None):
+    """
+    FROZEN: Main generation function.
+    Injects SYS and EMR automatically — do not pass them in user_tasks.
+    bullets=True applies the swms_bulletize ▪ bullet transform before saving.
+    validators: None runs the registered VALIDATORS (and TASK_VALIDATORS
+    on the task dicts first), [] skips validation.
+    Raises SWMSValidationError (and writes nothing) if validation fails.
+    Returns the generated task list (SYS + EMR included).
+    """
+    version_label = "CCVS VERSION" if use_ccvs else "STANDARD VERSION"
+    print(f"\n  Generating {version_label}...")
+
+    with stage("generate_swms", output=os.path.basename(output_path),
+               tasks=len(user_tasks)):
+        doc, tasks = _build_document(template_path, user_tasks, project, ppe,
+                                     permits, quals, plant, substances,
+                                     leg_append, bullets,
+                                     _task_validators(validators), output_path)
+        _finish_variant(doc, tasks, output_path, project, use_ccvs, validators)
+    return tasks
+
+
+def generate_swms_variants(template_path, output_std, output_ccvs, user_tasks,
+                           project, ppe, permits, quals, plant, substances,
+                           leg_append, bullets=False, validators=None):
+    """
+    Generate the STANDARD and CCVS versions from one populated document.
+    Same output as two generate_swms() calls — the shared content is built
+    once and forked in memory; only the title differs per version.
+    Either output path may be None to skip that version.
+    Returns the generated task list (SYS + EMR included).
+    """
+    variants = [(path, use_ccvs) for path, use_ccvs
+                in ((output_std, False), (output_ccvs, True)) if path]
+    labels = " + ".join("CCVS" if use_ccvs else "STANDARD" for _, use_ccvs in variants)
+    print(f"\n  Generating {labels} VERSION{'S' if len(variants) > 1 else ''}...")
+
+    with stage("generate_swms_variants", variants=len(variants),
+               tasks=len(user_tasks)):
+        doc, tasks = _build_document(template_path, user_tasks, project, ppe,
+                                     permits, quals, plant, substances,
+                                     leg_append, bullets,
+                                     _task_validators(validators),
+                                     " + ".join(path for path, _ in variants))
+        for i, (path, use_ccvs) in enumerate(variants):
+            # The last variant takes the shared document itself
+            if i == len(variants) - 1:
+                variant_doc = doc
+            else:
+                with stage("clone_document"):
+                    variant_doc = clone_document(doc)
+            _finish_variant(variant_doc, tasks, path, project, use_ccvs,
+                            validators)
+    return tasks
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -896,8 +1243,7 @@ if __name__ == "__main__":
     print(f"  {PROJECT['title_prefix']}")
     print("═" * 60)
 
-    generate_swms(TEMPLATE, OUT_STD,  TASKS, use_ccvs=False, **kwargs)
-    generate_swms(TEMPLATE, OUT_CCVS, TASKS, use_ccvs=True,  **kwargs)
+    generate_swms_variants(TEMPLATE, OUT_STD, OUT_CCVS, TASKS, **kwargs)
 
     print("\n" + "═" * 60)
     print("  Complete.")
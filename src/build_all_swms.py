@@ -5,14 +5,21 @@ Takes V1 template and generates 7 standalone Master SWMS documents.
 Properly injects numbering definitions for new CCVS tasks.
 """
 
+import argparse
+import contextlib
+import hashlib
+import io
+import json
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 # Support both local and cloud environments
 _script_dir = os.path.dirname(os.path.abspath(__file__))
 _project_root = os.path.dirname(_script_dir)
 sys.path.insert(0, _script_dir)
 sys.path.insert(0, '/home/claude')
-from swms_generator import *
+from swms_rows import *
+from swms_catalogue import task_dict
 try:
     from format_swms import format_swms
 except ImportError:
@@ -20,6 +27,11 @@ except ImportError:
     sys.exit(1)
 from docx import Document
 from docx.oxml.ns import qn
+from swms_docx_io import load_template, save_docx, template_hash
+import swms_log
+import swms_trace
+from swms_log import ERROR, INFO, event, get_logger
+from swms_trace import stage, traced
 from lxml import etree
 import copy
 
@@ -29,6 +41,8 @@ _local_outdir = os.path.join(_script_dir, 'outputs')
 TEMPLATE = _local_template if os.path.exists(_local_template) else "/mnt/user-data/uploads/RPD_MASTER_SWMS_TEMPLATE_V1.docx"
 OUTDIR = _local_outdir if os.path.isdir(os.path.dirname(_local_outdir)) else "/mnt/user-data/outputs"
 
+_log = get_logger("build")
+
 # ============================================================
 # NUMBERING INJECTION
 # ============================================================
@@ -53,6 +67,10 @@ def get_next_num_id(numbering_elem):
 
 BULLET_INDENT = '227'  # 0.4cm in twips (1cm = 567 twips)
 
+# How new lists get numbering definitions — see NumberingRegistry.new_list()
+NUMBERING_STRATEGIES = ('shared', 'per-task')
+NUMBERING_STRATEGY = 'shared'
+
 def create_decimal_abstract_num(abs_id):
     """Create a decimal abstractNum for HOLD POINTS: 1. 2. 3.
     Font: Aptos 8pt (sz=16 half-points) to match template body text."""
@@ -99,14 +117,156 @@ def create_bullet_abstract_num(abs_id):
     </w:abstractNum>'''
     return etree.fromstring(xml)
 
-def create_num_elem(num_id, abstract_num_id):
-    """Create a <w:num> element mapping numId to abstractNumId."""
+def create_num_elem(num_id, abstract_num_id, start_override=None):
+    """Create a <w:num> element mapping numId to abstractNumId.
+    start_override restarts level 0 at that value for this numId only, so
+    several lists can share one abstractNum and still each count from 1."""
+    override = ''
+    if start_override is not None:
+        override = f'''
+        <w:lvlOverride w:ilvl="0">
+            <w:startOverride w:val="{start_override}"/>
+        </w:lvlOverride>'''
     xml = f'''<w:num xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         w:numId="{num_id}">
-        <w:abstractNumId w:val="{abstract_num_id}"/>
+        <w:abstractNumId w:val="{abstract_num_id}"/>{override}
     </w:num>'''
     return etree.fromstring(xml)
 
+
+class NumberingRegistry:
+    """Index of one document's numbering.xml, built once.
+
+    Allocates abstractNumId/numId from counters, caches the level-0 numFmt
+    of every abstractNum and maps numId -> abstractNumId, so per-task and
+    per-row numbering work no longer rescans numbering.xml. New elements are
+    queued and written by flush(): abstractNums before the first <w:num>,
+    nums appended — the same order the one-at-a-time inserts produced.
+
+    dedupe=True reuses an existing abstractNum whose definition is identical
+    apart from its id. Off by default: two nums on one abstractNum share a
+    list counter in Word, so only dedupe lists that never restart (bullets)
+    or give each num a startOverride.
+
+    new_list() is what the builder calls per list, under one of
+    NUMBERING_STRATEGIES:
+      shared    — one abstractNum per list style. Each numbered list gets a
+                  lightweight <w:num> with a level-0 startOverride so it
+                  restarts at 1; bullet lists share one <w:num>.
+      per-task  — a new abstractNum + num for every list (the original
+                  builder output, kept for comparison).
+    """
+
+    def __init__(self, numbering_elem, dedupe=False, strategy=None):
+        strategy = strategy or NUMBERING_STRATEGY
+        if strategy not in NUMBERING_STRATEGIES:
+            raise ValueError(f"Unknown numbering strategy: {strategy!r} "
+                             f"(use {', '.join(NUMBERING_STRATEGIES)})")
+        self.numbering = numbering_elem
+        self.dedupe = dedupe
+        self.strategy = strategy
+        self._shared_nums = {}
+        self._num_to_abs = {}
+        self._abs_fmt = {}
+        self._abs_elems = {}
+        self._signatures = None
+        self._pending_abs = []
+        self._pending_nums = []
+        max_abs = max_num = 0
+        for absNum in numbering_elem.findall(qn('w:abstractNum')):
+            aid = absNum.get(qn('w:abstractNumId'))
+            self._index_abstract_num(aid, absNum)
+            max_abs = max(max_abs, int(aid))
+        for num in numbering_elem.findall(qn('w:num')):
+            nid = num.get(qn('w:numId'))
+            absRef = num.find(qn('w:abstractNumId'))
+            if absRef is not None:
+                self._num_to_abs[nid] = absRef.get(qn('w:val'))
+            max_num = max(max_num, int(nid))
+        self._next_abs = max_abs + 1
+        self._next_num = max_num + 1
+
+    @classmethod
+    def for_document(cls, doc, dedupe=False, strategy=None):
+        return cls(doc.part.numbering_part.numbering_definitions._numbering,
+                   dedupe, strategy)
+
+    def _index_abstract_num(self, aid, absNum):
+        self._abs_elems[aid] = absNum
+        lvl0 = absNum.find(qn('w:lvl'))
+        if lvl0 is not None:
+            fmt_elem = lvl0.find(qn('w:numFmt'))
+            self._abs_fmt[aid] = fmt_elem.get(qn('w:val')) if fmt_elem is not None else 'unknown'
+
+    @staticmethod
+    def _signature(absNum):
+        """Serialised definition without its abstractNumId."""
+        probe = copy.deepcopy(absNum)
+        probe.attrib.pop(qn('w:abstractNumId'), None)
+        return etree.tostring(probe, method='c14n')
+
+    def _signature_index(self):
+        if self._signatures is None:
+            self._signatures = {}
+            for aid, absNum in self._abs_elems.items():
+                self._signatures.setdefault(self._signature(absNum), aid)
+        return self._signatures
+
+    def add_abstract_num(self, factory, dedupe=None):
+        """Queue factory(abs_id) -> <w:abstractNum>. Returns the abstractNumId
+        (an existing one when deduping finds an identical definition)."""
+        abs_id = self._next_abs
+        absNum = factory(abs_id)
+        if self.dedupe if dedupe is None else dedupe:
+            signatures = self._signature_index()
+            existing = signatures.get(self._signature(absNum))
+            if existing is not None:
+                return int(existing)
+            signatures[self._signature(absNum)] = str(abs_id)
+        self._next_abs += 1
+        self._index_abstract_num(str(abs_id), absNum)
+        self._pending_abs.append(absNum)
+        return abs_id
+
+    def add_num(self, abstract_num_id, start_override=None):
+        """Queue a <w:num> on abstract_num_id. Returns the numId."""
+        num_id = self._next_num
+        self._next_num += 1
+        self._num_to_abs[str(num_id)] = str(abstract_num_id)
+        self._pending_nums.append(
+            create_num_elem(num_id, abstract_num_id, start_override))
+        return num_id
+
+    def new_list(self, factory):
+        """numId for one new list in the style factory(abs_id) creates,
+        allocated per the registry's strategy."""
+        if self.strategy == 'per-task':
+            return self.add_num(self.add_abstract_num(factory))
+        abs_id = self.add_abstract_num(factory, dedupe=True)
+        if self._abs_fmt.get(str(abs_id)) == 'bullet':
+            if abs_id not in self._shared_nums:
+                self._shared_nums[abs_id] = self.add_num(abs_id)
+            return self._shared_nums[abs_id]
+        return self.add_num(abs_id, start_override=1)
+
+    def num_format(self, num_id):
+        """Level-0 numFmt ('bullet', 'decimal' ...) of a numId, or None."""
+        return self._abs_fmt.get(self._num_to_abs.get(str(num_id)))
+
+    def flush(self):
+        """Write the queued elements into numbering.xml."""
+        if self._pending_abs:
+            first_num = self.numbering.find(qn('w:num'))
+            for absNum in self._pending_abs:
+                if first_num is not None:
+                    first_num.addprevious(absNum)
+                else:
+                    self.numbering.append(absNum)
+        for num in self._pending_nums:
+            self.numbering.append(num)
+        self._pending_abs = []
+        self._pending_nums = []
+
 def normalise_numbering_indent(doc):
     """Set all existing abstractNum level-0 indents to BULLET_INDENT (0.4cm).
     Ensures template numbering matches new numbering definitions."""
@@ -133,49 +293,31 @@ def normalise_numbering_indent(doc):
                 count += 1
     return count
 
-def inject_numbering_pair(doc):
+def inject_numbering_pair(doc, registry=None):
     """Add one decimal + one bullet numbering pair to the document.
-    Returns (decimal_num_id, bullet_num_id) for use in paragraphs."""
-    numbering = doc.part.numbering_part.numbering_definitions._numbering
-    
-    # Create decimal abstractNum and num
-    abs_dec_id = get_next_abstract_num_id(numbering)
-    abs_dec = create_decimal_abstract_num(abs_dec_id)
-    # Insert abstractNum BEFORE any num elements
-    first_num = numbering.find(qn('w:num'))
-    if first_num is not None:
-        first_num.addprevious(abs_dec)
-    else:
-        numbering.append(abs_dec)
-    
-    num_dec_id = get_next_num_id(numbering)
-    num_dec = create_num_elem(num_dec_id, abs_dec_id)
-    numbering.append(num_dec)
-    
-    # Create bullet abstractNum and num
-    abs_bul_id = get_next_abstract_num_id(numbering)
-    abs_bul = create_bullet_abstract_num(abs_bul_id)
-    first_num = numbering.find(qn('w:num'))
-    if first_num is not None:
-        first_num.addprevious(abs_bul)
-    else:
-        numbering.append(abs_bul)
-    
-    num_bul_id = get_next_num_id(numbering)
-    num_bul = create_num_elem(num_bul_id, abs_bul_id)
-    numbering.append(num_bul)
-    
+    Returns (decimal_num_id, bullet_num_id) for use in paragraphs.
+    With a registry the elements are queued until registry.flush()."""
+    own = registry is None
+    if own:
+        registry = NumberingRegistry.for_document(doc)
+
+    num_dec_id = registry.new_list(create_decimal_abstract_num)
+    num_bul_id = registry.new_list(create_bullet_abstract_num)
+
+    if own:
+        registry.flush()
     return num_dec_id, num_bul_id
 
 
-def fix_reused_hold_point_numbering(row_elem, doc):
+def fix_reused_hold_point_numbering(row_elem, doc, registry=None):
     """Fix reused CCVS rows where HOLD POINT items use bullet numbering.
 
     Template rows 6 (IRA) and 18 (Lead Paint) have all content sharing a
     single bullet numId, including hold points which should be decimal 1. 2. 3.
     This creates a new decimal numId and patches only the hold point paragraphs.
 
-    Returns the number of paragraphs fixed (0 if no fix needed).
+    Returns the number of paragraphs fixed (0 if no fix needed). With a
+    registry the new definition is queued until registry.flush().
     """
     tcs = row_elem.findall(qn('w:tc'))
     if len(tcs) < 4:
@@ -184,21 +326,9 @@ def fix_reused_hold_point_numbering(row_elem, doc):
     control_cell = tcs[3]
     paras = control_cell.findall(qn('w:p'))
 
-    # Build maps from document numbering
-    numbering = doc.part.numbering_part.numbering_definitions._numbering
-    num_to_abs = {}
-    abs_to_fmt = {}
-    for num in numbering.findall(qn('w:num')):
-        nid = num.get(qn('w:numId'))
-        absRef = num.find(qn('w:abstractNumId'))
-        if absRef is not None:
-            num_to_abs[nid] = absRef.get(qn('w:val'))
-    for absNum in numbering.findall(qn('w:abstractNum')):
-        aid = absNum.get(qn('w:abstractNumId'))
-        lvl0 = absNum.find(qn('w:lvl'))
-        if lvl0 is not None:
-            fmt_elem = lvl0.find(qn('w:numFmt'))
-            abs_to_fmt[aid] = fmt_elem.get(qn('w:val')) if fmt_elem is not None else 'unknown'
+    own = registry is None
+    if own:
+        registry = NumberingRegistry.for_document(doc)
 
     # Scan for hold point paragraphs that incorrectly use bullet numbering
     in_hold_section = False
@@ -227,27 +357,16 @@ def fix_reused_hold_point_numbering(row_elem, doc):
                 if numPr is not None:
                     numId_elem = numPr.find(qn('w:numId'))
                     if numId_elem is not None:
-                        nid = numId_elem.get(qn('w:val'))
-                        aid = num_to_abs.get(nid)
-                        fmt = abs_to_fmt.get(aid)
-                        if fmt == 'bullet':
+                        if registry.num_format(numId_elem.get(qn('w:val'))) == 'bullet':
                             hold_point_numId_elems.append(numId_elem)
 
     if not hold_point_numId_elems:
         return 0
 
     # Create new decimal numbering definition for this row's hold points
-    dec_abs_id = get_next_abstract_num_id(numbering)
-    dec_abs = create_decimal_abstract_num(dec_abs_id)
-    first_num = numbering.find(qn('w:num'))
-    if first_num is not None:
-        first_num.addprevious(dec_abs)
-    else:
-        numbering.append(dec_abs)
-
-    dec_num_id = get_next_num_id(numbering)
-    dec_num = create_num_elem(dec_num_id, dec_abs_id)
-    numbering.append(dec_num)
+    dec_num_id = registry.new_list(create_decimal_abstract_num)
+    if own:
+        registry.flush()
 
     # Patch hold point paragraphs to use the new decimal numId
     for numId_elem in hold_point_numId_elems:
@@ -370,7 +489,9 @@ def tick_hrcw_checkboxes(doc, tick_keys):
                             r.addnext(check_r)
 
                             ticked_count += 1
-                            print(f"    HRCW ticked: {key} -> '{frag[:50]}'")
+                            event(_log, INFO, "hrcw_tick",
+                                  "    HRCW ticked: {key} -> '{label}'",
+                                  key=key, label=frag[:50])
                             break
 
     return ticked_count
@@ -538,13 +659,15 @@ def build_new_ccvs_row(template_ccvs_xml, task_data, decimal_num_id, bullet_num_
 # MAIN BUILD FUNCTION
 # ============================================================
 
-def build_swms(name, filename, task_list, new_tasks_dict):
-    """Build a complete SWMS document with proper numbering."""
-    print(f"\n{'='*60}")
-    print(f"Building: {name}")
-    print(f"{'='*60}")
+@traced("build_swms")
+def build_swms(name, filename, task_list, new_tasks_dict, numbering_strategy=None):
+    """Build a complete SWMS document with proper numbering.
+    numbering_strategy — one of NUMBERING_STRATEGIES (default NUMBERING_STRATEGY)."""
+    event(_log, INFO, "build_start", "\n{rule}\nBuilding: {name}\n{rule}",
+          name=name, filename=filename, rule='=' * 60)
     
-    doc = Document(TEMPLATE)
+    with stage("load_template"):
+        doc = load_template(TEMPLATE)
     
     # Fix abstractNum 18: change (%1) to %1. for consistent 1. 2. 3. numbering
     numbering = doc.part.numbering_part.element
@@ -555,12 +678,16 @@ def build_swms(name, filename, task_list, new_tasks_dict):
                 txt = lvl.find(qn('w:lvlText'))
                 if txt is not None and txt.get(qn('w:val')) == '(%1)':
                     txt.set(qn('w:val'), '%1.')
-                    print(f"  Fixed abstractNum 18 ilvl={lvl.get(qn('w:ilvl'))}: (%1) -> %1.")
+                    event(_log, INFO, "abstract_num_fix",
+                          "  Fixed abstractNum 18 ilvl={ilvl}: (%1) -> %1.",
+                          ilvl=lvl.get(qn('w:ilvl')))
 
     # Normalise all existing numbering indents to 0.4cm hanging
     indent_count = normalise_numbering_indent(doc)
     if indent_count:
-        print(f"  Normalised {indent_count} numbering indent(s) to 0.4cm")
+        event(_log, INFO, "indent_normalise",
+              "  Normalised {count} numbering indent(s) to 0.4cm",
+              count=indent_count)
     
     t1 = doc.tables[1]
     tbl = t1._tbl
@@ -578,143 +705,152 @@ def build_swms(name, filename, task_list, new_tasks_dict):
     for tr in trs[1:]:
         tbl.remove(tr)
     
+    # Index numbering.xml once; new definitions are queued and flushed
+    # after the rows are built
+    registry = NumberingRegistry.for_document(doc, strategy=numbering_strategy)
+
     # Inject a shared bullet numId for hazard column bullets (all new rows)
-    numbering = doc.part.numbering_part.numbering_definitions._numbering
-    hazard_abs_id = get_next_abstract_num_id(numbering)
-    hazard_abs = create_bullet_abstract_num(hazard_abs_id)
-    first_num = numbering.find(qn('w:num'))
-    if first_num is not None:
-        first_num.addprevious(hazard_abs)
-    else:
-        numbering.append(hazard_abs)
-    hazard_bul_num_id = get_next_num_id(numbering)
-    numbering.append(create_num_elem(hazard_bul_num_id, hazard_abs_id))
-    print(f"  Hazard bullet numId: {hazard_bul_num_id}")
+    hazard_bul_num_id = registry.new_list(create_bullet_abstract_num)
+    event(_log, INFO, "hazard_num_id", "  Hazard bullet numId: {num_id}",
+          num_id=hazard_bul_num_id)
 
     # Pre-inject numbering pairs for ALL new CCVS tasks in this doc
     ccvs_numids = {}
     for source, key in task_list:
         if source == 'new' and new_tasks_dict[key]['type'] == 'CCVS':
-            dec_id, bul_id = inject_numbering_pair(doc)
+            dec_id, bul_id = inject_numbering_pair(doc, registry)
             ccvs_numids[key] = (dec_id, bul_id)
     
     # Build rows
-    for idx, (source, key) in enumerate(task_list):
-        if source == 'reuse':
-            new_row = etree.fromstring(existing_rows[key])
-            # Fix hold point numbering in reused CCVS rows (template bug in rows 6, 18)
-            fixed_count = fix_reused_hold_point_numbering(new_row, doc)
-            if fixed_count:
-                print(f"    Fixed {fixed_count} hold point items: bullet -> decimal (row {key})")
-            # Fix reused rows: remove code cell shading, add risk text colours
-            tcs = new_row.findall(qn('w:tc'))
-            if len(tcs) >= 7:
-                # TC2 (Risk Pre) - add contrasting text colour
-                risk_text = ''.join(r.text or '' for p in tcs[2].findall(qn('w:p')) for r in p.findall(qn('w:r')))
-                if risk_text:
-                    tc_color = get_risk_text_color(risk_text)
-                    set_cell_text_color(tcs[2], tc_color)
-                # TC4 (Risk Post) - add contrasting text colour  
-                risk_post_text = ''.join(r.text or '' for p in tcs[4].findall(qn('w:p')) for r in p.findall(qn('w:r')))
-                if risk_post_text:
-                    tc_color = get_risk_text_color(risk_post_text)
-                    set_cell_text_color(tcs[4], tc_color)
-                # TC6 (Code) - remove shading, make text bold
-                remove_cell_shading(tcs[6])
-                for p in tcs[6].findall(qn('w:p')):
-                    for r in p.findall(qn('w:r')):
-                        rPr = r.find(qn('w:rPr'))
-                        if rPr is None:
-                            rPr = etree.SubElement(r, qn('w:rPr'))
-                            r.insert(0, rPr)
-                        b = rPr.find(qn('w:b'))
-                        if b is None:
-                            etree.SubElement(rPr, qn('w:b'))
-                
-                # PPE standardisation on ALL cells (primarily control cell)
-                for tc in tcs:
-                    for p in tc.findall(qn('w:p')):
+    with stage("rows", tasks=len(task_list)):
+        for idx, (source, key) in enumerate(task_list):
+            if source == 'reuse':
+                new_row = etree.fromstring(existing_rows[key])
+                # Fix hold point numbering in reused CCVS rows (template bug in rows 6, 18)
+                fixed_count = fix_reused_hold_point_numbering(new_row, doc, registry)
+                if fixed_count:
+                    event(_log, INFO, "hold_point_fix",
+                          "    Fixed {count} hold point items: bullet -> decimal (row {key})",
+                          count=fixed_count, key=key)
+                # Fix reused rows: remove code cell shading, add risk text colours
+                tcs = new_row.findall(qn('w:tc'))
+                if len(tcs) >= 7:
+                    # TC2 (Risk Pre) - add contrasting text colour
+                    risk_text = ''.join(r.text or '' for p in tcs[2].findall(qn('w:p')) for r in p.findall(qn('w:r')))
+                    if risk_text:
+                        tc_color = get_risk_text_color(risk_text)
+                        set_cell_text_color(tcs[2], tc_color)
+                    # TC4 (Risk Post) - add contrasting text colour  
+                    risk_post_text = ''.join(r.text or '' for p in tcs[4].findall(qn('w:p')) for r in p.findall(qn('w:r')))
+                    if risk_post_text:
+                        tc_color = get_risk_text_color(risk_post_text)
+                        set_cell_text_color(tcs[4], tc_color)
+                    # TC6 (Code) - remove shading, make text bold
+                    remove_cell_shading(tcs[6])
+                    for p in tcs[6].findall(qn('w:p')):
                         for r in p.findall(qn('w:r')):
-                            t = r.find(qn('w:t'))
-                            if t is not None and t.text:
-                                orig = t.text
-                                txt = orig
-                                # 1. Safety glasses -> Eye protection
-                                txt = txt.replace('Safety glasses and face shield', 'Eye protection and face shield')
-                                txt = txt.replace('Safety glasses or goggles', 'Eye protection or goggles')
-                                txt = txt.replace('safety glasses and face shield', 'eye protection and face shield')
-                                txt = txt.replace('safety glasses or goggles', 'eye protection or goggles')
-                                txt = txt.replace('Safety glasses', 'Eye protection')
-                                txt = txt.replace('safety glasses', 'eye protection')
-                                # 2. High-vis vest -> high-vis vest or shirt
-                                if 'high-vis vest' in txt.lower() and 'or shirt' not in txt.lower():
-                                    txt = txt.replace('high-vis vest', 'high-vis vest or shirt')
-                                    txt = txt.replace('High-vis vest', 'High-vis vest or shirt')
-                                # 3. Hearing protection — no qualifier needed (removed >85 dB append)
-                                import re
-                                # 4. Generic gloves -> cut-resistant gloves
-                                #    Only where NOT preceded by specific type qualifier
-                                #    Specific types to preserve: nitrile, leather, insulating, blast,
-                                #    chemical-resistant, rubber, welding, anti-vibration, impact, disposable
-                                specific_glove_prefixes = [
-                                    'nitrile', 'leather', 'insulating', 'blast', 'chemical-resistant',
-                                    'rubber', 'welding', 'anti-vibration', 'impact', 'disposable',
-                                    'cut-resistant', 'gauntlet'
-                                ]
-                                # Replace 'gloves' only when not preceded by a specific type
-                                txt = re.sub(
-                                    r'(?<!\w)gloves\b',
-                                    lambda m: m.group() if any(
-                                        txt[max(0,m.start()-20):m.start()].lower().rstrip().endswith(p)
-                                        for p in specific_glove_prefixes
-                                    ) else 'cut-resistant gloves',
-                                    txt,
-                                    flags=re.IGNORECASE
-                                )
-                                # Fix double replacement
-                                txt = txt.replace('cut-resistant cut-resistant', 'cut-resistant')
-                                if txt != orig:
-                                    t.text = txt
-            print(f"  Task {idx+1}: Reused row {key}")
-        elif source == 'new':
-            task_data = new_tasks_dict[key]
-            if task_data['type'] == 'CCVS':
-                dec_id, bul_id = ccvs_numids[key]
-                new_row = build_new_ccvs_row(ccvs_template_xml, task_data, dec_id, bul_id, hazard_bul_num_id)
-                print(f"  Task {idx+1}: NEW CCVS (dec={dec_id},bul={bul_id}) - {task_data['task'][:45]}")
-            else:
-                new_row = build_new_std_row(std_template_xml, task_data, hazard_bul_num_id)
-                print(f"  Task {idx+1}: NEW STD  - {task_data['task'][:45]}")
+                            rPr = r.find(qn('w:rPr'))
+                            if rPr is None:
+                                rPr = etree.SubElement(r, qn('w:rPr'))
+                                r.insert(0, rPr)
+                            b = rPr.find(qn('w:b'))
+                            if b is None:
+                                etree.SubElement(rPr, qn('w:b'))
+                
+                    # PPE standardisation on ALL cells (primarily control cell)
+                    for tc in tcs:
+                        for p in tc.findall(qn('w:p')):
+                            for r in p.findall(qn('w:r')):
+                                t = r.find(qn('w:t'))
+                                if t is not None and t.text:
+                                    orig = t.text
+                                    txt = orig
+                                    # 1. Safety glasses -> Eye protection
+                                    txt = txt.replace('Safety glasses and face shield', 'Eye protection and face shield')
+                                    txt = txt.replace('Safety glasses or goggles', 'Eye protection or goggles')
+                                    txt = txt.replace('safety glasses and face shield', 'eye protection and face shield')
+                                    txt = txt.replace('safety glasses or goggles', 'eye protection or goggles')
+                                    txt = txt.replace('Safety glasses', 'Eye protection')
+                                    txt = txt.replace('safety glasses', 'eye protection')
+                                    # 2. High-vis vest -> high-vis vest or shirt
+                                    if 'high-vis vest' in txt.lower() and 'or shirt' not in txt.lower():
+                                        txt = txt.replace('high-vis vest', 'high-vis vest or shirt')
+                                        txt = txt.replace('High-vis vest', 'High-vis vest or shirt')
+                                    # 3. Hearing protection — no qualifier needed (removed >85 dB append)
+                                    import re
+                                    # 4. Generic gloves -> cut-resistant gloves
+                                    #    Only where NOT preceded by specific type qualifier
+                                    #    Specific types to preserve: nitrile, leather, insulating, blast,
+                                    #    chemical-resistant, rubber, welding, anti-vibration, impact, disposable
+                                    specific_glove_prefixes = [
+                                        'nitrile', 'leather', 'insulating', 'blast', 'chemical-resistant',
+                                        'rubber', 'welding', 'anti-vibration', 'impact', 'disposable',
+                                        'cut-resistant', 'gauntlet'
+                                    ]
+                                    # Replace 'gloves' only when not preceded by a specific type
+                                    txt = re.sub(
+                                        r'(?<!\w)gloves\b',
+                                        lambda m: m.group() if any(
+                                            txt[max(0,m.start()-20):m.start()].lower().rstrip().endswith(p)
+                                            for p in specific_glove_prefixes
+                                        ) else 'cut-resistant gloves',
+                                        txt,
+                                        flags=re.IGNORECASE
+                                    )
+                                    # Fix double replacement
+                                    txt = txt.replace('cut-resistant cut-resistant', 'cut-resistant')
+                                    if txt != orig:
+                                        t.text = txt
+                event(_log, INFO, "task_row", "  Task {index}: Reused row {key}",
+                      index=idx + 1, source=source, key=key, type="reuse")
+            elif source == 'new':
+                task_data = new_tasks_dict[key]
+                if task_data['type'] == 'CCVS':
+                    dec_id, bul_id = ccvs_numids[key]
+                    new_row = build_new_ccvs_row(ccvs_template_xml, task_data, dec_id, bul_id, hazard_bul_num_id)
+                    event(_log, INFO, "task_row",
+                          "  Task {index}: NEW CCVS (dec={dec},bul={bul}) - {title}",
+                          index=idx + 1, source=source, key=key, type="CCVS",
+                          dec=dec_id, bul=bul_id, title=task_data['task'][:45])
+                else:
+                    new_row = build_new_std_row(std_template_xml, task_data, hazard_bul_num_id)
+                    event(_log, INFO, "task_row", "  Task {index}: NEW STD  - {title}",
+                          index=idx + 1, source=source, key=key, type="STD",
+                          title=task_data['task'][:45])
         
-        # Ensure cantSplit
-        trPr = new_row.find(qn('w:trPr'))
-        if trPr is None:
-            trPr = etree.SubElement(new_row, qn('w:trPr'))
-            new_row.insert(0, trPr)
-        if trPr.find(qn('w:cantSplit')) is None:
-            etree.SubElement(trPr, qn('w:cantSplit'))
+            # Ensure cantSplit
+            trPr = new_row.find(qn('w:trPr'))
+            if trPr is None:
+                trPr = etree.SubElement(new_row, qn('w:trPr'))
+                new_row.insert(0, trPr)
+            if trPr.find(qn('w:cantSplit')) is None:
+                etree.SubElement(trPr, qn('w:cantSplit'))
         
-        tbl.append(new_row)
-    
+            tbl.append(new_row)
+
+    registry.flush()
+
     # Tick additional HRCW checkboxes in Table 0 per SWMS type
     hrcw_keys = HRCW_TICKS.get(name, [])
     if hrcw_keys:
-        ticked = tick_hrcw_checkboxes(doc, hrcw_keys)
+        with stage("tick_hrcw"):
+            ticked = tick_hrcw_checkboxes(doc, hrcw_keys)
         if ticked:
-            print(f"  HRCW checkboxes ticked: {ticked}")
+            event(_log, INFO, "hrcw_ticked", "  HRCW checkboxes ticked: {count}",
+                  count=ticked)
 
     # Apply all formatting rules
     fmt = format_swms(doc)
-    print(f"  Formatted: {fmt['em_dashes']} em dashes, "
-          f"{fmt['fonts']} fonts, {fmt['labels']} labels, "
-          f"{fmt['sub_labels']} sub-labels, "
-          f"{fmt['italic_desc']} italic, "
-          f"{fmt['emergency']} emergency")
+    event(_log, INFO, "formatted",
+          "  Formatted: {em_dashes} em dashes, {fonts} fonts, {labels} labels, "
+          "{sub_labels} sub-labels, {italic_desc} italic, {emergency} emergency",
+          **fmt)
 
     outpath = os.path.join(OUTDIR, filename)
-    doc.save(outpath)
-    print(f"  Saved: {outpath}")
-    print(f"  Total tasks: {len(task_list)}")
+    with stage("save"):
+        save_docx(doc, outpath)
+    event(_log, INFO, "saved", "  Saved: {path}\n  Total tasks: {tasks}",
+          path=outpath, tasks=len(task_list))
     return outpath
 
 
@@ -722,6 +858,18 @@ def build_swms(name, filename, task_list, new_tasks_dict):
 # SWMS DEFINITIONS
 # ============================================================
 
+# New task dicts from swms_generator.py, read from the compiled task
+# catalogue on first access (swms_catalogue.py) — the task module itself
+# is only imported when the catalogue is missing or stale.
+REMEDIAL_NEW = task_dict('REMEDIAL_NEW')
+SPRAY_NEW = task_dict('SPRAY_NEW')
+GROUND_NEW = task_dict('GROUND_NEW')
+CLADDING_NEW = task_dict('CLADDING_NEW')
+EWP_NEW = task_dict('EWP_NEW')
+SWING_NEW = task_dict('SWING_NEW')
+BLASTING_NEW = task_dict('BLASTING_NEW')
+SCREED_NEW = task_dict('SCREED_NEW')
+
 REMEDIAL_TASKS = [
     ('reuse', 1), ('reuse', 2), ('reuse', 3),
     ('reuse', 4), ('reuse', 5), ('reuse', 6), ('reuse', 8), ('reuse', 9),
@@ -800,31 +948,234 @@ SCREED_TASKS = [
 # BUILD ALL 8
 # ============================================================
 
-if __name__ == '__main__':
-    builds = [
-        ("Remedial Works",    "RPD-MSW-002_Remedial_Works_Master_SWMS.docx",    REMEDIAL_TASKS, REMEDIAL_NEW),
-        ("Spray Painting",    "RPD-MSW-003_Spray_Painting_Master_SWMS.docx",    SPRAY_TASKS,    SPRAY_NEW),
-        ("Groundworks",       "RPD-MSW-004_Groundworks_Master_SWMS.docx",       GROUND_TASKS,   GROUND_NEW),
-        ("Cladding Works",    "RPD-MSW-005_Cladding_Works_Master_SWMS.docx",    CLADDING_TASKS, CLADDING_NEW),
-        ("EWP Standalone",    "RPD-MSW-006_EWP_Master_SWMS.docx",              EWP_TASKS,      EWP_NEW),
-        ("Swing Stage",       "RPD-MSW-007_Swing_Stage_Master_SWMS.docx",       SWING_TASKS,    SWING_NEW),
-        ("Abrasive Blasting", "RPD-MSW-008_Abrasive_Blasting_Master_SWMS.docx", BLASTING_TASKS, BLASTING_NEW),
-        ("Screed Pump",       "RPD-MSW-009_Screed_Pump_Master_SWMS.docx",       SCREED_TASKS,   SCREED_NEW),
-    ]
-    
+BUILDS = [
+    ("Remedial Works",    "RPD-MSW-002_Remedial_Works_Master_SWMS.docx",    REMEDIAL_TASKS, REMEDIAL_NEW),
+    ("Spray Painting",    "RPD-MSW-003_Spray_Painting_Master_SWMS.docx",    SPRAY_TASKS,    SPRAY_NEW),
+    ("Groundworks",       "RPD-MSW-004_Groundworks_Master_SWMS.docx",       GROUND_TASKS,   GROUND_NEW),
+    ("Cladding Works",    "RPD-MSW-005_Cladding_Works_Master_SWMS.docx",    CLADDING_TASKS, CLADDING_NEW),
+    ("EWP Standalone",    "RPD-MSW-006_EWP_Master_SWMS.docx",              EWP_TASKS,      EWP_NEW),
+    ("Swing Stage",       "RPD-MSW-007_Swing_Stage_Master_SWMS.docx",       SWING_TASKS,    SWING_NEW),
+    ("Abrasive Blasting", "RPD-MSW-008_Abrasive_Blasting_Master_SWMS.docx", BLASTING_TASKS, BLASTING_NEW),
+    ("Screed Pump",       "RPD-MSW-009_Screed_Pump_Master_SWMS.docx",       SCREED_TASKS,   SCREED_NEW),
+]
+
+
+def run_build(name, filename, tasks, new_dict):
+    """Build one SWMS and return its BUILD SUMMARY entry.
+    Failures are reported and returned, never raised, so one bad
+    document does not stop the rest of the suite."""
+    try:
+        build_swms(name, filename, tasks, new_dict)
+        return (name, filename, len(tasks), "OK")
+    except Exception as e:
+        event(_log, ERROR, "build_failed", "  ERROR: {error}", exc_info=True,
+              name=name, filename=filename, error=str(e))
+        return (name, filename, len(tasks), f"FAILED: {e}")
+
+
+def _run_build_captured(build):
+    """Worker entry point for --jobs: run one build with its console
+    output captured, so per-document logs never interleave. Trace events
+    (--profile) go back to the parent with the log."""
+    swms_trace.drain()  # drop events inherited from the parent at fork
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        result = run_build(*build)
+    return result, log.getvalue(), swms_trace.drain()
+
+
+def build_all(builds=BUILDS, jobs=1):
+    """Build every SWMS in builds, serially or across a process pool.
+
+    With jobs > 1 each build_swms() call runs in its own worker process.
+    Logs are printed per document and results returned in builds order,
+    so the BUILD SUMMARY is identical to a serial run. Output files are
+    byte-identical either way (see swms_docx_io.save_docx).
+    """
+    if jobs <= 1 or len(builds) <= 1:
+        return [run_build(*build) for build in builds]
+
     results = []
-    for name, filename, tasks, new_dict in builds:
-        try:
-            path = build_swms(name, filename, tasks, new_dict)
-            results.append((name, filename, len(tasks), "OK"))
-        except Exception as e:
-            print(f"  ERROR: {e}")
-            import traceback
-            traceback.print_exc()
-            results.append((name, filename, len(tasks), f"FAILED: {e}"))
-    
+    with ProcessPoolExecutor(max_workers=min(jobs, len(builds))) as pool:
+        futures = [pool.submit(_run_build_captured, build) for build in builds]
+        # Collect in submission order — deterministic log and summary order
+        for future in futures:
+            result, log, events = future.result()
+            swms_trace.merge(events)
+            sys.stdout.write(log)
+            sys.stdout.flush()
+            results.append(result)
+    return results
+
+
+def print_build_summary(results):
     print(f"\n{'='*60}")
     print("BUILD SUMMARY")
     print(f"{'='*60}")
     for name, filename, count, status in results:
         print(f"  {status:6s} | {count:2d} tasks | {name} -> {filename}")
+
+
+# ============================================================
+# INCREMENTAL BUILD
+# ============================================================
+
+MANIFEST_NAME = '.build_manifest.json'
+MANIFEST_VERSION = 1
+
+# Source modules whose content changes the built output — every src/
+# module the build imports except logging and tracing (swms_log,
+# swms_trace). phrase_matcher drives the formatter's label, emergency
+# and P2 matching; swms_catalogue resolves the *_NEW task dicts.
+_VERSIONED_MODULES = {
+    'swms_vocabulary': 'swms_vocabulary.py',
+    'format_swms': ('format_swms.py', 'phrase_matcher.py'),
+    'engine': ('build_all_swms.py', 'swms_generator.py', 'swms_rows.py',
+               'swms_docx_io.py', 'swms_catalogue.py'),
+}
+
+
+def _digest(obj):
+    """SHA-256 of a JSON-serialisable object (tuples hash as lists,
+    frozen catalogue mappings as dicts)."""
+    blob = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=dict)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+def _module_digest(filenames):
+    """SHA-256 over the source of one or more modules in src/."""
+    if isinstance(filenames, str):
+        filenames = (filenames,)
+    h = hashlib.sha256()
+    for filename in filenames:
+        with open(os.path.join(_script_dir, filename), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def build_fingerprint(name, filename, tasks, new_dict):
+    """Return the per-component input hashes for one SWMS document.
+
+    Components: task list tuples, the resolved *_NEW task dicts the list
+    uses, the HRCW_TICKS entry, the template, and the source of the
+    vocabulary, formatter and builder modules.
+    """
+    resolved = {key: new_dict[key] for source, key in tasks if source == 'new'}
+    components = {
+        'tasks': _digest(tasks),
+        'new_tasks': _digest(resolved),
+        'hrcw': _digest(HRCW_TICKS.get(name, [])),
+        'template': template_hash(TEMPLATE),
+    }
+    for component, filenames in _VERSIONED_MODULES.items():
+        components[component] = _module_digest(filenames)
+    return components
+
+
+def load_manifest(outdir=None):
+    """Load the build manifest from outdir, or an empty one."""
+    path = os.path.join(outdir or OUTDIR, MANIFEST_NAME)
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {'version': MANIFEST_VERSION, 'documents': {}}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'documents': {}}
+    return manifest
+
+
+def save_manifest(manifest, outdir=None):
+    """Write the build manifest atomically."""
+    path = os.path.join(outdir or OUTDIR, MANIFEST_NAME)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp, path)
+
+
+def rebuild_reasons(build, components, manifest, force=False):
+    """Return why a document needs rebuilding — empty list if it is
+    up to date."""
+    name, filename = build[0], build[1]
+    if force:
+        return ['forced (--force)']
+    entry = manifest['documents'].get(filename)
+    if entry is None:
+        return ['not in build manifest']
+    if not os.path.exists(os.path.join(OUTDIR, filename)):
+        return ['output file missing']
+    previous = entry.get('components', {})
+    return [f'{component} changed' for component in components
+            if previous.get(component) != components[component]]
+
+
+def build_incremental(builds=BUILDS, jobs=1, force=False):
+    """Build only the documents whose fingerprint changed since the
+    last recorded build. Prints a per-document rebuild report and
+    returns BUILD SUMMARY entries in builds order."""
+    manifest = load_manifest()
+    fingerprints = {}
+    pending = []
+    skipped = {}
+
+    print(f"\n{'='*60}")
+    print("INCREMENTAL BUILD")
+    print(f"{'='*60}")
+    for build in builds:
+        name, filename, tasks = build[0], build[1], build[2]
+        components = build_fingerprint(*build)
+        fingerprints[filename] = components
+        reasons = rebuild_reasons(build, components, manifest, force)
+        if reasons:
+            pending.append(build)
+            print(f"  REBUILD | {name}: {', '.join(reasons)}")
+        else:
+            skipped[filename] = (name, filename, len(tasks), "SKIP")
+            print(f"  SKIP    | {name}: up to date")
+
+    built = {result[1]: result for result in build_all(pending, jobs=jobs)}
+    results = []
+    for build in builds:
+        filename = build[1]
+        if filename in skipped:
+            results.append(skipped[filename])
+            continue
+        result = built[filename]
+        if result[3] == "OK":
+            manifest['documents'][filename] = {
+                'name': build[0],
+                'fingerprint': _digest(fingerprints[filename]),
+                'components': fingerprints[filename],
+            }
+        else:
+            manifest['documents'].pop(filename, None)
+        results.append(result)
+    save_manifest(manifest)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build all RPD Master SWMS documents.")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="build documents in N worker processes "
+                             "(0 = one per CPU, default 1 = serial)")
+    parser.add_argument('-i', '--incremental', action='store_true',
+                        help="skip documents whose inputs are unchanged since "
+                             "the last build (see " + MANIFEST_NAME + ")")
+    parser.add_argument('--force', action='store_true',
+                        help="with --incremental, rebuild every document "
+                             "and refresh the build manifest")
+    swms_trace.add_cli_arguments(parser)
+    swms_log.add_cli_arguments(parser)
+    args = parser.parse_args()
+    swms_trace.enable_from_args(args)
+    swms_log.configure_from_args(args)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if args.incremental or args.force:
+        results = build_incremental(BUILDS, jobs=jobs, force=args.force)
+    else:
+        results = build_all(BUILDS, jobs=jobs)
+    print_build_summary(results)
@@ -4,6 +4,12 @@ RPD SWMS Document Formatter
 Post-processing rules applied to every generated SWMS document
 before saving.  Called by build_all_swms.py.
 
+All rules run in a single pass over the document's paragraphs: each
+rule registers a paragraph, run or element handler, and the engine
+dispatches every paragraph through the handlers in rule order
+(FORMAT_RULES).  The per-rule functions below run the same engine
+with just that rule.
+
 Rules:
   1. Bold all em dashes (—) and capitalise the following letter
   2. Standardise all fonts to Aptos 8pt
@@ -18,12 +24,18 @@ import copy
 import os
 import re
 import sys
+import time
 from lxml import etree
 from docx.oxml.ns import qn
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from swms_vocabulary import P2_CANONICAL, P2_VARIANTS
+from phrase_matcher import PhraseMatcher
+import swms_trace
+from swms_log import INFO, event, get_logger
+
+_log = get_logger("format")
 
 # ============================================================
 # CONSTANTS
@@ -58,49 +70,66 @@ EMERGENCY_PHRASES = [
     'Emergency Response',
 ]
 
+# Element tags used on every run — resolved once
+W_P = qn('w:p')
+W_R = qn('w:r')
+W_T = qn('w:t')
+W_RPR = qn('w:rPr')
+W_B = qn('w:b')
+W_I = qn('w:i')
+W_HIGHLIGHT = qn('w:highlight')
+W_COLOR = qn('w:color')
+W_RFONTS = qn('w:rFonts')
+W_VAL = qn('w:val')
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+# Any element named 't' / 'tr' regardless of namespace (lxml wildcard)
+ANY_T = '{*}t'
+ANY_TR = '{*}tr'
+
 # ============================================================
 # XML HELPERS
 # ============================================================
 
 def _ensure_rPr(r_elem):
     """Return the w:rPr child of a run, creating one if needed."""
-    rPr = r_elem.find(qn('w:rPr'))
+    rPr = r_elem.find(W_RPR)
     if rPr is None:
-        rPr = etree.SubElement(r_elem, qn('w:rPr'))
+        rPr = etree.SubElement(r_elem, W_RPR)
         r_elem.insert(0, rPr)
     return rPr
 
 
 def _set_bold(rPr):
     """Add w:b to run properties if not present."""
-    if rPr.find(qn('w:b')) is None:
-        etree.SubElement(rPr, qn('w:b'))
+    if rPr.find(W_B) is None:
+        etree.SubElement(rPr, W_B)
 
 
 def _set_highlight(rPr, colour):
     """Set w:highlight on run properties. colour = 'yellow', 'red', etc."""
-    hl = rPr.find(qn('w:highlight'))
+    hl = rPr.find(W_HIGHLIGHT)
     if hl is None:
-        hl = etree.SubElement(rPr, qn('w:highlight'))
-    hl.set(qn('w:val'), colour)
+        hl = etree.SubElement(rPr, W_HIGHLIGHT)
+    hl.set(W_VAL, colour)
 
 
 def _set_color(rPr, hex_colour):
     """Set w:color on run properties. hex_colour = 'FFFFFF', '000000', etc."""
-    c = rPr.find(qn('w:color'))
+    c = rPr.find(W_COLOR)
     if c is None:
-        c = etree.SubElement(rPr, qn('w:color'))
-    c.set(qn('w:val'), hex_colour)
+        c = etree.SubElement(rPr, W_COLOR)
+    c.set(W_VAL, hex_colour)
 
 
 def _make_run_from(rPr_orig, text, bold=False, highlight=None,
                    color=None):
     """Create a new w:r element with optional formatting overrides."""
-    nr = etree.Element(qn('w:r'))
+    nr = etree.Element(W_R)
     if rPr_orig is not None:
         nrPr = copy.deepcopy(rPr_orig)
     else:
-        nrPr = etree.SubElement(nr, qn('w:rPr'))
+        nrPr = etree.SubElement(nr, W_RPR)
     if bold:
         _set_bold(nrPr)
     if highlight:
@@ -109,117 +138,251 @@ def _make_run_from(rPr_orig, text, bold=False, highlight=None,
         _set_color(nrPr, color)
     if nrPr.getparent() is None:
         nr.insert(0, nrPr)
-    nt = etree.SubElement(nr, qn('w:t'))
-    nt.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
+    nt = etree.SubElement(nr, W_T)
+    nt.set(XML_SPACE, 'preserve')
     nt.text = text
     return nr
 
 
-def _split_and_insert(p, r, pos, label_text, rPr_orig, idx,
-                       before, after, bold=True, highlight=None,
-                       color=None):
-    """Remove run r from paragraph p and insert up to 3 replacement
-    runs: before-text, label (formatted), after-text."""
-    insert_idx = idx
+def _split_run(rPr_orig, before, label_text, after, bold=True,
+               highlight=None, color=None):
+    """Return up to 3 replacement runs: before-text, label (formatted),
+    after-text."""
+    runs = []
     if before:
-        p.insert(insert_idx, _make_run_from(rPr_orig, before))
-        insert_idx += 1
+        runs.append(_make_run_from(rPr_orig, before))
+    runs.append(_make_run_from(rPr_orig, label_text,
+                               bold=bold, highlight=highlight,
+                               color=color))
+    if after:
+        runs.append(_make_run_from(rPr_orig, after))
+    return runs
 
-    p.insert(insert_idx,
-             _make_run_from(rPr_orig, label_text,
-                            bold=bold, highlight=highlight,
-                            color=color))
-    insert_idx += 1
 
-    if after:
-        p.insert(insert_idx, _make_run_from(rPr_orig, after))
-        insert_idx += 1
+def rewrite_runs(p, rewrite):
+    """Rewrite the w:r children of paragraph p in one pass.
+
+    rewrite(r) returns None to keep run r, or (replacement_runs, count)
+    to replace it.  Replacements are collected and p's child list is
+    rebuilt once at the end, so splitting many runs in a long paragraph
+    stays linear instead of one index lookup + insert per match.
+
+    Returns the summed count.
+    """
+    new_children = []
+    count = 0
+    changed = False
+    for child in p:
+        if child.tag == W_R:
+            result = rewrite(child)
+            if result is not None:
+                runs, n = result
+                new_children.extend(runs)
+                count += n
+                changed = True
+                continue
+        new_children.append(child)
+    if changed:
+        p[:] = new_children
+    return count
+
 
-    return 1  # count
+def _nearest_paragraph(elem):
+    """Return the closest enclosing w:p of elem, or None."""
+    return next(elem.iterancestors(W_P), None)
+
+
+def _outside_paragraphs(elem):
+    """Yield the descendants of elem in document order, skipping every
+    w:p subtree."""
+    for child in elem:
+        if child.tag == W_P:
+            continue
+        yield child
+        yield from _outside_paragraphs(child)
+
+
+# ============================================================
+# RULE ENGINE
+# ============================================================
+
+PARAGRAPH = 'paragraph'   # handler(p, ctx) -> count
+RUN = 'run'               # handler(r, ctx) -> None | (new_runs, count)
+ELEMENT = 'element'       # handler(elem, ctx) -> count, per matching element
+
+
+class FormatRule:
+    """One formatting rule: a results key, a dispatch scope and a
+    handler.  ELEMENT rules also name the tag they apply to."""
+
+    def __init__(self, key, scope, handler, tag=None):
+        self.key = key
+        self.scope = scope
+        self.handler = handler
+        self.tag = tag
+
+    def matches(self, tag):
+        """True if an ELEMENT rule applies to an element with this tag."""
+        if self.tag == ANY_T:
+            return tag.rpartition('}')[2] == 't'
+        return tag == self.tag
+
+    def apply(self, p, ctx):
+        """Run this rule over one paragraph and return its count."""
+        if self.scope == PARAGRAPH:
+            return self.handler(p, ctx)
+        if self.scope == RUN:
+            return rewrite_runs(p, lambda r: self.handler(r, ctx))
+        count = 0
+        # ELEMENT: only elements whose closest paragraph is p —
+        # nested paragraphs (text boxes) are dispatched separately
+        for elem in [e for e in p.iter(self.tag)
+                     if _nearest_paragraph(e) is p]:
+            count += self.handler(elem, ctx)
+        return count
+
+
+class _FormatContext:
+    """Traversal state shared with handlers."""
+
+    def __init__(self):
+        self.row_num = 0   # table rows seen so far (for console logging)
+
+
+def apply_rules(doc, rules, timer=None):
+    """Apply rules to doc in a single pass over its paragraphs.
+
+    Every paragraph is passed through each rule in list order before the
+    pass moves on, so each rule sees a paragraph exactly as it would
+    after the earlier rules had run over the whole document.  ELEMENT
+    rules then reach matching elements outside any paragraph in a
+    second, separate pass.
+
+    The paragraphs (and table rows, for the P2 row number) are collected
+    before any rule runs: RUN rules replace a paragraph's children, and a
+    live lxml iterator that was about to step into a replaced run stops
+    without visiting the rest of the document.
+
+    timer: optional swms_trace.RuleTimer — accumulates time per rule key.
+
+    Returns {rule.key: count} in rule order.
+    """
+    counts = {rule.key: 0 for rule in rules}
+    ctx = _FormatContext()
+    body = doc.element.body
+
+    for elem in list(body.iter(W_P, ANY_TR)):
+        if elem.tag != W_P:
+            ctx.row_num += 1
+            continue
+        if timer is None:
+            for rule in rules:
+                counts[rule.key] += rule.apply(elem, ctx)
+        else:
+            for rule in rules:
+                start = time.perf_counter_ns()
+                counts[rule.key] += rule.apply(elem, ctx)
+                timer.add(rule.key, time.perf_counter_ns() - start)
+
+    element_rules = [rule for rule in rules if rule.scope == ELEMENT]
+    if not element_rules:
+        return counts
+    ctx.row_num = 0
+    for elem in list(_outside_paragraphs(body)):
+        tag = elem.tag
+        if not isinstance(tag, str):
+            continue  # comments / processing instructions
+        if tag.rpartition('}')[2] == 'tr':
+            ctx.row_num += 1
+            continue
+        for rule in element_rules:
+            if rule.matches(tag):
+                start = time.perf_counter_ns() if timer is not None else 0
+                counts[rule.key] += rule.handler(elem, ctx)
+                if timer is not None:
+                    timer.add(rule.key, time.perf_counter_ns() - start)
+    return counts
 
 
 # ============================================================
 # RULE 1 — Bold em dashes + capitalise following letter
 # ============================================================
 
+_EM_CAPITALISE = re.compile(EM + r' ([a-z])')
+
+
+def _em_dash_run(r, ctx):
+    """Split one run at every em dash so the dash itself is bold."""
+    t_elem = r.find(W_T)
+    if t_elem is None or not t_elem.text or EM not in t_elem.text:
+        return None
+    rPr_orig = r.find(W_RPR)
+
+    # Capitalise first letter after each em dash
+    raw = _EM_CAPITALISE.sub(
+        lambda m: EM + ' ' + m.group(1).upper(),
+        t_elem.text,
+    )
+    parts = raw.split(EM)
+
+    runs = []
+    for j, part in enumerate(parts):
+        if j > 0:
+            runs.append(_make_run_from(rPr_orig, EM, bold=True))
+        if part:
+            runs.append(_make_run_from(rPr_orig, part))
+    return runs, len(parts) - 1
+
+
 def bold_em_dashes(doc):
     """Split runs at every em dash so the dash itself is bold.
 
-    Also capitalises the first letter after each dash in the run
+    Also capitalises the first letter after each em dash in the run
     text before splitting, so the source is corrected in-place.
     """
-    count = 0
-    for p in doc.element.body.iter(qn('w:p')):
-        runs_with_dash = [
-            r for r in p.findall(qn('w:r'))
-            if (r.find(qn('w:t')) is not None
-                and r.find(qn('w:t')).text
-                and EM in r.find(qn('w:t')).text)
-        ]
-        for r in runs_with_dash:
-            t_elem = r.find(qn('w:t'))
-            rPr_orig = r.find(qn('w:rPr'))
-
-            # Capitalise first letter after each em dash
-            raw = re.sub(
-                EM + r' ([a-z])',
-                lambda m: EM + ' ' + m.group(1).upper(),
-                t_elem.text,
-            )
-            parts = raw.split(EM)
-            idx = list(p).index(r)
-            p.remove(r)
-
-            insert_idx = idx
-            for j, part in enumerate(parts):
-                if j > 0:
-                    p.insert(insert_idx,
-                             _make_run_from(rPr_orig, EM, bold=True))
-                    insert_idx += 1
-                    count += 1
-
-                if part:
-                    p.insert(insert_idx,
-                             _make_run_from(rPr_orig, part))
-                    insert_idx += 1
-    return count
+    return apply_rules(doc, [RULE_EM_DASHES])['em_dashes']
 
 
 # ============================================================
 # RULE 2 — Standardise fonts to Aptos 8pt
 # ============================================================
 
+_FONT_ATTRS = (qn('w:ascii'), qn('w:hAnsi'), qn('w:cs'), qn('w:eastAsia'))
+_FONT_REQUIRED = (qn('w:ascii'), qn('w:hAnsi'))
+_SIZE_TAGS = (qn('w:sz'), qn('w:szCs'))
+
+
+def _fonts_rPr(rPr, ctx):
+    """Standardise one w:rPr to Aptos 8pt. Returns 1 if changed."""
+    changed = False
+
+    # Font name
+    rFonts = rPr.find(W_RFONTS)
+    if rFonts is not None:
+        for attr in _FONT_ATTRS:
+            cur = rFonts.get(attr)
+            if cur is not None and cur != FONT_NAME:
+                rFonts.set(attr, FONT_NAME)
+                changed = True
+            elif cur is None and attr in _FONT_REQUIRED:
+                rFonts.set(attr, FONT_NAME)
+                changed = True
+
+    # Font size
+    for tag in _SIZE_TAGS:
+        sz = rPr.find(tag)
+        if sz is not None:
+            if sz.get(W_VAL) != FONT_SIZE:
+                sz.set(W_VAL, FONT_SIZE)
+                changed = True
+
+    return 1 if changed else 0
+
+
 def standardise_fonts(doc):
     """Set every w:rFonts to Aptos and every w:sz/w:szCs to 8pt
     throughout the document body."""
-    count = 0
-    for rPr in doc.element.body.iter(qn('w:rPr')):
-        changed = False
-
-        # Font name
-        rFonts = rPr.find(qn('w:rFonts'))
-        if rFonts is not None:
-            for attr in (qn('w:ascii'), qn('w:hAnsi'), qn('w:cs'),
-                         qn('w:eastAsia')):
-                cur = rFonts.get(attr)
-                if cur is not None and cur != FONT_NAME:
-                    rFonts.set(attr, FONT_NAME)
-                    changed = True
-                elif cur is None and attr in (qn('w:ascii'), qn('w:hAnsi')):
-                    rFonts.set(attr, FONT_NAME)
-                    changed = True
-
-        # Font size
-        for tag in (qn('w:sz'), qn('w:szCs')):
-            sz = rPr.find(tag)
-            if sz is not None:
-                if sz.get(qn('w:val')) != FONT_SIZE:
-                    sz.set(qn('w:val'), FONT_SIZE)
-                    changed = True
-
-        if changed:
-            count += 1
-    return count
+    return apply_rules(doc, [RULE_FONTS])['fonts']
 
 
 # ============================================================
@@ -227,6 +390,59 @@ def standardise_fonts(doc):
 #           and HOLD POINT
 # ============================================================
 
+# Labels that only need bold on the label text
+# STOP WORK: bold + yellow on label only (conditions stay normal)
+_ALL_LABELS = (
+    [(lbl, False, None, None) for lbl in BOLD_LABELS]
+    + [(lbl, True, 'yellow', None) for lbl in BOLD_YELLOW_LABELS]
+)
+_LABEL_MATCHER = PhraseMatcher([entry[0] for entry in _ALL_LABELS])
+
+
+def _labels_paragraph(p, ctx):
+    """Bold control labels in one paragraph; HOLD POINT paragraphs
+    are bold + yellow throughout."""
+    # --- HOLD POINT: highlight ALL runs in paragraph ---
+    para_text = ''.join(
+        (r.find(W_T).text or '')
+        for r in p.findall(W_R)
+        if r.find(W_T) is not None
+    )
+    if 'HOLD POINT' in para_text:
+        for r in p.findall(W_R):
+            rPr = _ensure_rPr(r)
+            _set_bold(rPr)
+            _set_highlight(rPr, 'yellow')
+        return 1  # skip per-run label search for this paragraph
+
+    # --- All other labels: split runs ---
+    return rewrite_runs(p, _label_run)
+
+
+def _label_run(r):
+    """Split the first control label out of one run (bold, plus yellow
+    highlight for STOP WORK)."""
+    t_elem = r.find(W_T)
+    if t_elem is None or not t_elem.text:
+        return None
+    text = t_elem.text
+
+    # First label in _ALL_LABELS order — one label per run
+    hit = _LABEL_MATCHER.first_by_priority(text)
+    if hit is None:
+        return None
+
+    index, pos = hit
+    label, needs_hl, hl_colour, txt_colour = _ALL_LABELS[index]
+    before = text[:pos]
+    after = text[pos + len(label):]
+    runs = _split_run(r.find(W_RPR), before, label, after,
+                      bold=True,
+                      highlight=hl_colour,
+                      color=txt_colour)
+    return runs, 1
+
+
 def bold_control_labels(doc):
     """Find control labels and STOP WORK / HOLD POINT phrases.
     Split them into formatted runs:
@@ -234,62 +450,50 @@ def bold_control_labels(doc):
       - STOP WORK if: → bold + yellow highlight on LABEL ONLY
       - HOLD POINT → bold + yellow highlight on ENTIRE LINE
     """
-    # Labels that only need bold on the label text
-    std_labels = [(lbl, False, None, None) for lbl in BOLD_LABELS]
-    # STOP WORK: bold + yellow on label only (conditions stay normal)
-    sw_labels = [(lbl, True, 'yellow', None) for lbl in BOLD_YELLOW_LABELS]
-
-    all_labels = std_labels + sw_labels
-    count = 0
-
-    for p in doc.element.body.iter(qn('w:p')):
-        # --- HOLD POINT: highlight ALL runs in paragraph ---
-        para_text = ''.join(
-            (r.find(qn('w:t')).text or '')
-            for r in p.findall(qn('w:r'))
-            if r.find(qn('w:t')) is not None
-        )
-        if 'HOLD POINT' in para_text:
-            for r in p.findall(qn('w:r')):
-                rPr = _ensure_rPr(r)
-                _set_bold(rPr)
-                _set_highlight(rPr, 'yellow')
-            count += 1
-            continue  # skip per-run label search for this paragraph
-
-        # --- All other labels: split runs ---
-        for r in list(p.findall(qn('w:r'))):
-            t_elem = r.find(qn('w:t'))
-            if t_elem is None or not t_elem.text:
-                continue
-            text = t_elem.text
-
-            for label, needs_hl, hl_colour, txt_colour in all_labels:
-                if label not in text:
-                    continue
-
-                pos = text.find(label)
-                before = text[:pos]
-                after = text[pos + len(label):]
-                rPr_orig = r.find(qn('w:rPr'))
-                idx = list(p).index(r)
-                p.remove(r)
-
-                count += _split_and_insert(
-                    p, r, pos, label, rPr_orig, idx,
-                    before, after,
-                    bold=True,
-                    highlight=hl_colour,
-                    color=txt_colour,
-                )
-                break  # one label per run
-    return count
+    return apply_rules(doc, [RULE_LABELS])['labels']
 
 
 # ============================================================
 # RULE 4 — Bold sub-labels (any "Label:" at start of run text)
 # ============================================================
 
+# Match: start-of-text, optional whitespace, then
+# one or more capitalised words (with hyphens/slashes) ending ':'
+_SUB_LABEL_PATTERN = re.compile(
+    r'^(\s*)'                        # leading whitespace
+    r'([A-Z][A-Za-z/\-\s]*[a-z]:)'  # Label ending with colon
+    r'(\s.*|$)',                      # rest of text
+    re.DOTALL,
+)
+# Skip labels already handled by Rule 3
+_ALREADY_HANDLED = set(BOLD_LABELS + BOLD_YELLOW_LABELS +
+                       HOLD_POINT_PHRASES)
+
+
+def _sub_label_run(r, ctx):
+    """Bold a leading 'Label:' in one run."""
+    t_elem = r.find(W_T)
+    if t_elem is None or not t_elem.text:
+        return None
+
+    # Skip if already bold
+    rPr = r.find(W_RPR)
+    if rPr is not None and rPr.find(W_B) is not None:
+        return None
+
+    m = _SUB_LABEL_PATTERN.match(t_elem.text)
+    if not m:
+        return None
+
+    label = m.group(2)
+    if label in _ALREADY_HANDLED:
+        return None
+
+    before = m.group(1)  # leading whitespace
+    after = m.group(3)
+    return _split_run(rPr, before, label, after, bold=True), 1
+
+
 def bold_sub_labels(doc):
     """In CCVS control cells, bold any sub-label pattern like
     'Anchor verification:', 'Two-rope system:', 'Rescue readiness:'
@@ -299,166 +503,135 @@ def bold_sub_labels(doc):
     Only matches capitalised words before the colon (to avoid
     false positives on phrases like 'e.g.:' or 'i.e.:').
     """
-    # Match: start-of-text, optional whitespace, then
-    # one or more capitalised words (with hyphens/slashes) ending ':'
-    pattern = re.compile(
-        r'^(\s*)'                        # leading whitespace
-        r'([A-Z][A-Za-z/\-\s]*[a-z]:)'  # Label ending with colon
-        r'(\s.*|$)',                      # rest of text
-        re.DOTALL,
-    )
-    # Skip labels already handled by Rule 3
-    already_handled = set(BOLD_LABELS + BOLD_YELLOW_LABELS +
-                          HOLD_POINT_PHRASES)
+    return apply_rules(doc, [RULE_SUB_LABELS])['sub_labels']
 
-    count = 0
-    for p in doc.element.body.iter(qn('w:p')):
-        for r in list(p.findall(qn('w:r'))):
-            t_elem = r.find(qn('w:t'))
-            if t_elem is None or not t_elem.text:
-                continue
 
-            # Skip if already bold
-            rPr = r.find(qn('w:rPr'))
-            if rPr is not None and rPr.find(qn('w:b')) is not None:
-                continue
+# ============================================================
+# RULE 5 — Italic for [bracketed] task descriptions
+# ============================================================
 
-            m = pattern.match(t_elem.text)
-            if not m:
-                continue
+_BRACKET_PATTERN = re.compile(r'(\[.+?\])')
 
-            label = m.group(2)
-            if label in already_handled:
-                continue
 
-            before = m.group(1)  # leading whitespace
-            after = m.group(3)
-            rPr_orig = r.find(qn('w:rPr'))
-            idx = list(p).index(r)
-            p.remove(r)
-
-            count += _split_and_insert(
-                p, r, 0, label, rPr_orig, idx,
-                before if before.strip() else before,
-                after,
-                bold=True,
-            )
-    return count
+def _italic_run(r, ctx):
+    """Italicise the first [bracketed] span in one run."""
+    t_elem = r.find(W_T)
+    if t_elem is None or not t_elem.text:
+        return None
+    text = t_elem.text
 
+    if '[' not in text or ']' not in text:
+        return None
+
+    m = _BRACKET_PATTERN.search(text)
+    if not m:
+        return None
+
+    bracket_text = m.group(1)
+    pos = text.find(bracket_text)
+    before = text[:pos]
+    after = text[pos + len(bracket_text):]
+    rPr_orig = r.find(W_RPR)
+
+    runs = []
+    if before:
+        runs.append(_make_run_from(rPr_orig, before))
+
+    # Italic + dark grey run for bracketed text
+    ir = etree.Element(W_R)
+    if rPr_orig is not None:
+        irPr = copy.deepcopy(rPr_orig)
+    else:
+        irPr = etree.SubElement(ir, W_RPR)
+    if irPr.find(W_I) is None:
+        etree.SubElement(irPr, W_I)
+    _set_color(irPr, '444444')
+    # Remove bold if present (descriptions should not be bold)
+    b_elem = irPr.find(W_B)
+    if b_elem is not None:
+        irPr.remove(b_elem)
+    if irPr.getparent() is None:
+        ir.insert(0, irPr)
+    it = etree.SubElement(ir, W_T)
+    it.set(XML_SPACE, 'preserve')
+    it.text = bracket_text
+    runs.append(ir)
+
+    if after:
+        runs.append(_make_run_from(rPr_orig, after))
+
+    return runs, 1
 
-# ============================================================
-# RULE 5 — Italic for [bracketed] task descriptions
-# ============================================================
 
 def italic_bracketed_descriptions(doc):
     """Find text wrapped in [square brackets] and make it italic.
     Applies dark grey colour (444444) for visual distinction.
     Targets task description text in column 0/1 of the task table.
     """
-    pattern = re.compile(r'(\[.+?\])')
-    count = 0
+    return apply_rules(doc, [RULE_ITALIC_DESC])['italic_desc']
 
-    for p in doc.element.body.iter(qn('w:p')):
-        for r in list(p.findall(qn('w:r'))):
-            t_elem = r.find(qn('w:t'))
-            if t_elem is None or not t_elem.text:
-                continue
-            text = t_elem.text
 
-            if '[' not in text or ']' not in text:
-                continue
+# ============================================================
+# RULE 6 — Emergency Response: white text + red highlight
+# ============================================================
 
-            m = pattern.search(text)
-            if not m:
-                continue
+_EMERGENCY_MATCHER = PhraseMatcher(EMERGENCY_PHRASES)
 
-            bracket_text = m.group(1)
-            pos = text.find(bracket_text)
-            before = text[:pos]
-            after = text[pos + len(bracket_text):]
-            rPr_orig = r.find(qn('w:rPr'))
-            idx = list(p).index(r)
-            p.remove(r)
-
-            insert_idx = idx
-
-            if before:
-                p.insert(insert_idx,
-                         _make_run_from(rPr_orig, before))
-                insert_idx += 1
-
-            # Italic + dark grey run for bracketed text
-            ir = etree.Element(qn('w:r'))
-            if rPr_orig is not None:
-                irPr = copy.deepcopy(rPr_orig)
-            else:
-                irPr = etree.SubElement(ir, qn('w:rPr'))
-            if irPr.find(qn('w:i')) is None:
-                etree.SubElement(irPr, qn('w:i'))
-            _set_color(irPr, '444444')
-            # Remove bold if present (descriptions should not be bold)
-            b_elem = irPr.find(qn('w:b'))
-            if b_elem is not None:
-                irPr.remove(b_elem)
-            if irPr.getparent() is None:
-                ir.insert(0, irPr)
-            it = etree.SubElement(ir, qn('w:t'))
-            it.set('{http://www.w3.org/XML/1998/namespace}space',
-                   'preserve')
-            it.text = bracket_text
-            p.insert(insert_idx, ir)
-            insert_idx += 1
-            count += 1
-
-            if after:
-                p.insert(insert_idx,
-                         _make_run_from(rPr_orig, after))
-                insert_idx += 1
 
-    return count
+def _emergency_run(r, ctx):
+    """White text + red highlight on an emergency phrase in one run."""
+    t_elem = r.find(W_T)
+    if t_elem is None or not t_elem.text:
+        return None
 
+    text = t_elem.text
+    hit = _EMERGENCY_MATCHER.first_by_priority(text)
+    if hit is None:
+        return None
+
+    index, pos = hit
+    phrase = EMERGENCY_PHRASES[index]
+    before = text[:pos]
+    after = text[pos + len(phrase):]
+    runs = _split_run(r.find(W_RPR), before, phrase, after,
+                      bold=True,
+                      highlight='red',
+                      color='FFFFFF')
+    return runs, 1
 
-# ============================================================
-# RULE 6 — Emergency Response: white text + red highlight
-# ============================================================
 
 def highlight_emergency_response(doc):
     """Find 'Emergency Response' in task name cells and apply
     white text + red highlight."""
-    count = 0
-    for p in doc.element.body.iter(qn('w:p')):
-        for r in list(p.findall(qn('w:r'))):
-            t_elem = r.find(qn('w:t'))
-            if t_elem is None or not t_elem.text:
-                continue
-
-            for phrase in EMERGENCY_PHRASES:
-                if phrase not in t_elem.text:
-                    continue
-
-                text = t_elem.text
-                pos = text.find(phrase)
-                before = text[:pos]
-                after = text[pos + len(phrase):]
-                rPr_orig = r.find(qn('w:rPr'))
-                idx = list(p).index(r)
-                p.remove(r)
-
-                count += _split_and_insert(
-                    p, r, pos, phrase, rPr_orig, idx,
-                    before, after,
-                    bold=True,
-                    highlight='red',
-                    color='FFFFFF',
-                )
-                break
-    return count
+    return apply_rules(doc, [RULE_EMERGENCY])['emergency']
 
 
 # ============================================================
 # RULE 7 — P2 respirator normalisation
 # ============================================================
 
+# Case-insensitive, longest variant first
+_P2_MATCHER = PhraseMatcher(P2_VARIANTS, ignore_case=True)
+
+
+def _p2_text(elem, ctx):
+    """Replace non-canonical P2 terms in one text element.
+    Counts (and logs) each distinct variant replaced once."""
+    if elem.text is None:
+        return 0
+
+    new_text, replaced = _P2_MATCHER.sub(elem.text, P2_CANONICAL)
+    if not replaced:
+        return 0
+    for index in replaced:
+        event(_log, INFO, "p2_autofix",
+              "  AUTO-FIX: '{variant}' -> '{canonical}' [Row {row}]",
+              variant=P2_VARIANTS[index], canonical=P2_CANONICAL,
+              row=ctx.row_num)
+    elem.text = new_text
+    return len(replaced)
+
+
 def normalise_p2_respirator(doc):
     """Find non-canonical P2 terms and replace with the locked
     canonical form: 'P2 respirator (minimum)'.
@@ -466,54 +639,44 @@ def normalise_p2_respirator(doc):
     Scans every text run in the document body.  Matches are
     case-insensitive.  Logs each replacement to console.
     """
-    count = 0
-    # Build case-insensitive patterns, longest first
-    patterns = [(re.compile(re.escape(v), re.IGNORECASE), v)
-                for v in P2_VARIANTS]
-
-    # Track row number (approximate — count table rows)
-    row_num = 0
-    for elem in doc.element.body.iter():
-        tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-        if tag == 'tr':
-            row_num += 1
-
-        if tag != 't':
-            continue
-
-        if elem.text is None:
-            continue
-
-        text = elem.text
-        for pat, variant in patterns:
-            if pat.search(text):
-                new_text = pat.sub(P2_CANONICAL, text)
-                if new_text != text:
-                    print(f"  AUTO-FIX: '{variant}' -> "
-                          f"'{P2_CANONICAL}' [Row {row_num}]")
-                    elem.text = new_text
-                    text = new_text
-                    count += 1
-
-    return count
+    return apply_rules(doc, [RULE_P2_NORMALISE])['p2_normalise']
 
 
 # ============================================================
 # MAIN ENTRY POINT
 # ============================================================
 
+RULE_P2_NORMALISE = FormatRule('p2_normalise', ELEMENT, _p2_text, tag=ANY_T)
+RULE_EM_DASHES = FormatRule('em_dashes', RUN, _em_dash_run)
+RULE_FONTS = FormatRule('fonts', ELEMENT, _fonts_rPr, tag=W_RPR)
+RULE_LABELS = FormatRule('labels', PARAGRAPH, _labels_paragraph)
+RULE_SUB_LABELS = FormatRule('sub_labels', RUN, _sub_label_run)
+RULE_ITALIC_DESC = FormatRule('italic_desc', RUN, _italic_run)
+RULE_EMERGENCY = FormatRule('emergency', RUN, _emergency_run)
+
+# Order matters — each rule sees the output of the rules before it
+FORMAT_RULES = [
+    RULE_P2_NORMALISE,
+    RULE_EM_DASHES,
+    RULE_FONTS,
+    RULE_LABELS,
+    RULE_SUB_LABELS,
+    RULE_ITALIC_DESC,
+    RULE_EMERGENCY,
+]
+
+
 def format_swms(doc):
     """Apply all formatting rules to a SWMS document.
     Call this once before doc.save().
 
-    Returns a dict of counts for reporting.
+    Returns a dict of counts for reporting.  With tracing enabled the
+    format_swms stage carries per-rule time and call counts.
     """
-    results = {}
-    results['p2_normalise'] = normalise_p2_respirator(doc)
-    results['em_dashes'] = bold_em_dashes(doc)
-    results['fonts'] = standardise_fonts(doc)
-    results['labels'] = bold_control_labels(doc)
-    results['sub_labels'] = bold_sub_labels(doc)
-    results['italic_desc'] = italic_bracketed_descriptions(doc)
-    results['emergency'] = highlight_emergency_response(doc)
-    return results
+    with swms_trace.stage('format_swms') as st:
+        if not swms_trace.is_enabled():
+            return apply_rules(doc, FORMAT_RULES)
+        timer = swms_trace.RuleTimer()
+        counts = apply_rules(doc, FORMAT_RULES, timer)
+        st.args['rules'] = timer.summary()
+        return counts
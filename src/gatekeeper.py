@@ -0,0 +1,723 @@
+#!/usr/bin/env python3
+"""
+gatekeeper.py — RPD SWMS command-line front end
+
+BATCH:
+  Generate the STANDARD + CCVS versions of many jobs in one run. Each job
+  is a spec file with the same schema as a SWMS_BASE_GENERAL job file:
+
+    PROJECT, TASKS, PPE_CONTENT, PERMITS_CONTENT, QUALS_CONTENT,
+    PLANT_CONTENT, SUBSTANCES_CONTENT, LEGISLATION_APPEND
+    TEMPLATE (optional — path relative to the spec file)
+    NAME     (optional — job name in the summary, default the file name)
+
+  Spec formats: .json, .yaml / .yml (needs PyYAML), or an existing job
+  module (.py, e.g. swms_screed_pump.py) — its constants are read, its
+  __main__ runner is not executed.
+
+  The engine is imported and every template parsed once per worker
+  process (warm template cache); jobs run in a process pool and each
+  writes PROJECT["output_standard"] / ["output_ccvs"] .docx to --out.
+  A summary manifest (outputs, timings, short codes) is written to
+  <out>/batch_manifest.json.
+
+USAGE:
+    python3 gatekeeper.py batch jobs/
+    python3 gatekeeper.py batch jobs/ -o outputs/ -j 0 --bullets
+    python3 gatekeeper.py batch swms_screed_pump.py swms_22smith_spalling.py
+    python3 gatekeeper.py batch jobs/ -j 2 --profile trace.json --profile-format chrome
+    python3 gatekeeper.py batch jobs/ --log json    # engine events as JSON lines
+
+SERVE:
+  Long-running localhost HTTP service over a pool of warm workers
+  (engine imported, templates parsed, master build modules loaded), so
+  interactive requests skip interpreter start-up and template parsing.
+
+    GET  /health     — liveness, worker count
+    GET  /metrics    — per-endpoint request counts and timings
+    POST /generate   — job spec JSON (batch schema) + optional
+                       "variants": ["standard", "ccvs"], "bullets": bool,
+                       "return": "path" | "bytes" (bytes: one variant);
+                       TEMPLATE names a file in the --template directory,
+                       output names are plain file names
+    POST /build      — {"name": "<BUILDS name or filename>"} — one master
+                       SWMS via build_all_swms; same "return" option
+
+    python3 gatekeeper.py serve --port 8765 -j 2
+
+  Every response carries X-Gatekeeper-Seconds (server-side time).
+  If a worker process dies the pool is broken: requests get 503 until
+  the service is restarted.
+
+EXIT CODES (batch):
+    0 — every job generated
+    1 — one or more jobs failed (bad spec, validation, write error)
+    2 — no job specs found
+"""
+
+import argparse
+import contextlib
+import glob
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_script_dir)
+sys.path.insert(0, _script_dir)
+import swms_log
+import swms_trace
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+DEFAULT_TEMPLATE = os.path.join(_project_root, "docs", "SWMS_Template.docx")
+DEFAULT_OUTDIR = os.path.join(_script_dir, "outputs")
+MANIFEST_NAME = "batch_manifest.json"
+MANIFEST_VERSION = 1
+
+# Spec files picked up from a directory; job modules (.py) must be named
+SPEC_EXTENSIONS = (".json", ".yaml", ".yml")
+
+# Spec key → generate_swms_variants() keyword
+REQUIREMENT_KEYS = {
+    "PPE_CONTENT": "ppe",
+    "PERMITS_CONTENT": "permits",
+    "QUALS_CONTENT": "quals",
+    "PLANT_CONTENT": "plant",
+    "SUBSTANCES_CONTENT": "substances",
+    "LEGISLATION_APPEND": "leg_append",
+}
+REQUIRED_KEYS = ("PROJECT", "TASKS") + tuple(REQUIREMENT_KEYS)
+REQUIRED_PROJECT_KEYS = ("title_prefix", "output_standard", "output_ccvs")
+
+
+# ============================================================
+# JOB SPECS
+# ============================================================
+
+def _load_module_spec(path):
+    """Read the spec constants from a job module without running __main__."""
+    name = "_gatekeeper_job_" + os.path.splitext(os.path.basename(path))[0]
+    module_spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(module_spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        module_spec.loader.exec_module(module)
+    return {key: getattr(module, key) for key in REQUIRED_KEYS + ("TEMPLATE",)
+            if hasattr(module, key)}
+
+
+def load_spec(path):
+    """Load and check one job spec. Returns the spec dict.
+    Raises ValueError for an unreadable or incomplete spec."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".py":
+        spec = _load_module_spec(path)
+        # A job module's TEMPLATE is set inside its __main__ block
+        spec.pop("TEMPLATE", None)
+    elif ext in (".yaml", ".yml"):
+        if yaml is None:
+            raise ValueError(f"PyYAML not installed — cannot read {path} "
+                             f"(pip install pyyaml, or use a .json spec)")
+        with open(path, encoding="utf-8") as f:
+            spec = yaml.safe_load(f)
+    elif ext == ".json":
+        with open(path, encoding="utf-8") as f:
+            spec = json.load(f)
+    else:
+        raise ValueError(f"Unsupported job spec type: {path}")
+    return check_spec(spec, path, os.path.dirname(os.path.abspath(path)))
+
+
+def check_spec(spec, source, base_dir):
+    """Check a job spec mapping; resolve TEMPLATE against base_dir.
+    Returns the spec. Raises ValueError naming source if incomplete."""
+    if not isinstance(spec, dict):
+        raise ValueError(f"{source}: job spec must be a mapping")
+    missing = [key for key in REQUIRED_KEYS if key not in spec]
+    if missing:
+        raise ValueError(f"{source}: missing {', '.join(missing)}")
+    if not isinstance(spec["PROJECT"], dict):
+        raise ValueError(f"{source}: PROJECT must be a mapping")
+    missing = [key for key in REQUIRED_PROJECT_KEYS if key not in spec["PROJECT"]]
+    if missing:
+        raise ValueError(f"{source}: PROJECT missing {', '.join(missing)}")
+    if not isinstance(spec["TASKS"], list) or not spec["TASKS"]:
+        raise ValueError(f"{source}: TASKS must be a non-empty list")
+    if spec.get("TEMPLATE"):
+        spec["TEMPLATE"] = os.path.join(base_dir, spec["TEMPLATE"])
+    return spec
+
+
+def expand_specs(inputs):
+    """Expand files, directories and glob patterns to spec paths.
+    Directories contribute their top-level spec files; job modules (.py)
+    are taken only when named explicitly or by a glob."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(
+                os.path.join(item, name) for name in os.listdir(item)
+                if os.path.splitext(name)[1].lower() in SPEC_EXTENSIONS)
+        elif os.path.exists(item):
+            matches = [item]
+        else:
+            matches = sorted(glob.glob(item))
+            if not matches:
+                print(f"WARNING: no job specs match {item}")
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+# ============================================================
+# WORKERS
+# ============================================================
+
+def _warm_worker(templates):
+    """Pool initializer: import the engine and parse each template once,
+    so every job in this worker starts from a warm template cache."""
+    from swms_docx_io import load_template
+    import SWMS_BASE_GENERAL  # noqa: F401
+    for template in templates:
+        if os.path.exists(template):
+            load_template(template)
+
+
+def _within(path, directory):
+    """True if path resolves to a location inside directory."""
+    directory = os.path.realpath(directory)
+    return os.path.commonpath([os.path.realpath(path), directory]) == directory
+
+
+def output_path(outdir, name):
+    """Return outdir/<name>.docx for a PROJECT output name.
+    Raises ValueError if the name is not a plain file name or the path
+    would land outside outdir."""
+    if (not isinstance(name, str) or not name or name in (".", "..")
+            or os.sep in name or (os.altsep and os.altsep in name)):
+        raise ValueError(f"Output name must be a plain file name: {name!r}")
+    path = os.path.join(outdir, name + ".docx")
+    if not _within(path, outdir):
+        raise ValueError(f"Output name leaves the output directory: {name!r}")
+    return path
+
+
+def generate_job(spec, outdir, default_template, bullets=False,
+                 variants=("standard", "ccvs")):
+    """Generate the requested variants of a checked spec into outdir.
+    Returns {outputs, tasks, short_codes}; raises on failure."""
+    from SWMS_BASE_GENERAL import generate_swms_variants, short_codes
+
+    project = spec["PROJECT"]
+    output_std = output_ccvs = None
+    if "standard" in variants:
+        output_std = output_path(outdir, project["output_standard"])
+    if "ccvs" in variants:
+        output_ccvs = output_path(outdir, project["output_ccvs"])
+    requirements = {kw: spec[key] for key, kw in REQUIREMENT_KEYS.items()}
+    tasks = generate_swms_variants(
+        spec.get("TEMPLATE") or default_template, output_std, output_ccvs,
+        spec["TASKS"], project=project, bullets=bullets, **requirements)
+    return {
+        "outputs": [path for path in (output_std, output_ccvs) if path],
+        "tasks": len(tasks),
+        "short_codes": [{"task": name, "code": code}
+                        for name, code in short_codes(tasks)],
+    }
+
+
+def run_job(spec_path, outdir, default_template, bullets=False):
+    """Generate one job's STANDARD + CCVS outputs.
+    Failures are returned in the result, never raised."""
+    start = time.perf_counter()
+    result = {
+        "spec": spec_path,
+        "name": os.path.splitext(os.path.basename(spec_path))[0],
+        "status": "OK",
+        "outputs": [],
+        "tasks": 0,
+        "short_codes": [],
+        "seconds": 0.0,
+        "error": None,
+    }
+    try:
+        with swms_trace.stage("job", spec=os.path.basename(spec_path)):
+            spec = load_spec(spec_path)
+            result["name"] = spec.get("NAME") or result["name"]
+            result.update(generate_job(spec, outdir, default_template, bullets))
+    except Exception as e:
+        print(f"  ERROR: {e}")
+        traceback.print_exc()
+        result["status"] = "FAILED"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def _run_job_captured(spec_path, outdir, default_template, bullets):
+    """Worker entry point: run one job with its console output captured,
+    so per-job logs never interleave. Trace events (--profile) go back
+    to the parent with the log."""
+    swms_trace.drain()  # drop events inherited from the parent at fork
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        result = run_job(spec_path, outdir, default_template, bullets)
+    return result, log.getvalue(), swms_trace.drain()
+
+
+def run_batch(spec_paths, outdir, jobs=1, default_template=DEFAULT_TEMPLATE,
+              bullets=False):
+    """Generate every job, serially or across a warm worker pool.
+    Logs are printed per job and results returned in spec order."""
+    os.makedirs(outdir, exist_ok=True)
+    templates = [default_template]
+    for path in spec_paths:
+        try:
+            template = load_spec(path).get("TEMPLATE")
+        except Exception:
+            continue    # reported when the job runs
+        if template and template not in templates:
+            templates.append(template)
+
+    if jobs <= 1 or len(spec_paths) <= 1:
+        _warm_worker(templates)
+        return [run_job(path, outdir, default_template, bullets)
+                for path in spec_paths]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(spec_paths)),
+                             initializer=_warm_worker,
+                             initargs=(templates,)) as pool:
+        futures = [pool.submit(_run_job_captured, path, outdir,
+                               default_template, bullets)
+                   for path in spec_paths]
+        # Collect in submission order — deterministic log and manifest order
+        for future in futures:
+            result, log, events = future.result()
+            swms_trace.merge(events)
+            sys.stdout.write(log)
+            sys.stdout.flush()
+            results.append(result)
+    return results
+
+
+# ============================================================
+# MANIFEST + SUMMARY
+# ============================================================
+
+def write_manifest(results, path, workers, seconds):
+    """Write the batch summary manifest atomically."""
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "workers": workers,
+        "seconds": round(seconds, 3),
+        "jobs": results,
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp, path)
+    return path
+
+
+def print_batch_summary(results, seconds):
+    print(f"\n{'=' * 60}")
+    print("BATCH SUMMARY")
+    print(f"{'=' * 60}")
+    for r in results:
+        print(f"  {r['status']:6s} | {r['tasks']:2d} tasks | {r['seconds']:6.2f}s"
+              f" | {r['name']}")
+        if r["error"]:
+            print(f"           {r['error']}")
+    ok = sum(r["status"] == "OK" for r in results)
+    print(f"  {ok}/{len(results)} jobs OK in {seconds:.2f}s")
+
+
+def cmd_batch(args):
+    swms_trace.enable_from_args(args)
+    swms_log.configure_from_args(args)
+    spec_paths = expand_specs(args.specs)
+    if not spec_paths:
+        print("ERROR: no job specs found.")
+        return 2
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    template = os.path.abspath(args.template)
+    outdir = os.path.abspath(args.out)
+
+    print(f"{'=' * 60}")
+    print(f"  gatekeeper batch — {len(spec_paths)} job(s), "
+          f"{min(jobs, len(spec_paths))} worker(s)")
+    print(f"{'=' * 60}")
+    start = time.perf_counter()
+    results = run_batch(spec_paths, outdir, jobs=jobs,
+                        default_template=template, bullets=args.bullets)
+    seconds = time.perf_counter() - start
+
+    print_batch_summary(results, seconds)
+    manifest = write_manifest(results, args.manifest or
+                              os.path.join(outdir, MANIFEST_NAME),
+                              min(jobs, len(spec_paths)), seconds)
+    print(f"  Manifest → {manifest}")
+    return 0 if all(r["status"] == "OK" for r in results) else 1
+
+
+# ============================================================
+# SERVE
+# ============================================================
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 16 * 1024 * 1024
+DOCX_TYPE = ("application/vnd.openxmlformats-officedocument"
+             ".wordprocessingml.document")
+VARIANTS = ("standard", "ccvs")
+
+
+def _warm_service_worker(templates):
+    """Pool initializer for serve: the batch warm-up plus the master build
+    modules (compiled task catalogue, vocabulary, format_swms matchers)
+    and the master template used by /build."""
+    _warm_worker(templates)
+    from swms_docx_io import load_template
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            import build_all_swms
+            import swms_catalogue
+            swms_catalogue.load_catalogue()
+        except (ImportError, SystemExit, ValueError):
+            return      # /build reports the failure per request
+        if os.path.exists(build_all_swms.TEMPLATE):
+            load_template(build_all_swms.TEMPLATE)
+
+
+def _service_ping():
+    # Hold the worker briefly so each start-up ping lands on its own process
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _service_call(func, *args):
+    """Run func(*args) with console output captured.
+    Returns (result, error, log) — errors are returned, never raised."""
+    log = io.StringIO()
+    result = error = None
+    with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            result = func(*args)
+        except Exception as e:
+            traceback.print_exc()
+            error = (type(e).__name__, str(e))
+    return result, error, log.getvalue()
+
+
+def _read_outputs(outputs):
+    """Return {file name: bytes} for generated output paths."""
+    files = {}
+    for path in outputs:
+        with open(path, "rb") as f:
+            files[os.path.basename(path)] = f.read()
+    return files
+
+
+def _generate_request(spec, outdir, default_template, bullets, variants,
+                      want_bytes):
+    """Worker: /generate. With want_bytes the outputs are generated in a
+    scratch directory and returned as bytes instead of paths."""
+    if not want_bytes:
+        return generate_job(spec, outdir, default_template, bullets, variants)
+    with tempfile.TemporaryDirectory() as tmp:
+        result = generate_job(spec, tmp, default_template, bullets, variants)
+        result["files"] = _read_outputs(result.pop("outputs"))
+    return result
+
+
+def _build_request(name, want_bytes):
+    """Worker: /build — one master SWMS from build_all_swms.BUILDS, matched
+    by name or output filename."""
+    import build_all_swms
+    for build in build_all_swms.BUILDS:
+        if name in (build[0], build[1]):
+            break
+    else:
+        raise ValueError(f"Unknown build: {name!r}")
+    _, filename, count, status = build_all_swms.run_build(*build)
+    if status != "OK":
+        raise RuntimeError(status)
+    path = os.path.join(build_all_swms.OUTDIR, filename)
+    result = {"name": build[0], "tasks": count}
+    if want_bytes:
+        result["files"] = _read_outputs([path])
+    else:
+        result["outputs"] = [path]
+    return result
+
+
+class ServiceMetrics:
+    """Per-endpoint request counts and timings (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.endpoints = {}
+
+    def record(self, endpoint, seconds, status):
+        with self._lock:
+            m = self.endpoints.setdefault(endpoint, {
+                "requests": 0, "errors": 0, "total_seconds": 0.0,
+                "max_seconds": 0.0, "last_seconds": 0.0})
+            m["requests"] += 1
+            m["errors"] += status >= 400
+            m["total_seconds"] += seconds
+            m["max_seconds"] = max(m["max_seconds"], seconds)
+            m["last_seconds"] = seconds
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {}
+            for endpoint, m in sorted(self.endpoints.items()):
+                endpoints[endpoint] = dict(
+                    m, total_seconds=round(m["total_seconds"], 4),
+                    mean_seconds=round(m["total_seconds"] / m["requests"], 4),
+                    max_seconds=round(m["max_seconds"], 4),
+                    last_seconds=round(m["last_seconds"], 4))
+        return {"uptime_seconds": round(time.time() - self.started, 1),
+                "endpoints": endpoints}
+
+
+class GatekeeperServer(ThreadingHTTPServer):
+    """Localhost HTTP front end over a warm generation worker pool."""
+
+    daemon_threads = True
+
+    def __init__(self, address, pool, workers, outdir, template, bullets):
+        super().__init__(address, GatekeeperHandler)
+        self.pool = pool
+        self.workers = workers
+        self.outdir = outdir
+        self.template = template
+        self.bullets = bullets
+        self.metrics = ServiceMetrics()
+
+
+class GatekeeperHandler(BaseHTTPRequestHandler):
+    """GET /health, GET /metrics, POST /generate, POST /build.
+
+    POST bodies are JSON. /generate takes a job spec (batch schema) plus
+    optional "variants" (["standard", "ccvs"]), "bullets" and "return":
+    "path" (default — JSON with output paths) or "bytes" (the .docx
+    itself; exactly one variant). /build takes {"name": ...} for one of
+    build_all_swms.BUILDS and the same "return" option."""
+
+    server_version = "gatekeeper/1"
+
+    def log_message(self, fmt, *args):
+        sys.stderr.write(f"  {self.address_string()} {fmt % args}\n")
+
+    def _send(self, status, body, content_type, headers=()):
+        seconds = time.perf_counter() - self._start
+        self.server.metrics.record(self._endpoint, seconds, status)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Gatekeeper-Seconds", f"{seconds:.4f}")
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status, obj):
+        body = json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+        self._send(status, body + b"\n", "application/json; charset=utf-8")
+
+    ENDPOINTS = ("GET /health", "GET /metrics", "POST /generate", "POST /build")
+
+    def _begin(self):
+        self._start = time.perf_counter()
+        self._endpoint = f"{self.command} {self.path.split('?')[0]}"
+        if self._endpoint not in self.ENDPOINTS:
+            self._endpoint = "other"
+
+    def do_GET(self):
+        self._begin()
+        path = self.path.split("?")[0]
+        if path == "/health":
+            self._json(200, {"status": "ok", "pid": os.getpid(),
+                             "workers": self.server.workers,
+                             "template": self.server.template})
+        elif path == "/metrics":
+            self._json(200, self.server.metrics.snapshot())
+        else:
+            self._json(404, {"error": f"Not found: {path}"})
+
+    def do_POST(self):
+        self._begin()
+        path = self.path.split("?")[0]
+        if path not in ("/generate", "/build"):
+            self._json(404, {"error": f"Not found: {path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if not 0 < length <= MAX_BODY_BYTES:
+                raise ValueError("JSON body required "
+                                 f"(at most {MAX_BODY_BYTES} bytes)")
+            body = json.loads(self.rfile.read(length))
+            if not isinstance(body, dict):
+                raise ValueError("JSON body must be an object")
+            want_bytes = body.get("return", "path") == "bytes"
+            if path == "/generate":
+                call = self._generate_call(body, want_bytes)
+            else:
+                if "name" not in body:
+                    raise ValueError('/build needs {"name": ...}')
+                call = (_build_request, body["name"], want_bytes)
+        except ValueError as e:
+            self._json(400, {"error": str(e)})
+            return
+
+        try:
+            result, error, log = self.server.pool.submit(
+                _service_call, *call).result()
+        except BrokenProcessPool as e:
+            # A worker died (killed, out of memory); the pool refuses
+            # further work until the service is restarted
+            self._json(503, {"error": f"Worker pool unavailable: {e}"})
+            return
+        if error:
+            status = 422 if error[0] in ("ValueError", "SWMSValidationError") else 500
+            self._json(status, {"error": f"{error[0]}: {error[1]}", "log": log})
+        elif want_bytes:
+            (filename, data), = result["files"].items()
+            self._send(200, data, DOCX_TYPE, [
+                ("Content-Disposition", f'attachment; filename="{filename}"')])
+        else:
+            result["log"] = log
+            self._json(200, result)
+
+    def _generate_call(self, body, want_bytes):
+        """Validate a /generate body; return the worker call tuple."""
+        variants = body.get("variants", list(VARIANTS))
+        if isinstance(variants, str):
+            variants = [variants]
+        unknown = [v for v in variants if v not in VARIANTS]
+        if unknown or not variants:
+            raise ValueError(f"variants must be from {list(VARIANTS)}")
+        if want_bytes and len(variants) != 1:
+            raise ValueError('"return": "bytes" needs exactly one variant')
+        # A request TEMPLATE names a file in the configured template's
+        # directory — never an arbitrary path on the server
+        template_dir = os.path.dirname(self.server.template)
+        spec = check_spec({k: v for k, v in body.items()
+                           if k not in ("variants", "bullets", "return")},
+                          "request", template_dir)
+        if spec.get("TEMPLATE") and not _within(spec["TEMPLATE"], template_dir):
+            raise ValueError(f"TEMPLATE must be a file in {template_dir}")
+        for key in ("output_standard", "output_ccvs"):
+            output_path(self.server.outdir, spec["PROJECT"][key])
+        return (_generate_request, spec, self.server.outdir,
+                self.server.template, body.get("bullets", self.server.bullets),
+                tuple(variants), want_bytes)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, jobs=2, outdir=DEFAULT_OUTDIR,
+          template=DEFAULT_TEMPLATE, bullets=False):
+    """Run the generation service until interrupted."""
+    os.makedirs(outdir, exist_ok=True)
+    if host not in ("127.0.0.1", "localhost", "::1"):
+        print(f"WARNING: serving on {host} — the service has no authentication.")
+    with ProcessPoolExecutor(max_workers=jobs,
+                             initializer=_warm_service_worker,
+                             initargs=([template],)) as pool:
+        # Start and warm every worker before accepting requests
+        pids = {f.result() for f in [pool.submit(_service_ping)
+                                     for _ in range(jobs)]}
+        server = GatekeeperServer((host, port), pool, jobs, outdir, template,
+                                  bullets)
+        print(f"  gatekeeper serve — http://{host}:{server.server_port} "
+              f"({len(pids)} warm worker(s)) — Ctrl+C to stop")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+def cmd_serve(args):
+    swms_log.configure_from_args(args)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    serve(args.host, args.port, jobs, os.path.abspath(args.out),
+          os.path.abspath(args.template), args.bullets)
+    return 0
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="gatekeeper", description="RPD SWMS command-line front end.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    batch = sub.add_parser(
+        "batch", help="generate STANDARD + CCVS outputs for many job specs")
+    batch.add_argument("specs", nargs="+",
+                       help="job spec files (.json/.yaml/.py), directories "
+                            "or glob patterns")
+    batch.add_argument("-o", "--out", default=DEFAULT_OUTDIR,
+                       help=f"output directory (default {DEFAULT_OUTDIR})")
+    batch.add_argument("-j", "--jobs", type=int, default=1,
+                       help="generate in N worker processes "
+                            "(0 = one per CPU, default 1 = serial)")
+    batch.add_argument("--template", default=DEFAULT_TEMPLATE,
+                       help="template for specs without TEMPLATE "
+                            f"(default {DEFAULT_TEMPLATE})")
+    batch.add_argument("--bullets", action="store_true",
+                       help="apply the swms_bulletize ▪ bullet transform")
+    batch.add_argument("--manifest",
+                       help=f"summary manifest path (default <out>/{MANIFEST_NAME})")
+    swms_trace.add_cli_arguments(batch)
+    swms_log.add_cli_arguments(batch, default_mode="off")
+    batch.set_defaults(func=cmd_batch)
+
+    srv = sub.add_parser(
+        "serve", help="run the local generation service (HTTP on localhost)")
+    srv.add_argument("--host", default=DEFAULT_HOST,
+                     help=f"bind address (default {DEFAULT_HOST})")
+    srv.add_argument("--port", type=int, default=DEFAULT_PORT,
+                     help=f"port (default {DEFAULT_PORT}, 0 = any free port)")
+    srv.add_argument("-j", "--jobs", type=int, default=2,
+                     help="warm worker processes (0 = one per CPU, default 2)")
+    srv.add_argument("-o", "--out", default=DEFAULT_OUTDIR,
+                     help=f"output directory (default {DEFAULT_OUTDIR})")
+    srv.add_argument("--template", default=DEFAULT_TEMPLATE,
+                     help="template for specs without TEMPLATE "
+                          f"(default {DEFAULT_TEMPLATE})")
+    srv.add_argument("--bullets", action="store_true",
+                     help="default for requests that don't set \"bullets\"")
+    swms_log.add_cli_arguments(srv, default_mode="off")
+    srv.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
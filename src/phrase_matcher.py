@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+RPD SWMS Phrase Matcher
+Shared "find any of N phrases" matcher used by format_swms.py, the
+SWMS_BASE_GENERAL detail-cell writer and swms_ppe_validator.py.
+
+Each matcher compiles its phrases into a single regex alternation once
+(at import time of the caller), so a text node is scanned once no matter
+how many labels the vocabulary grows to.
+
+Phrase order is priority:
+  - finditer() / sub() — leftmost match wins; where several phrases start
+    at the same position, the earliest in the list wins (same as a
+    hand-written alternation).
+  - first_by_priority() — the earliest-listed phrase present anywhere in
+    the text, at its first occurrence (same as looping the list with
+    `if phrase in text: text.find(phrase)`).
+"""
+
+import re
+
+
+def compile_alternation(patterns, flags=0):
+    """Compile regex patterns into one alternation, one capture group per
+    pattern in list order.  Patterns must not contain capture groups."""
+    return re.compile('|'.join(f'({p})' for p in patterns), flags)
+
+
+class PhraseMatcher:
+    """Precompiled matcher for a fixed list of literal phrases."""
+
+    def __init__(self, phrases, ignore_case=False):
+        self.phrases = tuple(phrases)
+        flags = re.IGNORECASE if ignore_case else 0
+        escaped = [re.escape(phrase) for phrase in self.phrases]
+        self._scan = compile_alternation(escaped, flags)
+        # Zero-width probe — reports a match at every start position
+        self._probe = re.compile(
+            '(?=(?:' + '|'.join(f'({e})' for e in escaped) + '))', flags)
+
+    def finditer(self, text):
+        """Yield (start, end, index) for leftmost, non-overlapping matches.
+        index is the position of the matched phrase in self.phrases."""
+        for m in self._scan.finditer(text):
+            yield m.start(), m.end(), m.lastindex - 1
+
+    def search(self, text):
+        """Return (start, end, index) of the leftmost match, or None."""
+        m = self._scan.search(text)
+        if m is None:
+            return None
+        return m.start(), m.end(), m.lastindex - 1
+
+    def first_by_priority(self, text):
+        """Return (index, start) of the earliest-listed phrase present in
+        text and its first occurrence, or None."""
+        best = None
+        for m in self._probe.finditer(text):
+            index = m.lastindex - 1
+            if best is None or index < best[0]:
+                best = (index, m.start())
+                if index == 0:
+                    break
+        return best
+
+    def sub(self, text, replacement):
+        """Replace every match with replacement in one pass.
+        Returns (new_text, indices) — indices of the phrases replaced,
+        sorted in list order."""
+        found = set()
+
+        def _replace(m):
+            found.add(m.lastindex - 1)
+            return replacement
+
+        new_text = self._scan.sub(_replace, text)
+        return new_text, sorted(found)
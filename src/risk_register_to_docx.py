@@ -12,8 +12,9 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_TABLE_ALIGNMENT
 from docx.oxml import parse_xml
 from docx.oxml.ns import nsdecls
-import sys
+import argparse
 
+from src import swms_trace
 from src.docx_style_standard import (
     FONT_NAME, BLACK, RISK_BG, ALT_ROW_BG,
     apply_document_font, risk_level,
@@ -422,6 +423,7 @@ DEFAULT_CONFIG = {
 }
 
 
+@swms_trace.traced("risk_register_docx")
 def build_document(config: dict | None = None) -> Document:
     if config is None:
         config = DEFAULT_CONFIG
@@ -662,10 +664,17 @@ def build_document(config: dict | None = None) -> Document:
 
 
 if __name__ == "__main__":
-    output_path = "output/Risk_Register_18_Danks_St_Waterloo.docx"
-    if len(sys.argv) > 1:
-        output_path = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        description="Build the 18 Danks St Waterloo risk register (Word).")
+    parser.add_argument("output_path", nargs="?",
+                        default="output/Risk_Register_18_Danks_St_Waterloo.docx",
+                        help="output .docx path")
+    swms_trace.add_cli_arguments(parser)
+    args = parser.parse_args()
+    swms_trace.enable_from_args(args)
+    output_path = args.output_path
 
     doc = build_document()
-    doc.save(output_path)
+    with swms_trace.stage("save"):
+        doc.save(output_path)
     print(f"Risk register saved to {output_path}")
@@ -10,7 +10,7 @@ Styling uses the same colour scheme as the docx generator:
   Header row = DBE5F1, font = Arial throughout.
 """
 
-import sys
+import argparse
 
 from openpyxl import Workbook
 from openpyxl.styles import (
@@ -22,6 +22,7 @@ from openpyxl.formatting.rule import FormulaRule
 
 # Import the default config from the docx module (used when run standalone)
 from src.risk_register_to_docx import DEFAULT_CONFIG as _WATERLOO_CONFIG
+from src import swms_trace
 
 # ── Constants (matching docx_style_standard) ──────────────────────
 FONT_NAME = "Arial"
@@ -531,25 +532,35 @@ def build_sheet2_matrix(ws) -> None:
     ws.page_setup.paperSize = ws.PAPERSIZE_A4
 
 
+@swms_trace.traced("risk_register_xlsx")
 def build_workbook(config: dict | None = None) -> Workbook:
     """Build the complete two-sheet workbook."""
     if config is None:
         config = _WATERLOO_CONFIG
     wb = Workbook()
     ws1 = wb.active
-    build_sheet1_risk_register(ws1, config)
+    with swms_trace.stage("sheet1_risk_register"):
+        build_sheet1_risk_register(ws1, config)
 
     ws2 = wb.create_sheet()
-    build_sheet2_matrix(ws2)
+    with swms_trace.stage("sheet2_matrix"):
+        build_sheet2_matrix(ws2)
 
     return wb
 
 
 if __name__ == "__main__":
-    output_path = "output/Risk_Register_18_Danks_St_Waterloo.xlsx"
-    if len(sys.argv) > 1:
-        output_path = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        description="Build the 18 Danks St Waterloo risk register (Excel).")
+    parser.add_argument("output_path", nargs="?",
+                        default="output/Risk_Register_18_Danks_St_Waterloo.xlsx",
+                        help="output .xlsx path")
+    swms_trace.add_cli_arguments(parser)
+    args = parser.parse_args()
+    swms_trace.enable_from_args(args)
+    output_path = args.output_path
 
     wb = build_workbook()
-    wb.save(output_path)
+    with swms_trace.stage("save"):
+        wb.save(output_path)
     print(f"Risk register (Excel) saved to {output_path}")
@@ -13,7 +13,7 @@ import sys
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from SWMS_BASE_GENERAL import generate_swms
+from SWMS_BASE_GENERAL import generate_swms_variants
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -469,8 +469,7 @@ if __name__ == "__main__":
     print(f"  {PROJECT['title_prefix']}")
     print("=" * 60)
 
-    generate_swms(TEMPLATE, OUT_STD,  TASKS, use_ccvs=False, **kwargs)
-    generate_swms(TEMPLATE, OUT_CCVS, TASKS, use_ccvs=True,  **kwargs)
+    generate_swms_variants(TEMPLATE, OUT_STD, OUT_CCVS, TASKS, **kwargs)
 
     print("\n" + "=" * 60)
     print("  Complete.")
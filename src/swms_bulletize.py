@@ -8,21 +8,44 @@ Bullet: ▪ U+25AA — Technical/engineering — Calibri 9pt — indent left=360
 
 Usage:
     python swms_bulletize.py input.docx output.docx
+    python swms_bulletize.py input.docx output.docx --on-disk
+    python swms_bulletize.py input.docx output.docx --profile trace.json
 
 The script:
-1. Unpacks the docx (zip archive)
+1. Reads the docx (zip archive)
 2. Adds/updates abstractNum (id=99) + num (id=99) with ▪ bullet definition
 3. Rewrites col 3 of each data row in tables[2] as bullet paragraphs
-4. Repacks into a valid .docx
+4. Writes a valid .docx
+
+By default this happens in memory: only numbering.xml and document.xml
+are parsed and rewritten, every other member's compressed bytes are
+copied through unchanged, and the output is written in one pass.
+--on-disk (run(..., in_memory=False)) uses the original unpack to a temp
+directory → rewrite → repack flow.
+
+In-process:
+    bulletize_document(doc) applies the same transform to an open
+    python-docx Document — generate_swms(..., bullets=True) uses it to
+    skip the save → reopen → save round trip.
 """
 
 import sys
 import os
+import io
+import struct
 import zipfile
+import zlib
 import shutil
 import tempfile
 from lxml import etree
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import swms_trace
+from swms_log import INFO, event, get_logger
+from swms_trace import stage, traced
+
+_log = get_logger("bulletize")
+
 W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
 
 def w(tag): return f'{{{W}}}{tag}'
@@ -150,11 +173,12 @@ def pack_docx(work_dir, output_path, original_path):
     print(f'  Packed {os.path.basename(output_path)}')
 
 
-def update_numbering(num_path):
-    """Add/replace abstractNum 99 and num 99 in numbering.xml."""
-    tree = etree.parse(num_path)
-    root = tree.getroot()
+# ============================================================
+# TRANSFORMS — operate on parsed XML roots
+# ============================================================
 
+def _update_numbering_root(root):
+    """Add/replace abstractNum 99 and num 99 in a w:numbering root."""
     # Remove existing id=99 if present (idempotent)
     for an in root.findall(w('abstractNum')):
         if an.get(w('abstractNumId')) == ABSTRACT_NUM_ID:
@@ -172,14 +196,11 @@ def update_numbering(num_path):
         root.append(etree.fromstring(ABSTRACT_XML))
 
     root.append(etree.fromstring(NUM_XML))
-    tree.write(num_path, xml_declaration=True, encoding='utf-8', pretty_print=True)
-    print('  numbering.xml updated — abstractNum/num id=99')
 
 
-def bulletize_consolidated(doc_path):
-    """Rewrite col 3 of each data row in tables[2] as bullet paragraphs."""
-    tree = etree.parse(doc_path)
-    root = tree.getroot()
+def _bulletize_root(root):
+    """Rewrite col 3 of each data row in tables[2] of a w:document root
+    as bullet paragraphs. Returns the number of rows rewritten."""
     tables = root.findall('.//w:tbl', ns)
 
     if len(tables) < 3:
@@ -225,20 +246,272 @@ def bulletize_consolidated(doc_path):
                 cell.append(para)
 
         replaced += 1
-        preview = repr(full_text[:55])
-        print(f'  Row {i:>2}: {len(bullets):>2} bullets — {preview}...')
+        event(_log, INFO, 'bullet_row',
+              '  Row {row:>2}: {bullets:>2} bullets — {preview!r}...',
+              row=i, bullets=len(bullets), preview=full_text[:55])
+
+    return replaced
+
+
+def _minimal_numbering_xml():
+    """numbering.xml content for documents that have none."""
+    return (f'<?xml version="1.0" encoding="utf-8"?>\n'
+            f'<w:numbering xmlns:w="{W}">\n'
+            f'{ABSTRACT_XML}\n'
+            f'{NUM_XML}\n'
+            f'</w:numbering>')
+
+
+def _add_numbering_rel(rels):
+    """Return document.xml.rels text with a numbering relationship."""
+    if 'numbering' in rels:
+        return rels
+    return rels.replace('</Relationships>',
+        '<Relationship Id="rId99" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" '
+        'Target="numbering.xml"/>\n</Relationships>')
+
+
+def _serialise(root):
+    """Serialise a part root the way tree.write() does on disk."""
+    return etree.tostring(root.getroottree(), xml_declaration=True,
+                          encoding='UTF-8', pretty_print=True)
+
+
+# ============================================================
+# ON-DISK PARTS
+# ============================================================
+
+def update_numbering(num_path):
+    """Add/replace abstractNum 99 and num 99 in numbering.xml."""
+    tree = etree.parse(num_path)
+    _update_numbering_root(tree.getroot())
+    tree.write(num_path, xml_declaration=True, encoding='utf-8', pretty_print=True)
+    print('  numbering.xml updated — abstractNum/num id=99')
+
 
+def bulletize_consolidated(doc_path):
+    """Rewrite col 3 of each data row in tables[2] as bullet paragraphs."""
+    tree = etree.parse(doc_path)
+    replaced = _bulletize_root(tree.getroot())
     tree.write(doc_path, xml_declaration=True, encoding='utf-8', pretty_print=True)
     return replaced
 
 
-def run(input_path, output_path):
+# ============================================================
+# IN-PROCESS — open python-docx Document
+# ============================================================
+
+@traced('bulletize')
+def bulletize_document(doc):
+    """Bulletize an open python-docx Document in place.
+    Creates the numbering part if the document has none.
+    Returns the number of consolidated rows rewritten."""
+    _update_numbering_root(doc.part.numbering_part.element)
+    print('  numbering.xml updated — abstractNum/num id=99')
+    return _bulletize_root(doc.element)
+
+
+# ============================================================
+# IN-MEMORY ZIP REWRITE
+# ============================================================
+
+NUMBERING_PART = 'word/numbering.xml'
+DOCUMENT_PART = 'word/document.xml'
+DOCUMENT_RELS = 'word/_rels/document.xml.rels'
+
+_UTF8_FLAG = 0x800     # general purpose bit 11 — UTF-8 file name
+_ZIP32_LIMIT = 0xFFFFFFFF
+
+
+def _raw_copyable(zf):
+    """True if every member can be copied as stored bytes without zip64,
+    encryption or an unsupported compression method."""
+    infos = zf.infolist()
+    if len(infos) >= 0xFFFF:
+        return False
+    for info in infos:
+        if info.flag_bits & 0x1:
+            return False
+        if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            return False
+        if max(info.compress_size, info.file_size, info.header_offset) >= _ZIP32_LIMIT:
+            return False
+    return True
+
+
+def _read_raw(fp, info):
+    """Return a member's compressed bytes exactly as stored."""
+    fp.seek(info.header_offset)
+    header = fp.read(zipfile.sizeFileHeader)
+    if header[:4] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f'Bad local header: {info.filename}')
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+    fp.seek(info.header_offset + zipfile.sizeFileHeader + name_len + extra_len)
+    return fp.read(info.compress_size)
+
+
+def _deflate(data):
+    """Raw-deflate data the way zipfile.ZIP_DEFLATED does."""
+    co = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return co.compress(data) + co.flush()
+
+
+class _ZipStreamWriter:
+    """Minimal zip writer that accepts already-compressed member data.
+    Only what a .docx needs: stored/deflated, no zip64, no extras."""
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.central = []
+
+    def add(self, info, payload, crc, file_size, compress_type):
+        """Write one member. payload is the stored (compressed) bytes."""
+        name = info.filename.encode('utf-8')
+        flags = 0 if info.filename.isascii() else _UTF8_FLAG
+        dos_time = (info.date_time[3] << 11 | info.date_time[4] << 5
+                    | info.date_time[5] // 2)
+        dos_date = ((info.date_time[0] - 1980) << 9 | info.date_time[1] << 5
+                    | info.date_time[2])
+        version = 20 if compress_type == zipfile.ZIP_DEFLATED else 10
+
+        offset = self.fp.tell()
+        self.fp.write(struct.pack(
+            zipfile.structFileHeader, zipfile.stringFileHeader,
+            version, 0, flags, compress_type, dos_time, dos_date,
+            crc, len(payload), file_size, len(name), 0))
+        self.fp.write(name)
+        self.fp.write(payload)
+
+        self.central.append(struct.pack(
+            zipfile.structCentralDir, zipfile.stringCentralDir,
+            20, info.create_system, version, 0, flags, compress_type,
+            dos_time, dos_date, crc, len(payload), file_size,
+            len(name), 0, 0, 0, 0, info.external_attr, offset) + name)
+
+    def add_bytes(self, info, data):
+        """Compress and write one member from its uncompressed bytes."""
+        compress_type = info.compress_type
+        if compress_type == zipfile.ZIP_DEFLATED:
+            payload = _deflate(data)
+        else:
+            compress_type, payload = zipfile.ZIP_STORED, data
+        self.add(info, payload, zlib.crc32(data), len(data), compress_type)
+
+    def close(self):
+        """Write the central directory and end-of-archive record."""
+        start = self.fp.tell()
+        for entry in self.central:
+            self.fp.write(entry)
+        size = self.fp.tell() - start
+        self.fp.write(struct.pack(
+            zipfile.structEndArchive, zipfile.stringEndArchive,
+            0, 0, len(self.central), len(self.central), size, start, 0))
+
+
+def _new_member(name, compress_type=zipfile.ZIP_DEFLATED):
+    """ZipInfo for a member that does not exist in the source."""
+    info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = compress_type
+    info.external_attr = 0o600 << 16
+    return info
+
+
+def _rewrite_zip(data, parts):
+    """Return a copy of the zip archive data with the members in parts
+    ({name: new bytes}) replaced or appended. Unchanged members are
+    copied as stored bytes; falls back to zipfile if the archive needs
+    features the raw writer does not handle."""
+    out = io.BytesIO()
+    src_fp = io.BytesIO(data)
+    with zipfile.ZipFile(src_fp, 'r') as src:
+        infos = src.infolist()
+        names = {info.filename for info in infos}
+        new = [_new_member(name) for name in parts if name not in names]
+
+        if not _raw_copyable(src):
+            with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as dst:
+                for info in infos + new:
+                    content = parts.get(info.filename)
+                    dst.writestr(info, content if content is not None
+                                 else src.read(info))
+            return out.getvalue()
+
+        writer = _ZipStreamWriter(out)
+        for info in infos:
+            if info.filename in parts:
+                writer.add_bytes(info, parts[info.filename])
+            else:
+                writer.add(info, _read_raw(src_fp, info), info.CRC,
+                           info.file_size, info.compress_type)
+        for info in new:
+            writer.add_bytes(info, parts[info.filename])
+        writer.close()
+    return out.getvalue()
+
+
+@traced('bulletize')
+def bulletize_bytes(data):
+    """Bulletize a .docx held in memory.
+    Returns (output bytes, number of consolidated rows rewritten)."""
+    parts = {}
+    with zipfile.ZipFile(io.BytesIO(data), 'r') as zf:
+        names = set(zf.namelist())
+
+        if NUMBERING_PART in names:
+            root = etree.fromstring(zf.read(NUMBERING_PART))
+            _update_numbering_root(root)
+            parts[NUMBERING_PART] = _serialise(root)
+            print('  numbering.xml updated — abstractNum/num id=99')
+        else:
+            print('  WARNING: numbering.xml not found — creating minimal one')
+            parts[NUMBERING_PART] = _minimal_numbering_xml().encode('utf-8')
+            if DOCUMENT_RELS in names:
+                rels = zf.read(DOCUMENT_RELS).decode('utf-8')
+                new_rels = _add_numbering_rel(rels)
+                if new_rels != rels:
+                    parts[DOCUMENT_RELS] = new_rels.encode('utf-8')
+
+        root = etree.fromstring(zf.read(DOCUMENT_PART))
+        replaced = _bulletize_root(root)
+        parts[DOCUMENT_PART] = _serialise(root)
+
+    return _rewrite_zip(data, parts), replaced
+
+
+# ============================================================
+# RUNNER
+# ============================================================
+
+def _run_in_memory(input_path, output_path):
+    """Bulletize input_path to output_path without a temp directory."""
+    with stage('read'), open(input_path, 'rb') as f:
+        data = f.read()
+    print(f'  Read {os.path.basename(input_path)}')
+
+    out, replaced = bulletize_bytes(data)
+    print(f'\n  Consolidated table: {replaced} rows bulletized')
+
+    with stage('write'), open(output_path, 'wb') as f:
+        f.write(out)
+    print(f'  Wrote {os.path.basename(output_path)}')
+
+
+@traced('bulletize_run')
+def run(input_path, output_path, in_memory=True):
     print(f'\n{"="*60}')
     print(f'  SWMS Bulletizer')
     print(f'  Input:  {os.path.basename(input_path)}')
     print(f'  Output: {os.path.basename(output_path)}')
     print(f'{"="*60}\n')
 
+    if in_memory:
+        _run_in_memory(input_path, output_path)
+        print(f'\n{"="*60}')
+        print(f'  Complete -> {output_path}')
+        print(f'{"="*60}\n')
+        return
+
     work_dir = tempfile.mkdtemp(prefix='swms_bullet_')
     try:
         # Unpack
@@ -252,23 +525,15 @@ def run(input_path, output_path):
             print('  WARNING: numbering.xml not found — creating minimal one')
             os.makedirs(os.path.dirname(num_path), exist_ok=True)
             with open(num_path, 'w', encoding='utf-8') as f:
-                f.write(f'<?xml version="1.0" encoding="utf-8"?>\n'
-                        f'<w:numbering xmlns:w="{W}">\n'
-                        f'{ABSTRACT_XML}\n'
-                        f'{NUM_XML}\n'
-                        f'</w:numbering>')
+                f.write(_minimal_numbering_xml())
             # Add relationship if missing
             rels_path = os.path.join(work_dir, 'word', '_rels', 'document.xml.rels')
             if os.path.exists(rels_path):
                 with open(rels_path, encoding='utf-8') as f:
                     rels = f.read()
                 if 'numbering' not in rels:
-                    rels = rels.replace('</Relationships>',
-                        '<Relationship Id="rId99" '
-                        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" '
-                        'Target="numbering.xml"/>\n</Relationships>')
                     with open(rels_path, 'w', encoding='utf-8') as f:
-                        f.write(rels)
+                        f.write(_add_numbering_rel(rels))
 
         # Bulletize document
         doc_path = os.path.join(work_dir, 'word', 'document.xml')
@@ -286,7 +551,12 @@ def run(input_path, output_path):
 
 
 if __name__ == '__main__':
-    if len(sys.argv) != 3:
-        print('Usage: python swms_bulletize.py input.docx output.docx')
+    args = [a for a in sys.argv[1:] if a != '--on-disk']
+    if '--profile' in args:
+        i = args.index('--profile')
+        swms_trace.enable(args[i + 1] if i + 1 < len(args) else 'bulletize_trace.json')
+        del args[i:i + 2]
+    if len(args) != 2:
+        print('Usage: python swms_bulletize.py input.docx output.docx [--on-disk] [--profile trace.json]')
         sys.exit(1)
-    run(sys.argv[1], sys.argv[2])
+    run(args[0], args[1], in_memory='--on-disk' not in sys.argv[1:])
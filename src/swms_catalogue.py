@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+RPD SWMS Task Catalogue
+The swms_generator.py *_NEW task dicts, resolved once and frozen to JSON.
+
+Importing swms_generator.py runs new_task() for every vocabulary-based
+entry — get_* lookups that raise on a missing key, build_engineering /
+build_admin raw-string warnings — and logs the task counts. Compiling the
+catalogue does that once; later runs load the resolved dicts from
+__pycache__/swms_catalogue.json without importing the task module.
+
+The catalogue is keyed on the SHA-256 of swms_generator.py, swms_rows.py
+(new_task), swms_vocabulary.py and this module. A missing or stale
+catalogue is recompiled on first use, so vocabulary errors surface in the
+compile step rather than on every run. Unwritable cache directories are
+ignored (the compiled dicts are still used for the run).
+
+Loaded tasks are frozen: every dict is a read-only MappingProxyType and
+every list a tuple, so one build cannot change the tasks another sees.
+
+Usage:
+    python src/swms_catalogue.py           — compile and print task counts
+    python src/swms_catalogue.py --check   — exit 1 if missing or stale
+
+    from swms_catalogue import task_dict
+    REMEDIAL_NEW = task_dict('REMEDIAL_NEW')   # loads on first access
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, _script_dir)
+
+import swms_log
+from swms_log import INFO, event, get_logger
+
+CATALOGUE_PATH = os.path.join(_script_dir, '__pycache__', 'swms_catalogue.json')
+CATALOGUE_VERSION = 1
+
+# Source modules whose content changes the resolved task dicts
+SOURCES = ('swms_generator.py', 'swms_rows.py', 'swms_vocabulary.py', 'swms_catalogue.py')
+
+_log = get_logger("catalogue")
+_CATALOGUE = None
+
+
+# ============================================================
+# COMPILE
+# ============================================================
+
+def source_hash():
+    """SHA-256 over the catalogue's source modules."""
+    h = hashlib.sha256()
+    for filename in SOURCES:
+        h.update(filename.encode('utf-8'))
+        with open(os.path.join(_script_dir, filename), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def compile_catalogue(path=None, quiet=True):
+    """Import swms_generator.py, collect every *_NEW dict and write the
+    catalogue. Returns {dict name: {task key: task dict}}. quiet hides the
+    generator's import-time output (task counts, raw-string warnings)."""
+    path = path or CATALOGUE_PATH
+    key = source_hash()
+    out = io.StringIO() if quiet else sys.stdout
+    with contextlib.redirect_stdout(out):
+        import swms_generator
+    tasks = {name: value for name, value in vars(swms_generator).items()
+             if name.endswith('_NEW') and isinstance(value, dict)}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': CATALOGUE_VERSION, 'key': key, 'tasks': tasks},
+                      f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    event(_log, INFO, "catalogue_compiled",
+          "  Task catalogue compiled: {count} tasks in {sets} sets",
+          count=sum(len(t) for t in tasks.values()), sets=len(tasks))
+    return _freeze(json.loads(json.dumps(tasks)))
+
+
+def _freeze(value):
+    """Read-only copy of decoded JSON: dicts become MappingProxyType and
+    lists tuples (which also restores the (label, text) sections of STD
+    'control' lists)."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _read(path):
+    """(key, tasks) from a catalogue file, or (None, None)."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == CATALOGUE_VERSION:
+            return data['key'], data['tasks']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return None, None
+
+
+def check_catalogue(path=None):
+    """'ok', 'stale' or 'missing' for the catalogue at path."""
+    key, _ = _read(path or CATALOGUE_PATH)
+    if key is None:
+        return 'missing'
+    return 'ok' if key == source_hash() else 'stale'
+
+
+# ============================================================
+# LOAD
+# ============================================================
+
+def load_catalogue():
+    """The process-wide catalogue — loaded, or compiled if missing or stale."""
+    global _CATALOGUE
+    if _CATALOGUE is None:
+        key, tasks = _read(CATALOGUE_PATH)
+        if key is not None and key == source_hash():
+            _CATALOGUE = _freeze(tasks)
+        else:
+            _CATALOGUE = compile_catalogue()
+    return _CATALOGUE
+
+
+class TaskDict(Mapping):
+    """Read-only view of one *_NEW dict, loaded from the catalogue on first
+    access. Task dicts are frozen (MappingProxyType, tuples for lists).
+    Pickles as its name, so pool workers load their own copy."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def _tasks(self):
+        return load_catalogue()[self.name]
+
+    def __getitem__(self, key):
+        return self._tasks()[key]
+
+    def __iter__(self):
+        return iter(self._tasks())
+
+    def __len__(self):
+        return len(self._tasks())
+
+    def __repr__(self):
+        return f"TaskDict({self.name!r})"
+
+
+def task_dict(name):
+    """Lazy catalogue view of swms_generator.<name>."""
+    return TaskDict(name)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compile the swms_generator task catalogue.")
+    parser.add_argument('--check', action='store_true',
+                        help="exit 1 if the catalogue is missing or stale")
+    swms_log.add_cli_arguments(parser)
+    args = parser.parse_args(argv)
+    swms_log.configure_from_args(args)
+
+    if args.check:
+        status = check_catalogue()
+        print(f"Task catalogue: {status} ({CATALOGUE_PATH})")
+        return 0 if status == 'ok' else 1
+
+    tasks = compile_catalogue(quiet=False)
+    for name, task_set in tasks.items():
+        print(f"  {name:<14s} {len(task_set):3d} tasks")
+    print(f"Written to {CATALOGUE_PATH}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+RPD SWMS .docx I/O helpers
+Shared by build_all_swms.py and the SWMS_BASE_GENERAL engine.
+
+Template cache:
+  Every build used to call Document(path), unzipping and re-parsing the
+  whole template. load_template() reads and parses each template once
+  per process and hands every caller an independent deep copy of the
+  parsed package (lxml trees and part graph). The cache entry is
+  revalidated on file mtime/size and, if those change, on content hash.
+
+Reproducible save:
+  python-docx stamps every zip member with the current time, so two
+  builds of identical content never produce identical files.
+  save_docx() writes the package with a fixed member timestamp
+  (SOURCE_DATE_EPOCH if set, else 1980-01-01) so serial, parallel and
+  repeated builds are byte-identical.
+"""
+
+import copy
+import hashlib
+import io
+import os
+import time
+import zipfile
+from docx import Document
+
+# ============================================================
+# TEMPLATE CACHE
+# ============================================================
+
+class _CachedTemplate:
+    """Parsed template plus the file state it was parsed from."""
+
+    def __init__(self, mtime_ns, size, sha256, doc):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.sha256 = sha256
+        self.doc = doc
+
+
+_TEMPLATE_CACHE = {}
+
+
+def clone_document(doc):
+    """Return an independent copy of a python-docx Document.
+    Deep-copies the package part graph, so edits to the copy never
+    reach the original. Safe on a document that has already been edited."""
+    # Copy the main part (and through it the whole package) rather than
+    # the Document proxy: the proxy caches its _Body on first use, and a
+    # deep copy of that cache is a body element detached from the copied
+    # tree. DocumentPart.document builds a fresh proxy over the copy.
+    return copy.deepcopy(doc.part).document
+
+
+def _cached_template(path):
+    """Return the cache entry for path, parsing the template if the
+    file is new or its content has changed."""
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    entry = _TEMPLATE_CACHE.get(key)
+    if (entry is not None and entry.mtime_ns == st.st_mtime_ns
+            and entry.size == st.st_size):
+        return entry
+
+    with open(key, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if entry is not None and entry.sha256 == digest:
+        # Touched but unchanged — keep the parsed package
+        entry.mtime_ns, entry.size = st.st_mtime_ns, st.st_size
+        return entry
+
+    entry = _CachedTemplate(st.st_mtime_ns, st.st_size, digest,
+                            Document(io.BytesIO(data)))
+    _TEMPLATE_CACHE[key] = entry
+    return entry
+
+
+def load_template(path):
+    """Return a fresh Document for the template at path.
+    Drop-in replacement for Document(path) — the template is parsed once
+    per process and each call returns an independent clone."""
+    return clone_document(_cached_template(path).doc)
+
+
+def template_hash(path):
+    """Return the SHA-256 hex digest of the template at path."""
+    return _cached_template(path).sha256
+
+
+def clear_template_cache():
+    """Drop all cached templates."""
+    _TEMPLATE_CACHE.clear()
+
+
+# ============================================================
+# REPRODUCIBLE SAVE
+# ============================================================
+
+# Earliest timestamp the zip format can represent
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+def _member_date_time():
+    """Return the fixed zip member timestamp for reproducible saves."""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        stamp = time.gmtime(int(epoch))[:6]
+        if stamp >= _ZIP_EPOCH:
+            return stamp
+    return _ZIP_EPOCH
+
+
+def docx_bytes(doc):
+    """Serialise a python-docx Document to reproducible .docx bytes."""
+    raw = io.BytesIO()
+    doc.save(raw)
+    raw.seek(0)
+
+    date_time = _member_date_time()
+    out = io.BytesIO()
+    with zipfile.ZipFile(raw, 'r') as src, \
+            zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            member = zipfile.ZipInfo(info.filename, date_time=date_time)
+            member.compress_type = info.compress_type
+            member.external_attr = info.external_attr
+            dst.writestr(member, src.read(info))
+    return out.getvalue()
+
+
+def save_docx(doc, path):
+    """Save a python-docx Document to path with fixed member timestamps."""
+    data = docx_bytes(doc)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
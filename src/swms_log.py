@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+RPD SWMS event log
+Structured, level-controlled replacement for the progress print()s in the
+engine hot loops (HRCW ticks, build_swms rows, P2 auto-fixes, bullet rows,
+raw-string vocabulary warnings, generator task counts).
+
+Each event has a name, a level and fields (row, key, counts ...). The
+console line is a str.format template over the fields, formatted only
+when the event is enabled — a disabled event costs one level check.
+
+Usage in the engines:
+    log = get_logger("build")
+    event(log, INFO, "task_row", "  Task {index}: Reused row {key}",
+          index=idx + 1, key=key)
+
+Modes:
+    text  — the console line, exactly as the old print() wrote it (default)
+    json  — one JSON object per line: ts, level, logger, event, msg, fields
+    off   — nothing written
+
+Output goes to whatever sys.stdout is at emit time, so
+contextlib.redirect_stdout captures events exactly like print().
+
+Enabling:
+    GATEKEEPER_LOG=text|json|off   GATEKEEPER_LOG_LEVEL=debug|info|warning|error
+  or --log / --log-level on build_all_swms.py and gatekeeper.py. gatekeeper
+  batch and serve default to off — their summaries come from results, not
+  from engine chatter.
+
+collect() gathers events as dicts regardless of mode, for summaries
+computed from the event stream instead of scraped stdout.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import sys
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+MODES = ("text", "json", "off")
+LEVELS = ("debug", "info", "warning", "error")
+ROOT_LOGGER = "swms"
+
+_OFF = logging.CRITICAL + 1
+
+
+def get_logger(name):
+    """Return the swms.<name> logger."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def event(logger, level, name, message, /, exc_info=None, **fields):
+    """Log one event. message is a str.format template over fields.
+    exc_info=True attaches the exception being handled (its traceback
+    follows the text line; json and collect() carry it as "exc")."""
+    if logger.isEnabledFor(level):
+        logger.log(level, message.format(**fields) if fields else message,
+                   exc_info=exc_info, extra={"event": name, "fields": fields})
+
+
+# ============================================================
+# HANDLERS
+# ============================================================
+
+class _StdoutHandler(logging.Handler):
+    """Writes each record to sys.stdout as resolved at emit time."""
+
+    def emit(self, record):
+        try:
+            sys.stdout.write(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+class _TextFormatter(logging.Formatter):
+    def format(self, record):
+        if record.exc_info:
+            return record.getMessage() + "\n" + self.formatException(record.exc_info)
+        return record.getMessage()
+
+
+def _record_dict(record):
+    data = {
+        "ts": round(record.created, 6),
+        "level": record.levelname.lower(),
+        "logger": record.name,
+        "event": getattr(record, "event", None),
+        "msg": record.getMessage(),
+    }
+    data.update(getattr(record, "fields", {}))
+    if record.exc_info:
+        data["exc"] = logging.Formatter().formatException(record.exc_info)
+    return data
+
+
+class _JSONFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(_record_dict(record), ensure_ascii=False, default=str)
+
+
+class _Collector(logging.Handler):
+    def __init__(self, level):
+        super().__init__(level)
+        self.events = []
+
+    def emit(self, record):
+        self.events.append(_record_dict(record))
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+_mode = "text"
+
+
+def _level(level):
+    if isinstance(level, int):
+        return level
+    if level.lower() not in LEVELS:
+        raise ValueError(f"Unknown log level: {level!r} (use {', '.join(LEVELS)})")
+    return getattr(logging, level.upper())
+
+
+def configure(mode="text", level="info"):
+    """Set the output mode and minimum level for every swms logger."""
+    global _mode
+    if mode not in MODES:
+        raise ValueError(f"Unknown log mode: {mode!r} (use {', '.join(MODES)})")
+    root = logging.getLogger(ROOT_LOGGER)
+    root.propagate = False
+    for handler in [h for h in root.handlers if isinstance(h, _StdoutHandler)]:
+        root.removeHandler(handler)
+    _mode = mode
+    if mode == "off":
+        root.setLevel(_OFF)
+        return
+    handler = _StdoutHandler(_level(level))
+    handler.setFormatter(_JSONFormatter() if mode == "json" else _TextFormatter())
+    root.addHandler(handler)
+    root.setLevel(_level(level))
+
+
+def mode():
+    """Return the current output mode."""
+    return _mode
+
+
+def configure_from_env(default_mode="text"):
+    """Configure from GATEKEEPER_LOG / GATEKEEPER_LOG_LEVEL. Called at import."""
+    configure(os.environ.get("GATEKEEPER_LOG", default_mode),
+              os.environ.get("GATEKEEPER_LOG_LEVEL", "info"))
+
+
+def add_cli_arguments(parser, default_mode="text"):
+    """Add --log / --log-level to an argparse parser. The defaults defer
+    to GATEKEEPER_LOG / GATEKEEPER_LOG_LEVEL when those are set."""
+    parser.add_argument("--log", choices=MODES,
+                        default=os.environ.get("GATEKEEPER_LOG", default_mode),
+                        help=f"engine event log: text, json lines or off "
+                             f"(default {default_mode})")
+    parser.add_argument("--log-level", choices=LEVELS,
+                        default=os.environ.get("GATEKEEPER_LOG_LEVEL", "info"),
+                        help="minimum event level (default info)")
+
+
+def configure_from_args(args):
+    """Configure from parsed add_cli_arguments() options."""
+    configure(args.log, args.log_level)
+
+
+@contextlib.contextmanager
+def collect(level=INFO):
+    """Collect events at level and above as dicts, whatever the mode.
+    Yields the list the events are appended to."""
+    root = logging.getLogger(ROOT_LOGGER)
+    collector = _Collector(level)
+    previous = root.level
+    root.addHandler(collector)
+    root.setLevel(min(previous, level))
+    try:
+        yield collector.events
+    finally:
+        root.removeHandler(collector)
+        root.setLevel(previous)
+
+
+configure_from_env()
@@ -13,18 +13,50 @@ USAGE:
     python3 swms_ppe_validator.py SWMS_CrackRepair_Standard_Bullets.docx
     python3 swms_ppe_validator.py SWMS_CrackRepair_CCVS_Bullets.docx
 
+BATCH (directories, globs or several files — validated in a process pool):
+    python3 swms_ppe_validator.py outputs/ -j 0
+    python3 swms_ppe_validator.py "issued/*_Bullets.docx" --json report.json --junit report.xml
+
 EXIT CODES:
     0 — PASS (no violations)
     1 — FAIL (violations found — do not issue document)
+    2 — ERROR (batch only — a file could not be opened, or no files matched)
+    Batch runs exit with the highest code over all files.
+
+LIBRARY:
+    check_ppe(path) returns a result dict (status, violations, warnings,
+    error) instead of printing and exiting. validate_many(paths, jobs)
+    returns one result per path, in order.
+
+ENGINES:
+    stream (default) — streams word/document.xml out of the zip with
+        lxml iterparse, reading cells the way python-docx does (gridSpan
+        cells repeated, vMerge continuation cells read from the cell
+        above) and clearing rows as it goes. Flat memory, no object model.
+    docx — loads the document with python-docx and walks
+        doc.tables[i].rows[r].cells[c].text. --engine docx on the CLI.
+    Both report identical violations.
 
 TO UPDATE THE PPE STANDARD:
     Edit the three sections below marked EDITABLE.
     Do not change the validator logic itself.
 """
 
+import argparse
+import glob
+import json
+import os
 import sys
 import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from docx import Document
+from lxml import etree
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from phrase_matcher import compile_alternation
+import swms_trace
 
 # ── EDITABLE: Forbidden exact terms ──────────────────────────────────────────
 # Any of these found as whole words = violation
@@ -58,10 +90,15 @@ TABLE_NAMES = {2: "Consolidated Summary", 3: "Detail Risk Assessment"}
 
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Compiled once — one pre-filter scan per cell covers every forbidden term
+_FORBIDDEN_PATTERNS = [re.compile(p, re.IGNORECASE) for p in PPE_FORBIDDEN_EXACT]
+_FORBIDDEN_ANY = compile_alternation(PPE_FORBIDDEN_EXACT, re.IGNORECASE)
+_GLOVES = re.compile(r'\bgloves\b', re.IGNORECASE)
+
 
 def _check_bare_gloves(text):
     """Return True if 'gloves' appears without a legitimate descriptor preceding it."""
-    for match in re.finditer(r'\bgloves\b', text, re.IGNORECASE):
+    for match in _GLOVES.finditer(text):
         start = match.start()
         preceding = text[max(0, start - 40):start].lower().rstrip()
         has_descriptor = any(preceding.endswith(d) for d in PPE_DESCRIPTORED_GLOVES)
@@ -70,23 +107,49 @@ def _check_bare_gloves(text):
     return False
 
 
-def validate(docx_path):
-    print("═" * 60)
-    print(f"  PPE VALIDATOR v1.0")
-    print(f"  File: {docx_path}")
-    print("═" * 60)
+def check_cell(text, tbl_name, row_idx, col_idx):
+    """Return the PPE violations in one cell's text."""
+    violations = []
+    if not text.strip():
+        return violations
 
-    try:
-        doc = Document(docx_path)
-    except Exception as e:
-        print(f"\n  ERROR: Could not open document — {e}")
-        sys.exit(1)
+    # Check forbidden exact terms — one combined scan rules out clean cells
+    if _FORBIDDEN_ANY.search(text):
+        for pattern in _FORBIDDEN_PATTERNS:
+            found = pattern.search(text)
+            if not found:
+                continue
+            term = found.group(0)
+            violations.append({
+                "table": tbl_name,
+                "row": row_idx,
+                "col": col_idx,
+                "violation": f'Forbidden term: "{term}"',
+                "snippet": text[max(0, text.lower().find(term.lower())-20):
+                               text.lower().find(term.lower())+40].strip()
+            })
+
+    # Check bare gloves
+    if _check_bare_gloves(text):
+        violations.append({
+            "table": tbl_name,
+            "row": row_idx,
+            "col": col_idx,
+            "violation": 'Bare "gloves" without descriptor (use cut-resistant gloves)',
+            "snippet": re.search(r'.{0,20}\bgloves\b.{0,20}', text,
+                                 re.IGNORECASE).group(0).strip()
+        })
+    return violations
 
+
+def scan_document(doc):
+    """Scan an open python-docx Document. Returns (violations, warnings)."""
     violations = []
+    warnings = []
 
     for tbl_idx in TABLES_TO_SCAN:
         if tbl_idx >= len(doc.tables):
-            print(f"  WARNING: Table index {tbl_idx} not found in document — skipping.")
+            warnings.append(f"Table index {tbl_idx} not found in document — skipping.")
             continue
 
         table = doc.tables[tbl_idx]
@@ -94,41 +157,259 @@ def validate(docx_path):
 
         for row_idx, row in enumerate(table.rows):
             for col_idx, cell in enumerate(row.cells):
-                text = cell.text
+                violations.extend(check_cell(cell.text, tbl_name, row_idx, col_idx))
+
+    return violations, warnings
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STREAMING ENGINE
+# ─────────────────────────────────────────────────────────────────────────────
+
+W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+OFFICE_DOCUMENT_REL = ('http://schemas.openxmlformats.org/officeDocument/2006/'
+                       'relationships/officeDocument')
+
+W_BODY = f'{{{W}}}body'
+W_TBL = f'{{{W}}}tbl'
+W_TR = f'{{{W}}}tr'
+W_TC = f'{{{W}}}tc'
+W_P = f'{{{W}}}p'
+W_R = f'{{{W}}}r'
+W_HYPERLINK = f'{{{W}}}hyperlink'
+W_T = f'{{{W}}}t'
+W_BR = f'{{{W}}}br'
+W_BR_TYPE = f'{{{W}}}type'
+W_VAL = f'{{{W}}}val'
+W_TCPR = f'{{{W}}}tcPr'
+W_GRIDSPAN = f'{{{W}}}gridSpan'
+W_VMERGE = f'{{{W}}}vMerge'
+
+# Other run content → text, as python-docx CT_R.text
+_RUN_TEXT = {
+    f'{{{W}}}tab': '\t',
+    f'{{{W}}}ptab': '\t',
+    f'{{{W}}}cr': '\n',
+    f'{{{W}}}noBreakHyphen': '-',
+}
+
+
+def _run_text(r):
+    """Text of a w:r — w:t, w:tab, w:br etc. mapped like python-docx."""
+    parts = []
+    for child in r:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or '')
+        elif tag == W_BR:
+            if child.get(W_BR_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif tag in _RUN_TEXT:
+            parts.append(_RUN_TEXT[tag])
+    return ''.join(parts)
+
 
-                if not text.strip():
+def _paragraph_text(p):
+    """Text of a w:p — its w:r and w:hyperlink children, as python-docx."""
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(r) for r in child.iterchildren(W_R))
+    return ''.join(parts)
+
+
+def _tc_text(tc):
+    """Text of a w:tc — python-docx _Cell.text."""
+    return '\n'.join(_paragraph_text(p) for p in tc.iterchildren(W_P))
+
+
+def _grid_before(tr):
+    """Unpopulated grid columns at the start of a row (w:gridBefore)."""
+    trPr = tr.find(f'{{{W}}}trPr')
+    gb = None if trPr is None else trPr.find(f'{{{W}}}gridBefore')
+    return 0 if gb is None else int(gb.get(W_VAL))
+
+
+def _row_cells(tr, above):
+    """Cell texts of one row exactly as python-docx _Row.cells yields them.
+
+    A cell spanning N grid columns appears N times; a vMerge continuation
+    cell repeats the cells of the w:tc at the same grid offset in the row
+    above. above is the previous row's layout ([(grid_offset, cells)]),
+    or None for the first row. Returns (cells, layout of this row).
+    """
+    grid_offset = _grid_before(tr)
+    layout = []
+    cells = []
+    for tc in tr.iterchildren(W_TC):
+        tcPr = tc.find(W_TCPR)
+        span_el = None if tcPr is None else tcPr.find(W_GRIDSPAN)
+        span = 1 if span_el is None else int(span_el.get(W_VAL))
+        vmerge = None if tcPr is None else tcPr.find(W_VMERGE)
+        if vmerge is not None and vmerge.get(W_VAL, 'continue') == 'continue':
+            if above is None:
+                raise ValueError("no tr above topmost tr in w:tbl")
+            tc_cells = next((c for offset, c in above if offset == grid_offset), None)
+            if tc_cells is None:
+                raise ValueError(f"no `tc` element at grid_offset={grid_offset}")
+        else:
+            tc_cells = [_tc_text(tc)] * span
+        layout.append((grid_offset, tc_cells))
+        cells.extend(tc_cells)
+        grid_offset += span
+    return cells, layout
+
+
+def _main_document_part(zf):
+    """Zip member name of the main document part (from _rels/.rels)."""
+    rels = etree.fromstring(zf.read('_rels/.rels'))
+    for rel in rels:
+        if rel.get('Type') == OFFICE_DOCUMENT_REL:
+            return rel.get('Target').lstrip('/')
+    raise KeyError('no officeDocument relationship in _rels/.rels')
+
+
+def scan_stream(docx_path):
+    """Scan a .docx without python-docx. Returns (violations, warnings),
+    identical to scan_document(Document(docx_path))."""
+    scan = set(TABLES_TO_SCAN)
+    found = {idx: [] for idx in scan}
+    tbl_idx = -1
+    current_tbl = None   # body-level w:tbl the index refers to
+    above = None         # previous row layout in current_tbl
+
+    with zipfile.ZipFile(docx_path) as zf:
+        with zf.open(_main_document_part(zf)) as part:
+            # Only block-level ends are needed — body children are
+            # paragraphs and tables (anything else is dropped with them)
+            for _, elem in etree.iterparse(part, events=('end',),
+                                           tag=(W_TR, W_TBL, W_P)):
+                parent = elem.getparent()
+                if parent is None:
                     continue
 
-                # Check forbidden exact terms
-                for pattern in PPE_FORBIDDEN_EXACT:
-                    if re.search(pattern, text, re.IGNORECASE):
-                        term = re.search(pattern, text, re.IGNORECASE).group(0)
-                        violations.append({
-                            "table": tbl_name,
-                            "row": row_idx,
-                            "col": col_idx,
-                            "violation": f'Forbidden term: "{term}"',
-                            "snippet": text[max(0, text.lower().find(term.lower())-20):
-                                           text.lower().find(term.lower())+40].strip()
-                        })
-
-                # Check bare gloves
-                if _check_bare_gloves(text):
-                    violations.append({
-                        "table": tbl_name,
-                        "row": row_idx,
-                        "col": col_idx,
-                        "violation": 'Bare "gloves" without descriptor (use cut-resistant gloves)',
-                        "snippet": re.search(r'.{0,20}\bgloves\b.{0,20}', text,
-                                             re.IGNORECASE).group(0).strip()
-                    })
-
-    # ── Report ────────────────────────────────────────────────────────────────
+                if elem.tag == W_TR and parent.tag == W_TBL:
+                    tbl = parent
+                    if tbl.getparent() is None or tbl.getparent().tag != W_BODY:
+                        continue  # nested table — part of its cell, kept intact
+                    if tbl is not current_tbl:
+                        tbl_idx += 1
+                        current_tbl, above = tbl, None
+                        row_idx = 0
+                    if tbl_idx in scan:
+                        cells, above = _row_cells(elem, above)
+                        tbl_name = TABLE_NAMES.get(tbl_idx, f"Table {tbl_idx}")
+                        for col_idx, text in enumerate(cells):
+                            found[tbl_idx].extend(
+                                check_cell(text, tbl_name, row_idx, col_idx))
+                    row_idx += 1
+                    # Row done — drop it and any earlier rows
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del tbl[0]
+
+                elif parent.tag == W_BODY:
+                    if elem.tag == W_TBL and elem is not current_tbl:
+                        tbl_idx += 1  # table without rows
+                    current_tbl = None if elem.tag == W_TBL else current_tbl
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del parent[0]
+
+    violations = []
+    warnings = []
+    for idx in TABLES_TO_SCAN:
+        if idx > tbl_idx:
+            warnings.append(f"Table index {idx} not found in document — skipping.")
+            continue
+        violations.extend(found[idx])
+    return violations, warnings
+
+
+@swms_trace.traced("ppe_scan")
+def scan_element(root):
+    """Scan an already-parsed w:document (or w:body) element — e.g.
+    doc.element of an open python-docx Document — with the streaming
+    engine's cell reader. Returns (violations, warnings), identical to
+    scan_document() on the same document."""
+    body = root if root.tag == W_BODY else root.find(W_BODY)
+    tables = body.findall(W_TBL)
+    violations = []
+    warnings = []
+
+    for tbl_idx in TABLES_TO_SCAN:
+        if tbl_idx >= len(tables):
+            warnings.append(f"Table index {tbl_idx} not found in document — skipping.")
+            continue
+
+        tbl_name = TABLE_NAMES.get(tbl_idx, f"Table {tbl_idx}")
+        above = None
+        for row_idx, tr in enumerate(tables[tbl_idx].iterchildren(W_TR)):
+            cells, above = _row_cells(tr, above)
+            for col_idx, text in enumerate(cells):
+                violations.extend(check_cell(text, tbl_name, row_idx, col_idx))
+
+    return violations, warnings
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+
+ENGINES = ('stream', 'docx')
+
+
+@swms_trace.traced("check_ppe")
+def check_ppe(docx_path, engine='stream'):
+    """Validate one .docx and return a result dict — never exits.
+
+    status is "PASS", "FAIL" (violations found) or "ERROR" (the document
+    could not be opened; error holds the reason). engine is "stream"
+    (default) or "docx" — see ENGINES in the module docstring."""
+    result = {
+        "file": docx_path,
+        "status": "ERROR",
+        "violations": [],
+        "warnings": [],
+        "error": None,
+    }
+    if engine == 'stream':
+        try:
+            violations, warnings = scan_stream(docx_path)
+        except (OSError, KeyError, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+            result["error"] = str(e)
+            return result
+    elif engine == 'docx':
+        try:
+            doc = Document(docx_path)
+        except Exception as e:
+            result["error"] = str(e)
+            return result
+        violations, warnings = scan_document(doc)
+    else:
+        raise ValueError(f"Unknown engine: {engine!r} (expected one of {ENGINES})")
+
+    result["violations"] = violations
+    result["warnings"] = warnings
+    result["status"] = "FAIL" if violations else "PASS"
+    return result
+
+
+def exit_code(result):
+    """Exit code for a single result (see EXIT CODES)."""
+    return {"PASS": 0, "FAIL": 1}.get(result["status"], 2)
+
+
+def print_report(result):
+    """Print the pass/fail report for one result (after the header)."""
+    for warning in result["warnings"]:
+        print(f"  WARNING: {warning}")
+
+    violations = result["violations"]
     if not violations:
         print("\n  ✅  PASS — No PPE violations found.")
         print("  Document is clear for issue.\n")
         print("═" * 60)
-        sys.exit(0)
     else:
         print(f"\n  ❌  FAIL — {len(violations)} PPE violation(s) found.")
         print("  DO NOT ISSUE this document until violations are corrected.\n")
@@ -143,11 +424,158 @@ def validate(docx_path):
         print("  • bare 'gloves' → cut-resistant gloves")
         print("    (exception: chemical-resistant / insulated / leather / nitrile / waterproof gloves)\n")
         print("═" * 60)
+
+
+def validate(docx_path, engine='stream'):
+    print("═" * 60)
+    print(f"  PPE VALIDATOR v1.0")
+    print(f"  File: {docx_path}")
+    print("═" * 60)
+
+    result = check_ppe(docx_path, engine=engine)
+    if result["status"] == "ERROR":
+        print(f"\n  ERROR: Could not open document — {result['error']}")
         sys.exit(1)
 
+    print_report(result)
+    sys.exit(exit_code(result))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BATCH
+# ─────────────────────────────────────────────────────────────────────────────
+
+def expand_inputs(inputs):
+    """Resolve files, directories (their *.docx) and glob patterns into a
+    sorted, de-duplicated list of .docx paths. Word lock files (~$*) are
+    skipped."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, '*.docx'))
+        elif glob.has_magic(item):
+            matches = glob.glob(item, recursive=True)
+        else:
+            matches = [item]
+        paths.extend(m for m in matches
+                     if not os.path.basename(m).startswith('~$'))
+    return sorted(set(paths))
+
+
+def validate_many(paths, jobs=1, engine='stream'):
+    """check_ppe() every path, serially or across a process pool.
+    Results are returned in paths order."""
+    check = partial(check_ppe, engine=engine)
+    if jobs <= 1 or len(paths) <= 1:
+        return [check(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+        return list(pool.map(check, paths, chunksize=4))
+
+
+def junit_xml(results):
+    """Render results as a JUnit XML report (one testcase per file)."""
+    failures = sum(1 for r in results if r["status"] == "FAIL")
+    errors = sum(1 for r in results if r["status"] == "ERROR")
+    suite = etree.Element("testsuite", name="swms_ppe_validator",
+                          tests=str(len(results)), failures=str(failures),
+                          errors=str(errors))
+    for r in results:
+        case = etree.SubElement(suite, "testcase", classname="swms_ppe_validator",
+                                name=r["file"])
+        if r["status"] == "ERROR":
+            err = etree.SubElement(case, "error", message="Could not open document")
+            err.text = r["error"]
+        elif r["status"] == "FAIL":
+            fail = etree.SubElement(case, "failure",
+                                    message=f"{len(r['violations'])} PPE violation(s)")
+            fail.text = "\n".join(
+                f"{v['table']} | Row {v['row']} | Col {v['col']} | "
+                f"{v['violation']} | ...{v['snippet']}..."
+                for v in r["violations"])
+        if r["warnings"]:
+            out = etree.SubElement(case, "system-out")
+            out.text = "\n".join(f"WARNING: {w}" for w in r["warnings"])
+    return etree.tostring(suite, xml_declaration=True, encoding="UTF-8",
+                          pretty_print=True)
+
+
+def _write_report(path, data):
+    """Write a report to path, or to stdout for '-'."""
+    if path == '-':
+        sys.stdout.write(data if isinstance(data, str) else data.decode("utf-8"))
+        return
+    mode = 'w' if isinstance(data, str) else 'wb'
+    with open(path, mode) as f:
+        f.write(data)
+
+
+def run_batch(inputs, jobs=1, json_path=None, junit_path=None, engine='stream'):
+    """Validate every .docx matched by inputs and print a summary.
+    Returns the aggregated exit code."""
+    paths = expand_inputs(inputs)
+    quiet = '-' in (json_path, junit_path)
+    if not paths:
+        print("  ERROR: no .docx files matched", file=sys.stderr)
+        return 2
+
+    results = validate_many(paths, jobs=jobs, engine=engine)
+
+    if not quiet:
+        print("═" * 60)
+        print(f"  PPE VALIDATOR v1.0 — {len(results)} file(s)")
+        print("═" * 60)
+        for r in results:
+            if r["status"] == "ERROR":
+                print(f"  ERROR  {r['file']} — {r['error']}")
+                continue
+            print(f"  {r['status']:<5}  {r['file']}")
+            for v in r["violations"]:
+                print(f"         {v['table']} | Row {v['row']} | Col {v['col']} | {v['violation']}")
+                print(f"         Context : ...{v['snippet']}...")
+            for warning in r["warnings"]:
+                print(f"         WARNING: {warning}")
+        counts = {s: sum(1 for r in results if r["status"] == s)
+                  for s in ("PASS", "FAIL", "ERROR")}
+        print("═" * 60)
+        print(f"  PASS: {counts['PASS']}  FAIL: {counts['FAIL']}  ERROR: {counts['ERROR']}")
+        print("═" * 60)
+
+    if json_path:
+        _write_report(json_path, json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+    if junit_path:
+        _write_report(junit_path, junit_xml(results))
+
+    return max(exit_code(r) for r in results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RPD SWMS PPE compliance validator.")
+    parser.add_argument('inputs', nargs='+',
+                        help=".docx files, directories or glob patterns")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="validate in N worker processes (0 = one per CPU, default 1)")
+    parser.add_argument('--json', metavar='PATH',
+                        help="write a combined JSON report ('-' for stdout)")
+    parser.add_argument('--junit', metavar='PATH',
+                        help="write a JUnit XML report ('-' for stdout)")
+    parser.add_argument('--engine', choices=ENGINES, default='stream',
+                        help="stream (default, fast) or docx (python-docx object model)")
+    swms_trace.add_cli_arguments(parser)
+    args = parser.parse_args(argv)
+    swms_trace.enable_from_args(args)
+
+    batch = (len(args.inputs) > 1 or args.json or args.junit or args.jobs != 1
+             or os.path.isdir(args.inputs[0]) or glob.has_magic(args.inputs[0]))
+    if not batch:
+        validate(args.inputs[0], engine=args.engine)  # single file — original report; exits
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    sys.exit(run_batch(args.inputs, jobs=jobs, json_path=args.json,
+                       junit_path=args.junit, engine=args.engine))
+
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python3 swms_ppe_validator.py <swms_output.docx>")
         sys.exit(1)
-    validate(sys.argv[1])
+    main()
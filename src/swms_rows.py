@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+RPD SWMS Row Helpers
+WordprocessingML XML helpers, the new_task() vocabulary builder and the
+control cell builders shared by swms_generator.py (task definitions) and
+build_all_swms.py (document assembly).
+
+Importing this module does not load any task data. swms_generator.py
+re-exports everything here, so `from swms_generator import make_run`
+keeps working.
+"""
+
+from lxml import etree
+from docx.oxml.ns import qn
+
+# Controlled vocabulary — canonical phrases for hazards, controls, PPE, STOP WORK
+try:
+    from swms_vocabulary import (
+        get_hazard, get_control, get_ppe, get_stop_work,
+        build_engineering, build_admin, HAZARDS, CONTROLS,
+        PPE_ITEMS, STOP_WORK,
+    )
+except ImportError:
+    print("WARNING: swms_vocabulary.py not found — new_task() will not be available.")
+    print("  Existing raw-string task definitions will still work.")
+
+# ============================================================
+# XML HELPERS
+# ============================================================
+
+def make_run(text, bold=False, italic=False, font='Aptos', size='16', color=None):
+    """Create a w:r element"""
+    r = etree.Element(qn('w:r'))
+    rPr = etree.SubElement(r, qn('w:rPr'))
+    rFonts = etree.SubElement(rPr, qn('w:rFonts'))
+    rFonts.set(qn('w:ascii'), font)
+    rFonts.set(qn('w:hAnsi'), font)
+    sz = etree.SubElement(rPr, qn('w:sz'))
+    sz.set(qn('w:val'), size)
+    szCs = etree.SubElement(rPr, qn('w:szCs'))
+    szCs.set(qn('w:val'), size)
+    if bold:
+        etree.SubElement(rPr, qn('w:b'))
+    if italic:
+        etree.SubElement(rPr, qn('w:i'))
+    if color:
+        c = etree.SubElement(rPr, qn('w:color'))
+        c.set(qn('w:val'), color)
+    t = etree.SubElement(r, qn('w:t'))
+    t.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
+    t.text = text
+    return r
+
+def make_para(spacing_before='20', spacing_after='20', line='276'):
+    """Create empty w:p with spacing and hanging indent.
+    Spacing: 1pt before/after, 1.15 line spacing.
+    Indent: 0.4cm hanging (227 DXA)."""
+    p = etree.Element(qn('w:p'))
+    pPr = etree.SubElement(p, qn('w:pPr'))
+    sp = etree.SubElement(pPr, qn('w:spacing'))
+    sp.set(qn('w:before'), spacing_before)
+    sp.set(qn('w:after'), spacing_after)
+    sp.set(qn('w:line'), line)
+    sp.set(qn('w:lineRule'), 'auto')
+    ind = etree.SubElement(pPr, qn('w:ind'))
+    ind.set(qn('w:left'), '227')
+    ind.set(qn('w:hanging'), '227')
+    return p
+
+def make_header_para(text):
+    """Bold header paragraph - e.g. 'PRE (Medium-4): Controls in place.'"""
+    p = make_para()
+    p.append(make_run(text, bold=True))
+    return p
+
+def make_label_para(label, content):
+    """Paragraph with bold label + regular content"""
+    p = make_para()
+    p.append(make_run(label + ' ', bold=True))
+    p.append(make_run(content))
+    return p
+
+def make_stop_work_para(conditions):
+    """STOP WORK if: paragraph"""
+    p = make_para()
+    p.append(make_run('STOP WORK if:', bold=True))
+    p.append(make_run(' ', bold=True))
+    p.append(make_run(conditions))
+    return p
+
+def make_ccvs_header_para(code, level, score):
+    """CCVS header: 'WAH (High-6) CCVS HOLD POINTS:'"""
+    p = make_para()
+    p.append(make_run(f'{code} ({level}-{score}) CCVS HOLD POINTS:', bold=True))
+    return p
+
+def make_hold_point_para():
+    """HOLD POINT — Do not commence until:"""
+    p = make_para()
+    p.append(make_run('HOLD POINT ', bold=True))
+    p.append(make_run('—', bold=True))
+    p.append(make_run(' Do not commence until:', bold=True))
+    p.append(make_run(' ', bold=True))
+    return p
+
+def make_numbered_para(text, num_id, ilvl='0'):
+    """Numbered list paragraph - used for HOLD POINTS with decimal 1. 2. 3. format.
+    num_id must reference a valid <w:num> pointing to a decimal abstractNum."""
+    p = make_para()
+    pPr = p.find(qn('w:pPr'))
+    numPr = etree.SubElement(pPr, qn('w:numPr'))
+    ilvl_elem = etree.SubElement(numPr, qn('w:ilvl'))
+    ilvl_elem.set(qn('w:val'), ilvl)
+    numId_elem = etree.SubElement(numPr, qn('w:numId'))
+    numId_elem.set(qn('w:val'), str(num_id))
+    p.append(make_run(text))
+    return p
+
+def make_bullet_para(text, num_id, ilvl='0'):
+    """Bullet list paragraph - used for Eng/Admin/PPE/STOP WORK with open circle 'o' format.
+    num_id must reference a valid <w:num> pointing to a bullet abstractNum."""
+    p = make_para()
+    pPr = p.find(qn('w:pPr'))
+    numPr = etree.SubElement(pPr, qn('w:numPr'))
+    ilvl_elem = etree.SubElement(numPr, qn('w:ilvl'))
+    ilvl_elem.set(qn('w:val'), ilvl)
+    numId_elem = etree.SubElement(numPr, qn('w:numId'))
+    numId_elem.set(qn('w:val'), str(num_id))
+    p.append(make_run(text))
+    return p
+
+def make_section_label_para(label):
+    """Section label paragraph - bold label only"""
+    p = make_para()
+    p.append(make_run(label, bold=True))
+    p.append(make_run(' '))
+    return p
+
+def set_cell_text(tc, paragraphs):
+    """Replace all paragraphs in a tc with new ones"""
+    for p in tc.findall(qn('w:p')):
+        tc.remove(p)
+    for p in paragraphs:
+        tc.append(p)
+
+def set_cell_simple(tc, text, bold=False):
+    """Set cell to single paragraph with text"""
+    for p in tc.findall(qn('w:p')):
+        tc.remove(p)
+    p = make_para()
+    p.append(make_run(text, bold=bold))
+    tc.append(p)
+
+def set_cell_shading(tc, fill_color, text_color='000000'):
+    """Set cell background shading"""
+    tcPr = tc.find(qn('w:tcPr'))
+    if tcPr is None:
+        tcPr = etree.SubElement(tc, qn('w:tcPr'))
+        tc.insert(0, tcPr)
+    shd = tcPr.find(qn('w:shd'))
+    if shd is None:
+        shd = etree.SubElement(tcPr, qn('w:shd'))
+    shd.set(qn('w:val'), 'clear')
+    shd.set(qn('w:color'), 'auto')
+    shd.set(qn('w:fill'), fill_color)
+
+def get_risk_color(level):
+    """Return fill color for risk level"""
+    if level.startswith('High'):
+        return 'FF0000'
+    elif level.startswith('Medium'):
+        return 'FFFF00'
+    else:
+        return '00FF00'
+
+def get_risk_text_color(level):
+    if level.startswith('High'):
+        return 'FFFFFF'
+    return '000000'
+
+def set_cell_text_color(tc, color):
+    """Set font colour on all runs in all paragraphs in cell"""
+    for p in tc.findall(qn('w:p')):
+        for r in p.findall(qn('w:r')):
+            rPr = r.find(qn('w:rPr'))
+            if rPr is None:
+                rPr = etree.SubElement(r, qn('w:rPr'))
+                r.insert(0, rPr)
+            c = rPr.find(qn('w:color'))
+            if c is None:
+                c = etree.SubElement(rPr, qn('w:color'))
+            c.set(qn('w:val'), color)
+
+def remove_cell_shading(tc):
+    """Remove any shading from a cell"""
+    tcPr = tc.find(qn('w:tcPr'))
+    if tcPr is not None:
+        shd = tcPr.find(qn('w:shd'))
+        if shd is not None:
+            tcPr.remove(shd)
+
+# ============================================================
+# VOCABULARY-BASED TASK BUILDER
+# ============================================================
+
+def new_task(
+    name,
+    scope,
+    hazard_keys,
+    risk_pre,
+    risk_code,
+    engineering,
+    admin,
+    ppe_keys,
+    stop_work_keys,
+    responsibility="Supervisor / Worker / Sub-Contract Worker",
+    risk_post="Low (2)",
+    ccvs=False,
+    hold_points=None,
+):
+    """
+    Create a new SWMS task using controlled vocabulary.
+
+    Args:
+        name:           Task name string (bold in Col 0)
+        scope:          Scope description — goes in [brackets], italic
+                        Use None or '' if no scope description needed
+        hazard_keys:    List of keys from HAZARDS dict
+                        e.g. ["fall_unprotected_edge", "silica_dust_cutting"]
+        risk_pre:       Pre-control risk string e.g. "High (6)"
+        risk_code:      Risk code e.g. "STR-H6"
+        engineering:    List of vocabulary keys OR raw strings
+                        Joined as em dash chain (non-CCVS)
+                        or bullet list (CCVS)
+        admin:          List of vocabulary keys OR raw strings
+        ppe_keys:       List of PPE_ITEMS keys
+                        e.g. ["steel_cap", "p2_respirator", "eye_protection"]
+        stop_work_keys: List of STOP_WORK keys
+                        e.g. ["silica_no_controls", "edge_no_protection"]
+        responsibility: Responsibility string (default shown)
+        risk_post:      Post-control risk string (default "Low (2)")
+        ccvs:           True if this is a CCVS task with hold points
+        hold_points:    List of hold point verification strings (CCVS only)
+
+    Returns:
+        dict compatible with build_all_swms.py row builders.
+        Keys: task, task_desc, hazard, risk_pre, risk_post, code,
+              resp, type, and either 'control' (STD) or
+              'hold_points'/'eng'/'admin'/'ppe'/'stop_work' (CCVS).
+
+    Raises:
+        ValueError if any key not found in vocabulary
+    """
+    # Resolve hazards — each key must exist in HAZARDS
+    hazards = [get_hazard(k) for k in hazard_keys]
+    hazard_string = '. '.join(hazards)
+
+    # Resolve PPE — comma-joined canonical items
+    ppe_string = get_ppe(*ppe_keys)
+
+    # Resolve STOP WORK — em dash joined canonical conditions
+    stop_string = get_stop_work(*stop_work_keys)
+
+    # Base dict — compatible with build_new_std_row / build_new_ccvs_row
+    result = {
+        'task': name,
+        'task_desc': scope or '',
+        'hazard': hazard_string,
+        'risk_pre': risk_pre,
+        'risk_post': risk_post,
+        'code': risk_code,
+        'resp': responsibility,
+    }
+
+    if ccvs:
+        result['type'] = 'CCVS'
+        result['hold_points'] = hold_points or []
+        # CCVS: engineering/admin stay as lists (one per bullet)
+        result['eng'] = [
+            CONTROLS[e]["canonical"] if e in CONTROLS else e
+            for e in engineering
+        ]
+        result['admin'] = [
+            CONTROLS[a]["canonical"] if a in CONTROLS else a
+            for a in admin
+        ]
+        result['ppe'] = [ppe_string]
+        result['stop_work'] = [stop_string]
+    else:
+        result['type'] = 'STD'
+        # STD: engineering/admin joined as em dash chains
+        eng_string = build_engineering(*engineering)
+        adm_string = build_admin(*admin)
+        result['control'] = [
+            ('Engineering:', eng_string),
+            ('Admin:', adm_string),
+            ('PPE:', ppe_string),
+            ('STOP WORK if:', stop_string),
+        ]
+
+    return result
+
+
+# ============================================================
+# CONTROL CELL BUILDERS
+# ============================================================
+
+def build_std_control(code, level, score, sections):
+    """Build standard task control paragraphs.
+    sections: list of (label, content) tuples
+    Last item should be STOP WORK
+    """
+    paras = []
+    paras.append(make_header_para(f'{code} ({level}-{score}): Controls in place.'))
+    for label, content in sections:
+        if label == 'STOP WORK if:':
+            paras.append(make_stop_work_para(content))
+        else:
+            paras.append(make_label_para(label, content))
+    return paras
+
+def build_ccvs_control(code, level, score, hold_points, eng, admin, ppe, stop_work, decimal_num_id, bullet_num_id):
+    """Build CCVS HOLD POINT control paragraphs.
+    hold_points: list of strings (numbered items)
+    eng, admin, ppe, stop_work: lists of strings (bullet items)
+    decimal_num_id: numId for HOLD POINTS (decimal format)
+    bullet_num_id: numId for Eng/Admin/PPE/STOP WORK (bullet format)
+    """
+    paras = []
+    paras.append(make_ccvs_header_para(code, level, score))
+    paras.append(make_hold_point_para())
+    for hp in hold_points:
+        paras.append(make_numbered_para(hp, num_id=decimal_num_id))
+    
+    paras.append(make_section_label_para('Engineering:'))
+    for e in eng:
+        paras.append(make_bullet_para(e, num_id=bullet_num_id))
+    
+    paras.append(make_section_label_para('Admin:'))
+    for a in admin:
+        paras.append(make_bullet_para(a, num_id=bullet_num_id))
+    
+    paras.append(make_section_label_para('PPE:'))
+    for pp in ppe:
+        paras.append(make_bullet_para(pp, num_id=bullet_num_id))
+    
+    paras.append(make_section_label_para('STOP WORK if:'))
+    for sw in stop_work:
+        paras.append(make_bullet_para(sw, num_id=bullet_num_id))
+    
+    return paras
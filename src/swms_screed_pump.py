@@ -16,7 +16,7 @@ import sys
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from SWMS_BASE_GENERAL import generate_swms
+from SWMS_BASE_GENERAL import generate_swms_variants
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -355,12 +355,9 @@ if __name__ == "__main__":
         leg_append=LEGISLATION_APPEND,
     )
 
-    print("Generating Standard output...")
-    generate_swms(TEMPLATE, OUT_STD, TASKS, use_ccvs=False, **kwargs)
+    print("Generating Standard and CCVS outputs...")
+    generate_swms_variants(TEMPLATE, OUT_STD, OUT_CCVS, TASKS, **kwargs)
     print(f"  Saved: {OUT_STD}")
-
-    print("Generating CCVS output...")
-    generate_swms(TEMPLATE, OUT_CCVS, TASKS, use_ccvs=True, **kwargs)
     print(f"  Saved: {OUT_CCVS}")
 
     print("\nDone. Run bulletizer and PPE validator on both outputs.")
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+RPD SWMS stage tracer
+Wall time, CPU time and (optionally) tracemalloc peaks per pipeline stage,
+for generate_swms, build_swms, format_swms, the bulletizer, the PPE
+validator and the risk register exporters.
+
+Usage in the engines:
+    with stage("save"):
+        ...
+    @traced("populate_detail_table")
+    def _populate_detail_table(doc, tasks): ...
+
+Disabled by default. When disabled, stage() returns a shared no-op context
+manager and traced() functions call straight through after one flag check —
+no timers, no allocation.
+
+Enabling:
+    GATEKEEPER_PROFILE=trace.json            — write a trace at exit
+    GATEKEEPER_PROFILE_FORMAT=chrome         — Chrome trace-event file
+                                               (chrome://tracing, Perfetto)
+                                               instead of the JSON trace
+    GATEKEEPER_PROFILE_MEMORY=1              — tracemalloc peak per stage
+  or --profile PATH [--profile-format chrome] [--profile-memory] on
+  build_all_swms.py, gatekeeper.py batch, swms_bulletize.py and the risk
+  register exporters.
+
+JSON trace: {"version", "pid", "events": [{name, ts_us, wall_ms, cpu_ms,
+mem_peak_kb, depth, pid, tid, args}]}. Events are in completion order.
+Worker processes (build_all_swms -j, gatekeeper batch -j) hand their
+events back with drain(); the parent adds them with merge().
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+FORMATS = ("json", "chrome")
+
+_ENABLED = False
+_PATH = None
+_FORMAT = "json"
+_MEMORY = False
+_EVENTS = []
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+_ATEXIT_REGISTERED = False
+
+
+# ============================================================
+# CONTROL
+# ============================================================
+
+def enable(path=None, fmt="json", memory=False):
+    """Start recording. path — written by write() and at process exit.
+    Exported to the environment so spawned worker processes also record."""
+    global _ENABLED, _PATH, _FORMAT, _MEMORY, _ATEXIT_REGISTERED
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown trace format: {fmt!r} (use {', '.join(FORMATS)})")
+    _ENABLED, _PATH, _FORMAT, _MEMORY = True, path, fmt, memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if path:
+        os.environ["GATEKEEPER_PROFILE"] = path
+        os.environ["GATEKEEPER_PROFILE_FORMAT"] = fmt
+        if memory:
+            os.environ["GATEKEEPER_PROFILE_MEMORY"] = "1"
+        if not _ATEXIT_REGISTERED:
+            atexit.register(_write_at_exit)
+            _ATEXIT_REGISTERED = True
+
+
+def disable():
+    """Stop recording. Recorded events are kept until drain()."""
+    global _ENABLED
+    _ENABLED = False
+    if _MEMORY and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled():
+    return _ENABLED
+
+
+def enable_from_env():
+    """Enable from GATEKEEPER_PROFILE* if set. Called at import."""
+    path = os.environ.get("GATEKEEPER_PROFILE")
+    if path:
+        enable(path, os.environ.get("GATEKEEPER_PROFILE_FORMAT", "json"),
+               os.environ.get("GATEKEEPER_PROFILE_MEMORY", "") not in ("", "0"))
+
+
+def add_cli_arguments(parser):
+    """Add --profile / --profile-format / --profile-memory to an argparse parser."""
+    parser.add_argument("--profile", metavar="PATH",
+                        help="write a stage timing trace to PATH")
+    parser.add_argument("--profile-format", choices=FORMATS, default="json",
+                        help="trace format (default json; chrome = trace-event file)")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="with --profile, record tracemalloc peaks per stage")
+
+
+def enable_from_args(args):
+    """Enable from parsed add_cli_arguments() options, if --profile was given."""
+    if getattr(args, "profile", None):
+        enable(args.profile, args.profile_format, args.profile_memory)
+
+
+# ============================================================
+# RECORDING
+# ============================================================
+
+class _NullStage:
+    """Shared no-op stage for the disabled path."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """One timed stage. args may be updated inside the with-block."""
+
+    __slots__ = ("name", "args", "depth", "child_peak", "_ts", "_wall",
+                 "_cpu", "_mem_start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.child_peak = 0
+
+    def __enter__(self):
+        stack = _stack()
+        self.depth = len(stack)
+        if _MEMORY and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # reset_peak() below hides the parent's peak so far — keep it
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+            tracemalloc.reset_peak()
+            self._mem_start = current
+        else:
+            self._mem_start = None
+        stack.append(self)
+        self._ts = time.perf_counter_ns()
+        self._cpu = time.thread_time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter_ns() - self._ts
+        cpu = time.thread_time_ns() - self._cpu
+        stack = _stack()
+        stack.pop()
+        event = {
+            "name": self.name,
+            "ts_us": self._ts // 1000,
+            "wall_ms": round(wall / 1e6, 3),
+            "cpu_ms": round(cpu / 1e6, 3),
+            "depth": self.depth,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if self._mem_start is not None and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            event["mem_peak_kb"] = round(max(peak - self._mem_start, 0) / 1024, 1)
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+        if exc_type is not None:
+            event["error"] = exc_type.__name__
+        if self.args:
+            event["args"] = self.args
+        with _LOCK:
+            _EVENTS.append(event)
+        return False
+
+
+def _stack():
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    return stack
+
+
+def stage(name, **args):
+    """Context manager timing one stage. No-op unless tracing is enabled."""
+    if not _ENABLED:
+        return _NULL_STAGE
+    return _Stage(name, args)
+
+
+def traced(name=None):
+    """Decorator: run the function inside stage(name or function name)."""
+    def decorate(func):
+        stage_name = name or func.__name__.lstrip("_")
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return func(*args, **kwargs)
+            with _Stage(stage_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class RuleTimer:
+    """Accumulates wall time and call counts per key inside a hot loop —
+    for per-rule format timings without one event per call. Attach the
+    result to the enclosing stage with stage.args.update(timer.summary())."""
+
+    __slots__ = ("totals", "calls")
+
+    def __init__(self):
+        self.totals = {}
+        self.calls = {}
+
+    def add(self, key, ns):
+        self.totals[key] = self.totals.get(key, 0) + ns
+        self.calls[key] = self.calls.get(key, 0) + 1
+
+    def summary(self):
+        return {key: {"ms": round(ns / 1e6, 3), "calls": self.calls[key]}
+                for key, ns in self.totals.items()}
+
+
+# ============================================================
+# OUTPUT
+# ============================================================
+
+def drain():
+    """Return and clear the recorded events."""
+    with _LOCK:
+        events = list(_EVENTS)
+        _EVENTS.clear()
+    return events
+
+
+def merge(events):
+    """Add events recorded in another process (see drain())."""
+    if events:
+        with _LOCK:
+            _EVENTS.extend(events)
+
+
+def events():
+    """Return a copy of the recorded events."""
+    with _LOCK:
+        return list(_EVENTS)
+
+
+def _chrome_trace(recorded):
+    trace = []
+    for e in recorded:
+        args = {"cpu_ms": e["cpu_ms"]}
+        if "mem_peak_kb" in e:
+            args["mem_peak_kb"] = e["mem_peak_kb"]
+        if "error" in e:
+            args["error"] = e["error"]
+        args.update(e.get("args", {}))
+        trace.append({"name": e["name"], "cat": "swms", "ph": "X",
+                      "ts": e["ts_us"], "dur": round(e["wall_ms"] * 1000),
+                      "pid": e["pid"], "tid": e["tid"], "args": args})
+    trace.sort(key=lambda t: (t["pid"], t["ts"]))
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+
+def write(path=None, fmt=None):
+    """Write the recorded events to path (default: the enable() path)."""
+    path = path or _PATH
+    fmt = fmt or _FORMAT
+    recorded = events()
+    if fmt == "chrome":
+        data = _chrome_trace(recorded)
+    else:
+        data = {"version": 1, "pid": os.getpid(), "events": recorded}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+        f.write("\n")
+    return path
+
+
+def _write_at_exit():
+    if _PATH and events():
+        print(f"  Trace → {write()}")
+
+
+enable_from_env()
+
+# The engines import this as swms_trace, the risk register exporters as
+# src.swms_trace — alias both names to one module so there is one recorder.
+if __name__ in ("swms_trace", "src.swms_trace"):
+    sys.modules.setdefault(
+        "src.swms_trace" if __name__ == "swms_trace" else "swms_trace",
+        sys.modules[__name__])
@@ -19,6 +19,10 @@ Rules:
     - Run: python src/vocab_tool.py scan  to check for unregistered phrases
 """
 
+import swms_log
+
+_log = swms_log.get_logger("vocabulary")
+
 # ============================================================
 # HAZARDS — Canonical hazard descriptions
 # ============================================================
@@ -433,8 +437,11 @@ def build_engineering(*phrases):
         if p in CONTROLS:
             resolved.append(CONTROLS[p]["canonical"])
         else:
-            print(f"  WARNING: Raw string in engineering controls: '{p[:60]}'")
-            print(f"  Consider adding to swms_vocabulary.py CONTROLS dict")
+            swms_log.event(
+                _log, swms_log.WARNING, "raw_control",
+                "  WARNING: Raw string in engineering controls: '{text}'\n"
+                "  Consider adding to swms_vocabulary.py CONTROLS dict",
+                kind="engineering", text=p[:60])
             resolved.append(p)
     return " \u2014 ".join(resolved)
 
@@ -446,6 +453,8 @@ def build_admin(*phrases):
         if p in CONTROLS:
             resolved.append(CONTROLS[p]["canonical"])
         else:
-            print(f"  WARNING: Raw string in admin controls: '{p[:60]}'")
+            swms_log.event(_log, swms_log.WARNING, "raw_control",
+                           "  WARNING: Raw string in admin controls: '{text}'",
+                           kind="admin", text=p[:60])
             resolved.append(p)
     return " \u2014 ".join(resolved)
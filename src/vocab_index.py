@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+RPD SWMS Vocabulary Index
+Compiled, reverse-lookup view of swms_vocabulary.py — HAZARDS, CONTROLS,
+PPE_ITEMS and STOP_WORK — built once per process and cached on disk.
+
+Lookups:
+    index.phrase('control', 'vacuum_blade_guard')   key -> canonical phrase
+    index.lookup('Eye protection')                  phrase -> (kind, key)
+    index.lookup('eye  PROTECTION', normalised=True)
+                                                    case / whitespace / dash
+                                                    folded phrase -> (kind, key)
+    index.decompose(text)                           every canonical phrase in
+                                                    text, plus the leftovers,
+                                                    in one pass
+
+Kinds are 'hazard', 'control', 'ppe' and 'stop_work'. Where two keys share
+a canonical phrase (p2_respirator / p2_dust_mask) the first key in
+vocabulary order is the one returned; keys_for() returns all of them.
+
+Matching runs one phrase_matcher alternation over the normalised text,
+longest phrases first, with word boundaries at both ends — so "Hard hat"
+does not match inside "Hard hats" and "Eye protection or goggles" wins
+over "Eye protection".
+
+Cache: __pycache__/vocab_index.<hash>.pickle next to this file, keyed on
+the SHA-256 of swms_vocabulary.py (and of this module). A warm start skips importing the
+vocabulary and rebuilding the maps. Unwritable cache directories are
+ignored.
+
+Usage:
+    from vocab_index import get_index
+    index = get_index()
+    matches, leftovers = index.decompose(hazard_text)
+"""
+
+import hashlib
+import os
+import pickle
+import re
+from collections import namedtuple
+
+from phrase_matcher import compile_alternation
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+VOCAB_PATH = os.path.join(_script_dir, 'swms_vocabulary.py')
+CACHE_DIR = os.path.join(_script_dir, '__pycache__')
+CACHE_VERSION = 1
+
+KINDS = ('hazard', 'control', 'ppe', 'stop_work')
+DICT_NAMES = {
+    'hazard': 'HAZARDS',
+    'control': 'CONTROLS',
+    'ppe': 'PPE_ITEMS',
+    'stop_work': 'STOP_WORK',
+}
+
+Match = namedtuple('Match', 'start end kind key phrase')
+
+
+# ============================================================
+# NORMALISATION
+# ============================================================
+
+_FOLD = {
+    '\u2010': '-', '\u2011': '-', '\u2012': '-', '\u2013': '-',
+    '\u2014': '-', '\u2015': '-', '\u2212': '-',
+    '\u2018': "'", '\u2019': "'", '\u201c': '"', '\u201d': '"',
+}
+
+
+def _normalise_with_offsets(text):
+    """Return (normalised text, offsets) — offsets[i] is the index in text
+    of normalised character i, plus a final entry for len(text)."""
+    out, offsets = [], []
+    space = False
+    for i, ch in enumerate(text):
+        if ch.isspace():
+            space = bool(out)
+            continue
+        if space:
+            out.append(' ')
+            offsets.append(i - 1)
+            space = False
+        for folded in _FOLD.get(ch, ch).casefold():
+            out.append(folded)
+            offsets.append(i)
+    offsets.append(len(text))
+    return ''.join(out), offsets
+
+
+_FOLD_TABLE = str.maketrans(_FOLD)
+
+
+def normalise(text):
+    """Case-fold, fold dashes and quotes, collapse whitespace, strip."""
+    return ' '.join(text.translate(_FOLD_TABLE).casefold().split())
+
+
+# ============================================================
+# INDEX
+# ============================================================
+
+class VocabularyIndex:
+    """Forward and reverse maps over the controlled vocabulary."""
+
+    def __init__(self, entries, source_hash=None):
+        """entries — {kind: {key: canonical phrase}} in vocabulary order."""
+        self.source_hash = source_hash
+        self.entries = {kind: dict(entries.get(kind, {})) for kind in KINDS}
+        self._exact = {}
+        self._normalised = {}
+        self._keys = {}
+        for kind in KINDS:
+            for key, phrase in self.entries[kind].items():
+                self._exact.setdefault(phrase, (kind, key))
+                self._normalised.setdefault(normalise(phrase), (kind, key))
+                self._keys.setdefault(phrase, []).append((kind, key))
+        # Case-folded phrases for count_present()
+        self._folded = frozenset(phrase.lower() for phrase in self._exact)
+        self._matchers = {}
+
+    @classmethod
+    def from_vocabulary(cls, source_hash=None):
+        import swms_vocabulary as v
+        return cls({
+            'hazard': {k: e['canonical'] for k, e in v.HAZARDS.items()},
+            'control': {k: e['canonical'] for k, e in v.CONTROLS.items()},
+            'ppe': dict(v.PPE_ITEMS),
+            'stop_work': dict(v.STOP_WORK),
+        }, source_hash)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_matchers'] = {}   # recompiled on first use
+        return state
+
+    def __len__(self):
+        return sum(len(keys) for keys in self.entries.values())
+
+    # ── Lookups ──────────────────────────────────────────────
+
+    def phrase(self, kind, key):
+        """Canonical phrase for key. Raises ValueError if missing."""
+        try:
+            return self.entries[kind][key]
+        except KeyError:
+            raise ValueError(
+                f"{DICT_NAMES.get(kind, kind)} key '{key}' not in swms_vocabulary.py"
+            ) from None
+
+    def lookup(self, phrase, normalised=False):
+        """(kind, key) for a canonical phrase, or None. normalised=True
+        ignores case, whitespace runs and dash / quote style."""
+        if normalised:
+            return self._normalised.get(normalise(phrase))
+        return self._exact.get(phrase)
+
+    def keys_for(self, phrase):
+        """Every (kind, key) whose canonical phrase is exactly phrase."""
+        return list(self._keys.get(phrase, ()))
+
+    def phrases(self, kind=None):
+        """Set of canonical phrases, for one kind or all."""
+        kinds = (kind,) if kind else KINDS
+        return {p for k in kinds for p in self.entries[k].values()}
+
+    @staticmethod
+    def ref(kind, key):
+        """"HAZARDS['key']"-style reference for reports."""
+        return f"{DICT_NAMES[kind]}['{key}']"
+
+    # ── Matching ─────────────────────────────────────────────
+
+    def _matcher(self, kinds):
+        """(regex, [(kind, key)] per alternative) for kinds, compiled once."""
+        kinds = tuple(kinds or KINDS)
+        if kinds not in self._matchers:
+            table = {}
+            for kind in kinds:
+                for key, phrase in self.entries[kind].items():
+                    table.setdefault(normalise(phrase), (kind, key))
+            # Longest first: at one start position the longest phrase wins
+            patterns = sorted(table, key=lambda p: (-len(p), p))
+            regex = None
+            if patterns:
+                body = compile_alternation(
+                    [rf'{re.escape(p)}(?!\w)' for p in patterns]).pattern
+                regex = re.compile(rf'(?<!\w)(?:{body})')
+            self._matchers[kinds] = (regex, [table[p] for p in patterns])
+        return self._matchers[kinds]
+
+    def find_all(self, text, kinds=None):
+        """Leftmost-longest, non-overlapping canonical phrases in text
+        (compared normalised), optionally only of the given kinds.
+        Returns Match tuples with offsets into text."""
+        regex, keys = self._matcher(kinds)
+        if regex is None:
+            return []
+        norm, offsets = _normalise_with_offsets(text)
+        matches = []
+        for m in regex.finditer(norm):
+            kind, key = keys[m.lastindex - 1]
+            start, end = offsets[m.start()], offsets[m.end() - 1] + 1
+            matches.append(Match(start, end, kind, key, self.entries[kind][key]))
+        return matches
+
+    def decompose(self, text, kinds=None, separators=' .,;:\u2014\u2013-'):
+        """Split text into vocabulary matches and leftover spans.
+        Returns (matches, leftovers) — leftovers are the unmatched pieces
+        with separator punctuation stripped, empty pieces dropped."""
+        matches = self.find_all(text, kinds)
+        leftovers = []
+        pos = 0
+        for m in matches + [Match(len(text), len(text), None, None, None)]:
+            piece = text[pos:m.start].strip(separators + '\n\t')
+            if piece:
+                leftovers.append(piece)
+            pos = m.end
+        return matches, leftovers
+
+    def count_present(self, text):
+        """Distinct canonical phrases occurring anywhere in text, ignoring
+        case — substring hits, nested and overlapping phrases included."""
+        text = text.lower()
+        return sum(1 for phrase in self._folded if phrase in text)
+
+    def coverage(self, text, kinds=None):
+        """Fraction of text's word characters covered by vocabulary phrases."""
+        total = sum(1 for ch in text if ch.isalnum())
+        if not total:
+            return 1.0
+        covered = sum(1 for m in self.find_all(text, kinds)
+                      for ch in text[m.start:m.end] if ch.isalnum())
+        return covered / total
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+_INDEX = None
+
+
+def vocabulary_hash(path=VOCAB_PATH):
+    """SHA-256 of swms_vocabulary.py."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _cache_key(source_hash):
+    """Vocabulary hash plus this module's source — a changed index layout
+    never loads an old pickle."""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(source_hash.encode() + f.read()).hexdigest()
+
+
+def _cache_path(source_hash):
+    return os.path.join(CACHE_DIR, f'vocab_index.{_cache_key(source_hash)[:16]}.pickle')
+
+
+def load_index(use_cache=True):
+    """Build or load the index for the current swms_vocabulary.py."""
+    source_hash = vocabulary_hash()
+    path = _cache_path(source_hash)
+    if use_cache:
+        try:
+            with open(path, 'rb') as f:
+                version, cached = pickle.load(f)
+            if version == CACHE_VERSION and cached.source_hash == source_hash:
+                return cached
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ValueError, TypeError):
+            pass
+    index = VocabularyIndex.from_vocabulary(source_hash)
+    if use_cache:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            for name in os.listdir(CACHE_DIR):
+                if name.startswith('vocab_index.') and name.endswith('.pickle'):
+                    os.remove(os.path.join(CACHE_DIR, name))
+            tmp = f'{path}.{os.getpid()}.tmp'
+            with open(tmp, 'wb') as f:
+                pickle.dump((CACHE_VERSION, index), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+    return index
+
+
+def get_index():
+    """The process-wide VocabularyIndex (built or loaded on first call)."""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = load_index()
+    return _INDEX
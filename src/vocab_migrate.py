@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+RPD SWMS Vocabulary Migration
+Converts the raw task dicts in swms_generator.py's *_NEW dicts into
+equivalent new_task() calls, so vocabulary normalisation happens when a
+task is written rather than on every build.
+
+For each raw dict:
+  1. Hazard, engineering, admin, PPE and STOP WORK text is segmented the
+     way new_task() joins it ('. ' hazards, ' — ' controls and STOP WORK,
+     ', ' PPE; one CCVS bullet per engineering / admin item).
+  2. Segments that are exactly a canonical phrase become that key. Text
+     that only matches after case / dash / whitespace folding is noted —
+     the wording would change, so it is not substituted.
+  3. Leftover segments get proposed keys (snake_case from their content
+     words) and canonical phrases identical to the original text, with the
+     closest existing entries listed so duplicates can be merged instead.
+  4. The emitted new_task() source is parsed back, run through new_task()
+     against the vocabulary plus the proposals, and the built row text
+     (task, scope, hazard bullets, control paragraphs, risk, resp, code)
+     compared with the raw dict's. Any difference is reported as FAILED.
+
+Output is the vocabulary additions (paste into swms_vocabulary.py) and the
+new_task() entries (paste over the raw dicts). Nothing is edited in place.
+
+USAGE:
+    python src/vocab_tool.py migrate                      — every raw task
+    python src/vocab_tool.py migrate REMEDIAL_NEW epoxy_injection
+    python src/vocab_tool.py migrate -o migration.py
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import unicodedata
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, _script_dir)
+
+from vocab_index import DICT_NAMES, get_index
+
+GENERATOR_PATH = os.path.join(_script_dir, 'swms_generator.py')
+
+DEFAULT_RESP = "Supervisor / Worker / Sub-Contract Worker"
+DEFAULT_RISK_POST = "Low (2)"
+
+# new_task() joiners — hazards '. ', controls / STOP WORK em dash, PPE ', '
+JOINERS = {
+    'hazard': '. ',
+    'control': ' — ',
+    'ppe': ', ',
+    'stop_work': ' — ',
+}
+# Leftover text between canonical phrases is split at the joiner for list-
+# like fields; em dash chains keep it whole ("X — qualifier" is one control)
+SPLIT_LEFTOVERS = {'hazard': True, 'control': False, 'ppe': True, 'stop_work': False}
+
+KEY_WORDS = 4
+_STOPWORDS = frozenset(
+    'a all and are as at be by for from if in is no not of on or the to with'.split())
+
+
+# ============================================================
+# SEGMENTATION
+# ============================================================
+
+class Migration:
+    """Proposed keys and notes shared across every task migrated in one run."""
+
+    def __init__(self, index=None):
+        self.index = index or get_index()
+        self.proposals = {kind: {} for kind in DICT_NAMES}   # kind -> {phrase: key}
+        self._taken = {kind: set(self.index.entries[kind]) for kind in DICT_NAMES}
+
+    def key_for(self, kind, phrase, notes):
+        """Existing key whose canonical phrase is exactly phrase, else a
+        proposed key (reused for the same phrase across tasks)."""
+        for k, key in self.index.keys_for(phrase):
+            if k == kind:
+                return key
+        near = self.index.lookup(phrase, normalised=True)
+        if near and near[0] == kind:
+            notes.append(f"'{phrase[:50]}' folds to {self.index.ref(*near)} "
+                         f"— use the key if the wording may change")
+        if phrase not in self.proposals[kind]:
+            self.proposals[kind][phrase] = self._new_key(kind, phrase)
+        return self.proposals[kind][phrase]
+
+    def _new_key(self, kind, phrase):
+        ascii_text = unicodedata.normalize('NFKD', phrase).encode('ascii', 'ignore').decode()
+        words = [w for w in re.findall(r'[a-z0-9]+', ascii_text.lower())
+                 if w not in _STOPWORDS] or ['item']
+        base = '_'.join(words[:KEY_WORDS])
+        key, n = base, 2
+        while key in self._taken[kind]:
+            key, n = f'{base}_{n}', n + 1
+        self._taken[kind].add(key)
+        return key
+
+    def segment(self, text, kind, notes):
+        """Keys whose joined canonical phrases rebuild text, as new_task()
+        joins them for kind."""
+        joiner = JOINERS[kind]
+        keys, pos = [], 0
+        for m in self.index.find_all(text, kinds=(kind,)):
+            s, e = m.start, m.end
+            if text[s:e] != m.phrase or s < pos:
+                continue
+            if s > pos and text[s - len(joiner):s] != joiner:
+                continue
+            trailing = kind == 'hazard' and text[e:] == '.'
+            if e < len(text) and not text.startswith(joiner, e) and not trailing:
+                continue
+            if s > pos:
+                keys += self._leftovers(text[pos:s - len(joiner)], kind, notes)
+            keys.append(m.key)
+            pos = e + len(joiner) if text.startswith(joiner, e) else len(text)
+        if pos < len(text):
+            keys += self._leftovers(text[pos:], kind, notes)
+        return keys
+
+    def _leftovers(self, piece, kind, notes):
+        parts = piece.split(JOINERS[kind]) if SPLIT_LEFTOVERS[kind] else [piece]
+        keys = []
+        for part in parts:
+            if kind == 'hazard':
+                part = part.rstrip('.')   # split_hazards drops it when rendering
+            if part.strip():
+                keys.append(self.key_for(kind, part, notes))
+        return keys
+
+    # ── Task conversion ──────────────────────────────────────
+
+    def convert(self, task):
+        """(new_task keyword arguments, notes) for one raw task dict."""
+        notes = []
+        kwargs = {
+            'name': task['task'],
+            'scope': task['task_desc'],
+            'hazard_keys': self.segment(task['hazard'], 'hazard', notes),
+            'risk_pre': task['risk_pre'],
+            'risk_code': task['code'],
+        }
+        if task['type'] == 'CCVS':
+            if len(task['ppe']) != 1 or len(task['stop_work']) != 1:
+                raise ValueError("CCVS PPE and STOP WORK must be one bullet each "
+                                 "— new_task() builds a single joined item")
+            kwargs['engineering'] = [self.key_for('control', e, notes) for e in task['eng']]
+            kwargs['admin'] = [self.key_for('control', a, notes) for a in task['admin']]
+            ppe, stop = task['ppe'][0], task['stop_work'][0]
+        else:
+            sections = dict(task['control'])
+            if [label for label, _ in task['control']] != [
+                    'Engineering:', 'Admin:', 'PPE:', 'STOP WORK if:']:
+                raise ValueError("control sections are not Engineering / Admin / "
+                                 "PPE / STOP WORK if in order")
+            kwargs['engineering'] = self.segment(sections['Engineering:'], 'control', notes)
+            kwargs['admin'] = self.segment(sections['Admin:'], 'control', notes)
+            ppe, stop = sections['PPE:'], sections['STOP WORK if:']
+        kwargs['ppe_keys'] = self.segment(ppe, 'ppe', notes)
+        kwargs['stop_work_keys'] = self.segment(stop, 'stop_work', notes)
+        if task['resp'] != DEFAULT_RESP:
+            kwargs['responsibility'] = task['resp']
+        if task['risk_post'] != DEFAULT_RISK_POST:
+            kwargs['risk_post'] = task['risk_post']
+        if task['type'] == 'CCVS':
+            kwargs['ccvs'] = True
+            kwargs['hold_points'] = list(task['hold_points'])
+        return kwargs, notes
+
+    def new_keys(self, kwargs):
+        """Number of proposed (not yet in vocabulary) keys kwargs uses."""
+        fields = {'hazard_keys': 'hazard', 'engineering': 'control',
+                  'admin': 'control', 'ppe_keys': 'ppe', 'stop_work_keys': 'stop_work'}
+        return sum(1 for field, kind in fields.items() for key in kwargs[field]
+                   if key not in self.index.entries[kind])
+
+
+# ============================================================
+# ROUND TRIP
+# ============================================================
+
+@contextlib.contextmanager
+def proposed_vocabulary(proposals):
+    """Temporarily add proposed entries to swms_vocabulary's dicts."""
+    import swms_vocabulary as v
+    targets = {'hazard': v.HAZARDS, 'control': v.CONTROLS,
+               'ppe': v.PPE_ITEMS, 'stop_work': v.STOP_WORK}
+    added = []
+    for kind, phrases in proposals.items():
+        for phrase, key in phrases.items():
+            if key not in targets[kind]:
+                targets[kind][key] = ({'canonical': phrase}
+                                      if kind in ('hazard', 'control') else phrase)
+                added.append((targets[kind], key))
+    try:
+        yield
+    finally:
+        for target, key in added:
+            del target[key]
+
+
+def _builders():
+    with contextlib.redirect_stdout(io.StringIO()):
+        import build_all_swms
+    return build_all_swms
+
+
+def row_text(task):
+    """Text of every paragraph and cell a task row is built from."""
+    B = _builders()
+    paras = B.make_col0_paras(task['task'], task['task_desc'])
+    paras += [B.make_bullet_para(h, 1) for h in B.split_hazards(task['hazard'])]
+    code = task['code'].split('-')[0]
+    level = task['risk_pre'].split(' ')[0]
+    score = task['risk_pre'].split('(')[1].rstrip(')')
+    if task['type'] == 'CCVS':
+        paras += B.build_ccvs_control(
+            code, level, score, task['hold_points'], task['eng'], task['admin'],
+            task['ppe'], task['stop_work'], decimal_num_id=1, bullet_num_id=2)
+    else:
+        paras += B.build_std_control(code, level, score, task['control'])
+    return ([''.join(p.itertext()) for p in paras]
+            + [task['risk_pre'], task['risk_post'], task['resp'], task['code']])
+
+
+def format_call(task_key, kwargs):
+    """new_task() source for one *_NEW dict entry."""
+    lines = [f"    {task_key!r}: new_task("]
+    for name, value in kwargs.items():
+        if isinstance(value, list) and value:
+            lines.append(f"        {name}=[")
+            lines += [f"            {item!r}," for item in value]
+            lines.append("        ],")
+        else:
+            lines.append(f"        {name}={value!r},")
+    lines.append("    ),")
+    return '\n'.join(lines)
+
+
+def round_trip(task, source, proposals):
+    """True if the new_task() call in source builds the same row text as task."""
+    tree = ast.parse('{\n' + source + '\n}', mode='eval')
+    call = tree.body.values[0]
+    kwargs = {kw.arg: ast.literal_eval(kw.value) for kw in call.keywords}
+    B = _builders()
+    with proposed_vocabulary(proposals), contextlib.redirect_stdout(io.StringIO()):
+        built = B.new_task(**kwargs)
+    return row_text(built) == row_text(task)
+
+
+def format_proposals(migration):
+    """swms_vocabulary.py snippets for every proposed key, in the add-entry
+    format, with the closest existing entries noted."""
+    from vocab_tool import near_duplicates
+    blocks = []
+    for kind, phrases in migration.proposals.items():
+        if not phrases:
+            continue
+        dict_name = DICT_NAMES[kind]
+        lines = [f"# ── {dict_name} — {len(phrases)} proposed ──"]
+        for phrase, key in phrases.items():
+            similar = near_duplicates(dict_name, phrase)
+            if similar:
+                lines.append("    # similar: " + ', '.join(
+                    f"{key_!r} ({sim:.2f})" for sim, key_ in similar[:3]))
+            value = json.dumps(phrase, ensure_ascii=False)
+            if kind in ('hazard', 'control'):
+                lines.append(f'    "{key}": {{\n        "canonical": {value},\n    }},')
+            else:
+                lines.append(f'    "{key}": {value},')
+        blocks.append('\n'.join(lines))
+    return '\n\n'.join(blocks)
+
+
+# ============================================================
+# GENERATOR SOURCE
+# ============================================================
+
+def raw_tasks(path=GENERATOR_PATH):
+    """[(dict name, task key, line)] for every raw dict literal in the
+    module's *_NEW dicts — new_task() calls are already migrated."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    found = []
+    for node in tree.body:
+        if not (isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict)):
+            continue
+        names = [t.id for t in node.targets if isinstance(t, ast.Name)]
+        if not names or not names[0].endswith('_NEW'):
+            continue
+        for key, value in zip(node.value.keys, node.value.values):
+            if isinstance(key, ast.Constant) and isinstance(value, ast.Dict):
+                found.append((names[0], key.value, value.lineno))
+    return found
+
+
+def migrate(selectors=(), out_path=None):
+    """Convert the selected raw tasks (dict names or task keys; all if
+    empty), print the report and the code. Returns 1 if any round trip
+    failed, else 0."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import swms_generator as gen
+    selected = [t for t in raw_tasks()
+                if not selectors or t[0] in selectors or t[1] in selectors]
+    if not selected:
+        print("No raw task dicts matched — nothing to migrate.")
+        return 0
+
+    migration = Migration()
+    converted, failed = [], 0
+    print(f"\nMigrating {len(selected)} raw task dict(s) from swms_generator.py...")
+    print("=" * 70)
+    for dict_name, task_key, line in selected:
+        task = getattr(gen, dict_name)[task_key]
+        try:
+            kwargs, notes = migration.convert(task)
+        except ValueError as e:
+            print(f"  Line {line:5d} {dict_name}['{task_key}'] — SKIPPED: {e}")
+            failed += 1
+            continue
+        converted.append((dict_name, task_key, line, task, kwargs, notes))
+
+    for dict_name, task_key, line, task, kwargs, notes in converted:
+        source = format_call(task_key, kwargs)
+        ok = round_trip(task, source, migration.proposals)
+        failed += not ok
+        total = sum(len(kwargs[f]) for f in ('hazard_keys', 'engineering', 'admin',
+                                             'ppe_keys', 'stop_work_keys'))
+        new = migration.new_keys(kwargs)
+        print(f"  Line {line:5d} {dict_name}['{task_key}'] — {total - new} existing key(s), "
+              f"{new} proposed — round trip {'OK' if ok else 'FAILED'}")
+        for note in notes:
+            print(f"      note: {note}")
+
+    sections = [format_proposals(migration)]
+    current = None
+    for dict_name, task_key, _, _, kwargs, _ in converted:
+        if dict_name != current:
+            sections.append(f"# ── {dict_name} ──")
+            current = dict_name
+        sections[-1] += '\n' + format_call(task_key, kwargs)
+    code = '\n\n'.join(s for s in sections if s) + '\n'
+
+    n_proposed = sum(len(p) for p in migration.proposals.values())
+    print("\n" + "=" * 70)
+    print(f"  {len(converted)} task(s) converted, {n_proposed} new vocabulary "
+          f"key(s) proposed, {failed} failed.")
+    if out_path:
+        with open(out_path, 'w', encoding='utf-8') as f:
+            f.write(code)
+        print(f"  Vocabulary additions and new_task() entries written to {out_path}")
+    else:
+        print("\n" + code)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert raw *_NEW task dicts into new_task() calls.")
+    parser.add_argument('selectors', nargs='*',
+                        help="*_NEW dict names or task keys (default: all raw tasks)")
+    parser.add_argument('-o', '--output', metavar='PATH',
+                        help="write the proposed code to PATH instead of stdout")
+    args = parser.parse_args(argv)
+    return migrate(args.selectors, args.output)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
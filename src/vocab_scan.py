@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+RPD SWMS Vocabulary Scanner
+Finds every task definition in the repo and measures how much of its
+hazard / control / PPE / STOP WORK text is canonical vocabulary.
+
+Task sources (parsed with ast — nothing is imported or executed):
+    *.py   dict literals with 'task' and 'hazard' keys (swms_generator *_NEW
+           dicts, SWMS_BASE_GENERAL / job-file TASKS, risk registers) and
+           new_task(...) calls
+    *.md   the same, inside ```python fenced blocks (SWMS_TASK_LIBRARY.md)
+
+Field shapes understood:
+    'hazard'                         hazard text
+    'controls'                       one string with Engineering: / Admin: /
+                                     PPE: / STOP WORK if: sections
+    'control'                        [(label, text)] tuples (STD rows)
+    'eng' / 'admin' / 'ppe' / 'stop_work'
+                                     lists of strings (CCVS rows)
+    new_task(hazard_keys=, engineering=, admin=, ppe_keys=, stop_work_keys=)
+                                     keys resolved through the index,
+                                     raw strings kept as text
+Strings may be implicitly concatenated, double-quoted, escaped or built
+with get_hazard() / get_ppe() / get_stop_work() / build_engineering() /
+build_admin(). Anything else (names, f-strings) is counted as unresolved.
+Hold points are task-specific verification and are not scored.
+
+Each field is decomposed with the vocabulary index (vocab_index.py),
+limited to that field's kind. Coverage is the share of word characters
+inside canonical phrases, per task and per file.
+
+Speed: files are hashed and results cached in __pycache__/vocab_scan.json,
+keyed on the vocabulary, this module and the index / matcher code it
+uses (CACHE_SOURCES) — only changed files are parsed, across a process
+pool with -j.
+
+USAGE:
+    python src/vocab_scan.py                  — whole repo
+    python src/vocab_scan.py src/swms_generator.py --tasks
+    python src/vocab_scan.py -j 0 --no-cache --json report.json
+    python src/vocab_tool.py scan [...]       — same command
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, _script_dir)
+
+from vocab_index import CACHE_DIR, get_index
+
+REPO_ROOT = os.path.dirname(_script_dir)
+CACHE_PATH = os.path.join(CACHE_DIR, 'vocab_scan.json')
+CACHE_VERSION = 1
+
+# Modules whose code produces the cached per-file results — the scanner
+# plus the index's decompose() / normalise() and the phrase matcher
+CACHE_SOURCES = ('vocab_scan.py', 'vocab_index.py', 'phrase_matcher.py')
+
+SOURCE_EXTS = ('.py', '.md')
+SKIP_DIRS = {'__pycache__', 'outputs', 'node_modules', 'tests', 'benchmarks'}
+FIELD_KINDS = ('hazard', 'control', 'ppe', 'stop_work')
+
+# Section labels inside 'controls' strings and 'control' tuples
+LABEL_KINDS = {
+    'engineering': 'control',
+    'admin': 'control',
+    'ppe': 'ppe',
+    'stop work': 'stop_work',
+    'stop work if': 'stop_work',
+    'stop-work': 'stop_work',
+}
+_LABEL_RE = re.compile(r'\b(Engineering|Admin|PPE|STOP[ -]WORK(?: if)?)\s*:')
+_FENCE_RE = re.compile(r'^```python[ \t]*\n(.*?)^```', re.M | re.S)
+
+# Vocabulary resolver calls: name -> (kind, joiner)
+RESOLVERS = {
+    'get_hazard': ('hazard', '. '),
+    'get_control': ('control', ' — '),
+    'get_ppe': ('ppe', ', '),
+    'get_stop_work': ('stop_work', ' — '),
+    'build_engineering': ('control', ' — '),
+    'build_admin': ('control', ' — '),
+}
+
+# new_task keyword -> (kind, joiner, keys only)
+NEW_TASK_FIELDS = {
+    'hazard_keys': ('hazard', '. ', True),
+    'engineering': ('control', ' — ', False),
+    'admin': ('control', ' — ', False),
+    'ppe_keys': ('ppe', ', ', True),
+    'stop_work_keys': ('stop_work', ' — ', True),
+}
+
+
+class Unresolved(Exception):
+    """A field value that is not a constant string expression."""
+
+
+# ============================================================
+# FIELD RESOLUTION
+# ============================================================
+
+def _call_name(node):
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+def _vocab_text(kind, item, index, unknown):
+    """Canonical phrase for a vocabulary key; raw strings pass through.
+    Keys that look like keys but are missing go to unknown."""
+    entries = index.entries[kind]
+    if item in entries:
+        return entries[item]
+    if re.fullmatch(r'[a-z0-9_]+', item):
+        unknown.append([kind, item])
+    return item
+
+
+def resolve(node, index, unknown):
+    """Constant value of an expression node: str, or list of resolved
+    values. Raises Unresolved for anything that is not constant."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [resolve(elt, index, unknown) for elt in node.elts]
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left, right = resolve(node.left, index, unknown), resolve(node.right, index, unknown)
+        if isinstance(left, type(right)):
+            return left + right
+    if isinstance(node, ast.Call) and _call_name(node) in RESOLVERS and not node.keywords:
+        kind, joiner = RESOLVERS[_call_name(node)]
+        items = [resolve(arg, index, unknown) for arg in node.args]
+        if all(isinstance(item, str) for item in items):
+            return joiner.join(_vocab_text(kind, item, index, unknown) for item in items)
+    raise Unresolved(ast.dump(node)[:60])
+
+
+def _flatten(value):
+    """Strings in a resolved value, depth first."""
+    if isinstance(value, str):
+        return [value]
+    return [s for item in value for s in _flatten(item)]
+
+
+def split_controls(text):
+    """[(kind, section text)] for a 'controls' string — the text after each
+    Engineering: / Admin: / PPE: / STOP WORK if: label up to the next one.
+    Text before the first label (the code header) is not scored."""
+    sections = []
+    found = list(_LABEL_RE.finditer(text))
+    for i, m in enumerate(found):
+        end = found[i + 1].start() if i + 1 < len(found) else len(text)
+        kind = LABEL_KINDS.get(m.group(1).lower())
+        if kind:
+            sections.append((kind, text[m.end():end]))
+    return sections
+
+
+def dict_fields(node, index, unknown):
+    """({kind: [text]}, unresolved count, task name) for a task dict literal.
+    Returns None when 'task' or 'hazard' is not constant — a row builder
+    assembling a dict (new_task itself), not a task definition."""
+    fields = {kind: [] for kind in FIELD_KINDS}
+    unresolved = 0
+    name = ''
+    for key_node, value_node in zip(node.keys, node.values):
+        if not (isinstance(key_node, ast.Constant) and isinstance(key_node.value, str)):
+            continue
+        key = key_node.value
+        if key not in ('task', 'hazard', 'controls', 'control',
+                       'eng', 'admin', 'ppe', 'stop_work'):
+            continue
+        try:
+            value = resolve(value_node, index, unknown)
+        except Unresolved:
+            if key in ('task', 'hazard'):
+                return None
+            unresolved += 1
+            continue
+        if key == 'task':
+            name = _flatten(value)[0] if _flatten(value) else ''
+        elif key == 'hazard':
+            fields['hazard'].extend(_flatten(value))
+        elif key == 'controls':
+            for text in _flatten(value):
+                for kind, section in split_controls(text):
+                    fields[kind].append(section)
+        elif key == 'control':
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, list) and len(item) == 2 and isinstance(item[0], str):
+                    kind = LABEL_KINDS.get(item[0].rstrip(': ').lower())
+                    if kind:
+                        fields[kind].extend(_flatten(item[1]))
+                else:
+                    for text in _flatten(item):
+                        for kind, section in split_controls(text):
+                            fields[kind].append(section)
+        else:
+            kind = {'eng': 'control', 'admin': 'control'}.get(key, key)
+            fields[kind].extend(_flatten(value))
+    return fields, unresolved, name
+
+
+def new_task_fields(node, index, unknown):
+    """({kind: [text]}, unresolved count, task name) for a new_task() call."""
+    fields = {kind: [] for kind in FIELD_KINDS}
+    unresolved = 0
+    name = ''
+    for kw in node.keywords:
+        if kw.arg == 'name':
+            try:
+                name = _flatten(resolve(kw.value, index, unknown))[0]
+            except (Unresolved, IndexError):
+                pass
+            continue
+        if kw.arg not in NEW_TASK_FIELDS:
+            continue
+        kind, joiner, keys_only = NEW_TASK_FIELDS[kw.arg]
+        try:
+            items = _flatten(resolve(kw.value, index, unknown))
+        except Unresolved:
+            unresolved += 1
+            continue
+        if keys_only:
+            # One joined string, as new_task() builds it
+            fields[kind].append(joiner.join(
+                _vocab_text(kind, item, index, unknown) for item in items))
+        else:
+            fields[kind].extend(_vocab_text(kind, item, index, unknown) for item in items)
+    return fields, unresolved, name
+
+
+# ============================================================
+# SCORING
+# ============================================================
+
+def _word_chars(text):
+    return sum(1 for ch in text if ch.isalnum())
+
+
+def score_fields(fields, index):
+    """{kind: {'covered', 'total', 'leftovers'}} for the non-empty fields."""
+    scores = {}
+    for kind, texts in fields.items():
+        covered = total = 0
+        leftovers = []
+        for text in texts:
+            matches, rest = index.decompose(text, kinds=(kind,))
+            total += _word_chars(text)
+            covered += sum(_word_chars(text[m.start:m.end]) for m in matches)
+            leftovers.extend(rest)
+        if total:
+            scores[kind] = {'covered': covered, 'total': total, 'leftovers': leftovers}
+    return scores
+
+
+def _is_task_dict(node):
+    keys = {k.value for k in node.keys
+            if isinstance(k, ast.Constant) and isinstance(k.value, str)}
+    return 'task' in keys and 'hazard' in keys
+
+
+def scan_tree(tree, index, line_offset=0):
+    """Task results for every task dict and new_task() call in tree."""
+    tasks = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Dict) and _is_task_dict(node):
+            style, extract = 'dict', dict_fields
+        elif (isinstance(node, ast.Call) and _call_name(node) == 'new_task'
+              and any(kw.arg == 'name' for kw in node.keywords)):
+            # new_task(**kwargs) forwarding calls are not definitions
+            style, extract = 'new_task', new_task_fields
+        else:
+            continue
+        unknown = []
+        extracted = extract(node, index, unknown)
+        if extracted is None:
+            continue
+        fields, unresolved, name = extracted
+        tasks.append({
+            'line': node.lineno + line_offset,
+            'name': ' '.join(name.split('\n')[0].split()),
+            'style': style,
+            'fields': score_fields(fields, index),
+            'unresolved': unresolved,
+            'unknown_keys': unknown,
+        })
+    tasks.sort(key=lambda t: t['line'])
+    return tasks
+
+
+def python_blocks(text):
+    """(first line number - 1, source) for each ```python fenced block."""
+    for m in _FENCE_RE.finditer(text):
+        yield text.count('\n', 0, m.start(1)), m.group(1)
+
+
+def scan_source(text, path, index=None):
+    """{'tasks', 'errors'} for one file's text."""
+    index = index or get_index()
+    tasks, errors = [], []
+    if path.endswith('.md'):
+        sources = list(python_blocks(text)) if '```python' in text else []
+    else:
+        sources = [(0, text)]
+    for offset, source in sources:
+        if 'hazard' not in source:
+            continue   # no task definitions — skip the parse
+        try:
+            tree = ast.parse(source, filename=path)
+        except SyntaxError as e:
+            errors.append(f"line {(e.lineno or 0) + offset}: {e.msg}")
+            continue
+        tasks.extend(scan_tree(tree, index, offset))
+    return {'tasks': tasks, 'errors': errors}
+
+
+def _scan_file(path):
+    """Pool worker: (path, sha256, result)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    sha = hashlib.sha256(data).hexdigest()
+    return path, sha, scan_source(data.decode('utf-8', errors='replace'), path)
+
+
+# ============================================================
+# FILES AND CACHE
+# ============================================================
+
+def discover(paths=None):
+    """Sorted task-source paths under paths (files or directories);
+    default the whole repo. Hidden directories, outputs and test /
+    benchmark fixtures are skipped."""
+    found = set()
+    for item in paths or [REPO_ROOT]:
+        if os.path.isfile(item):
+            found.add(os.path.abspath(item))
+            continue
+        for root, dirs, files in os.walk(item):
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in SKIP_DIRS]
+            found.update(os.path.abspath(os.path.join(root, f))
+                         for f in files if f.endswith(SOURCE_EXTS))
+    return sorted(found)
+
+
+def _cache_key(index):
+    """SHA-256 over the vocabulary hash and CACHE_SOURCES."""
+    h = hashlib.sha256((index.source_hash or '').encode())
+    for filename in CACHE_SOURCES:
+        h.update(filename.encode('utf-8'))
+        with open(os.path.join(_script_dir, filename), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _load_cache(key):
+    try:
+        with open(CACHE_PATH, encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == CACHE_VERSION and cache.get('key') == key:
+            return cache['files']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def _save_cache(key, files):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f'{CACHE_PATH}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'key': key, 'files': files}, f)
+        os.replace(tmp, CACHE_PATH)
+    except OSError:
+        pass
+
+
+def _file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def scan_files(paths, jobs=1, use_cache=True):
+    """Scan every path. Returns ({path: result}, stats) — results in paths
+    order; stats counts parsed and cached files."""
+    index = get_index()
+    key = _cache_key(index)
+    cache = _load_cache(key) if use_cache else {}
+    results, stale = {}, []
+    for path in paths:
+        entry = cache.get(path)
+        if entry and entry['sha'] == _file_hash(path):
+            results[path] = entry['result']
+        else:
+            stale.append(path)
+    if jobs <= 1 or len(stale) <= 1:
+        scanned = [_scan_file(path) for path in stale]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(stale))) as pool:
+            scanned = list(pool.map(_scan_file, stale, chunksize=4))
+    for path, sha, result in scanned:
+        results[path] = result
+        cache[path] = {'sha': sha, 'result': result}
+    if use_cache and stale:
+        _save_cache(key, cache)
+    stats = {'files': len(paths), 'parsed': len(stale), 'cached': len(paths) - len(stale)}
+    return {path: results[path] for path in paths}, stats
+
+
+# ============================================================
+# REPORT
+# ============================================================
+
+def coverage(fields_list):
+    """Covered / total word characters over a list of task 'fields'."""
+    covered = sum(f['covered'] for fields in fields_list for f in fields.values())
+    total = sum(f['total'] for fields in fields_list for f in fields.values())
+    return covered / total if total else 1.0
+
+
+def _pct(fields):
+    return f"{fields['covered'] / fields['total'] * 100:3.0f}%"
+
+
+def print_report(results, stats, elapsed, show_tasks=False, root=REPO_ROOT):
+    total_tasks = vocab_tasks = 0
+    all_fields = []
+    print(f"\nScanning {stats['files']} file(s) for task definitions "
+          f"({stats['parsed']} parsed, {stats['cached']} cached, {elapsed:.2f} s)")
+    print("=" * 70)
+    for path, result in results.items():
+        tasks = result['tasks']
+        rel = os.path.relpath(path, root)
+        if not tasks and not result['errors']:
+            continue
+        n_vocab = sum(1 for t in tasks if t['style'] == 'new_task')
+        total_tasks += len(tasks)
+        vocab_tasks += n_vocab
+        fields = [t['fields'] for t in tasks]
+        all_fields.extend(fields)
+        print(f"\n  {rel} — {len(tasks)} task(s), {n_vocab} vocabulary-based, "
+              f"coverage {coverage(fields) * 100:.0f}%")
+        for error in result['errors']:
+            print(f"    skipped code block — {error}")
+        if not show_tasks:
+            continue
+        for t in tasks:
+            kinds = '  '.join(f"{kind} {_pct(t['fields'][kind])}"
+                              for kind in FIELD_KINDS if kind in t['fields'])
+            style = 'vocab' if t['style'] == 'new_task' else 'raw'
+            print(f"    Line {t['line']:5d} [{style:5s}] {t['name'][:44]:<44s} {kinds}")
+            for kind, key in t['unknown_keys']:
+                print(f"               unknown {kind} key: '{key}'")
+            if t['unresolved']:
+                print(f"               {t['unresolved']} field(s) not constant — not scored")
+            for kind in FIELD_KINDS:
+                for text in t['fields'].get(kind, {}).get('leftovers', []):
+                    if _word_chars(text) >= 30:
+                        print(f"               raw {kind}: {text[:70]}...")
+
+    print("\n" + "=" * 70)
+    print(f"  Task definitions: {vocab_tasks} vocabulary-based, "
+          f"{total_tasks - vocab_tasks} raw ({total_tasks} total)")
+    print(f"  Vocabulary coverage: {coverage(all_fields) * 100:.0f}% of hazard / "
+          f"control / PPE / STOP WORK text")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Scan task definitions for vocabulary coverage.")
+    parser.add_argument('paths', nargs='*',
+                        help="files or directories (default: the whole repo)")
+    parser.add_argument('--tasks', action='store_true',
+                        help="per-task coverage and raw strings")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="parse in N worker processes (0 = one per CPU, default 1)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore and do not update the per-file cache")
+    parser.add_argument('--json', metavar='PATH',
+                        help="write the full results as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    start = time.perf_counter()
+    results, stats = scan_files(discover(args.paths), jobs=jobs,
+                                use_cache=not args.no_cache)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        data = json.dumps({os.path.relpath(p, REPO_ROOT): r for p, r in results.items()},
+                          indent=2, ensure_ascii=False) + "\n"
+        if args.json == '-':
+            sys.stdout.write(data)
+            return 0
+        with open(args.json, 'w', encoding='utf-8') as f:
+            f.write(data)
+    print_report(results, stats, elapsed, show_tasks=args.tasks)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,18 +12,29 @@ Commands:
   python src/vocab_tool.py add ppe          — interactive: add new PPE item
   python src/vocab_tool.py add stopwork     — interactive: add new STOP WORK
   python src/vocab_tool.py check "text"     — scan text for variant phrases
-  python src/vocab_tool.py scan             — scan swms_generator.py for raw strings
+  python src/vocab_tool.py scan [paths] [--tasks] [-j N]
+                                            — vocabulary coverage of every task
+                                              definition (vocab_scan.py)
+  python src/vocab_tool.py migrate [NAMES] [-o out.py]
+                                            — raw *_NEW task dicts as new_task()
+                                              calls + proposed keys (vocab_migrate.py)
+  python src/vocab_tool.py dedupe [hazards|controls|ppe|stopwork] [--threshold 0.4]
+                                            — near-duplicate phrase clusters
 """
 
+import hashlib
 import sys
 import os
 import re
+import time
 
 # Ensure src/ is on path
 _script_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, _script_dir)
 
 from swms_vocabulary import HAZARDS, CONTROLS, PPE_ITEMS, STOP_WORK
+from vocab_index import DICT_NAMES, get_index, normalise
+import vocab_scan
 
 
 # ============================================================
@@ -111,6 +122,8 @@ def add_entry(dict_name, dict_obj):
             f'    }},'
         )
 
+    warn_near_duplicates(dict_name, value)
+
     print(f"\nAdd this to swms_vocabulary.py in the {dict_name} dict:\n")
     print(snippet)
     print()
@@ -212,22 +225,9 @@ def check_text(text):
             print(f"    USE:  {suggestion}")
             found += 1
 
-    # Also check against all canonical phrases for near-matches
-    all_canonicals = {}
-    for key, val in HAZARDS.items():
-        all_canonicals[val["canonical"].lower()] = f"HAZARDS['{key}']"
-    for key, val in CONTROLS.items():
-        all_canonicals[val["canonical"].lower()] = f"CONTROLS['{key}']"
-    for key, val in PPE_ITEMS.items():
-        all_canonicals[val.lower()] = f"PPE_ITEMS['{key}']"
-    for key, val in STOP_WORK.items():
-        all_canonicals[val.lower()] = f"STOP_WORK['{key}']"
-
-    # Check if text contains any canonical phrases (good sign)
-    matches = 0
-    for canonical, source in all_canonicals.items():
-        if canonical in text_lower:
-            matches += 1
+    # Check if text contains any canonical phrases (good sign) — every
+    # distinct phrase that occurs anywhere in the text, ignoring case
+    matches = get_index().count_present(text)
 
     if found == 0:
         print("  No variant phrases detected.")
@@ -241,82 +241,236 @@ def check_text(text):
 
 def scan_generator():
     """Scan swms_generator.py for raw strings not in vocabulary."""
-    gen_path = os.path.join(_script_dir, 'swms_generator.py')
-    if not os.path.exists(gen_path):
-        print("Cannot find swms_generator.py")
-        return
-
-    with open(gen_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    scan([os.path.join(_script_dir, 'swms_generator.py'), '--tasks'])
 
-    print("\nScanning swms_generator.py for raw strings...")
-    print("=" * 70)
 
-    # Build sets of all canonical phrases
-    all_canonical = set()
-    for val in HAZARDS.values():
-        all_canonical.add(val["canonical"])
-    for val in CONTROLS.values():
-        all_canonical.add(val["canonical"])
-    for val in PPE_ITEMS.values():
-        all_canonical.add(val)
-    for val in STOP_WORK.values():
-        all_canonical.add(val)
-
-    # Find all string literals in task dicts that look like control text
-    # Pattern: 'key': 'long text string' (longer than 30 chars = likely control text)
-    raw_strings = []
-    in_dict = False
-    for line_no, line in enumerate(content.split('\n'), 1):
-        stripped = line.strip()
-
-        # Track when we're inside a *_NEW dict
-        if re.match(r'^[A-Z_]+_NEW\s*=\s*\{', stripped):
-            in_dict = True
-        if in_dict and stripped == '}':
-            in_dict = False
-
-        if not in_dict:
-            continue
+def scan(argv=()):
+    """AST scan of every task source for vocabulary coverage —
+    see vocab_scan.py for the options."""
+    return vocab_scan.main(list(argv))
 
-        # Skip new_task() calls — those use vocabulary
-        if 'new_task(' in stripped:
-            continue
 
-        # Find string values in tuples like ('Engineering:', 'text...')
-        tuple_match = re.search(r"\('(?:Engineering|Admin|PPE|STOP WORK)[^']*',\s*'([^']{30,})'", line)
-        if tuple_match:
-            text = tuple_match.group(1)
-            # Check if it's a known canonical
-            if text not in all_canonical:
-                raw_strings.append((line_no, 'control', text[:80]))
-                continue
-
-        # Find 'hazard': 'text...' patterns
-        hazard_match = re.search(r"'hazard':\s*'([^']{30,})'", line)
-        if hazard_match:
-            text = hazard_match.group(1)
-            raw_strings.append((line_no, 'hazard', text[:80]))
-
-    if raw_strings:
-        print(f"\n  {len(raw_strings)} raw string(s) found (not using vocabulary):\n")
-        for line_no, stype, text in raw_strings:
-            print(f"  Line {line_no:4d} [{stype:8s}] {text}...")
-        print(f"\n  Consider converting these to use new_task() with vocabulary keys.")
-    else:
-        print("  All task definitions use vocabulary — no raw strings found.")
+# ============================================================
+# DEDUPE COMMAND
+# ============================================================
+# Near-duplicate detection without pairwise comparison: every phrase is
+# reduced to shingles (character 4-grams of the normalised phrase plus its
+# content words), a MinHash signature of those shingles, and LSH buckets of
+# the signature. Only phrases sharing a bucket are compared, by exact
+# Jaccard similarity of their shingle sets.
+#
+# Signatures use one-permutation hashing — one hash per shingle, binned by
+# its top bits, min per bin, empty bins filled from the next non-empty bin
+# — so building them is linear in the number of shingles. Shingles are
+# hashed with keyed BLAKE2b, not the per-process randomised str hash, so
+# the same vocabulary gives the same candidates on every run.
+#
+# Bands of 2 rows: a pair at the 0.4 threshold shares a band with
+# probability 1 - (1 - 0.4**2)**64 > 0.9999 (0.997 at 0.3). Candidates are
+# re-scored by exact Jaccard, so the extra low-similarity candidates only
+# cost a set intersection each.
+
+DEDUPE_THRESHOLD = 0.4
+SHINGLE_CHARS = 4
+MINHASH_BINS = 128
+LSH_BANDS = 64              # 64 bands x 2 rows — near-full recall at 0.4
+_BIN_SHIFT = 64 - 7         # top 7 bits of the 64-bit hash pick one of 128 bins
+_BIN_MASK = (1 << _BIN_SHIFT) - 1
+
+_STOPWORDS = frozenset(
+    'a all and are as at be by for from if in is no not of on or the to with'.split())
+
+_KIND_BY_DICT = {name: kind for kind, name in DICT_NAMES.items()}
+
+DEDUPE_TARGETS = {
+    'hazards': 'hazard', 'controls': 'control',
+    'ppe': 'ppe', 'stopwork': 'stop_work',
+}
 
-    # Count vocab vs raw tasks
-    # Simple heuristic: count new_task() calls vs raw dict definitions
-    new_task_count = content.count('new_task(')
-    raw_dict_count = content.count("'type': 'STD'") + content.count("'type': 'CCVS'")
-    total = new_task_count + raw_dict_count
 
-    print(f"\n  Task definitions: {new_task_count} vocabulary-based, "
-          f"{raw_dict_count} raw dicts ({total} total)")
-    if raw_dict_count > 0:
-        pct = (new_task_count / total * 100) if total > 0 else 0
-        print(f"  Vocabulary coverage: {pct:.0f}%")
+def shingles(phrase):
+    """Character 4-grams of the normalised phrase plus its content words."""
+    text = normalise(phrase)
+    n = SHINGLE_CHARS
+    grams = {text[i:i + n] for i in range(max(len(text) - n + 1, 1))}
+    grams.update('w:' + w for w in re.findall(r'\w+', text) if w not in _STOPWORDS)
+    return grams
+
+
+def _gram_hash(gram, salt):
+    """Stable 64-bit hash of one shingle."""
+    digest = hashlib.blake2b(gram.encode('utf-8'), digest_size=8,
+                             salt=salt).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def minhash(grams, seed=0):
+    """One-permutation MinHash signature (MINHASH_BINS values).
+    seed selects an independent hash family (same seed, same signature)."""
+    salt = seed.to_bytes(16, 'big')
+    bins = [None] * MINHASH_BINS
+    for gram in grams:
+        h = _gram_hash(gram, salt)
+        b, v = h >> _BIN_SHIFT, h & _BIN_MASK
+        if bins[b] is None or v < bins[b]:
+            bins[b] = v
+    if None in bins:
+        # Densify: an empty bin borrows the next non-empty bin's value,
+        # offset by the distance so borrowed values stay bin-specific
+        for i in range(MINHASH_BINS):
+            if bins[i] is None:
+                for step in range(1, MINHASH_BINS):
+                    v = bins[(i + step) % MINHASH_BINS]
+                    if v is not None:
+                        bins[i] = v + step * (_BIN_MASK + 1)
+                        break
+    return tuple(bins)
+
+
+def jaccard(a, b):
+    if not (a or b):
+        return 1.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class MinHashLSH:
+    """LSH index of phrase signatures: add() phrases, then pairs() for
+    candidate duplicates across the index or query() for one new phrase."""
+
+    def __init__(self, threshold=DEDUPE_THRESHOLD, bands=LSH_BANDS, seed=0):
+        self.threshold = threshold
+        self.rows = MINHASH_BINS // bands
+        self.bands = bands
+        self.seed = seed
+        self.shingles = {}
+        self.phrases = {}
+        self.buckets = {}
+
+    def _bands(self, signature):
+        r = self.rows
+        return [(b, signature[b * r:(b + 1) * r]) for b in range(self.bands)]
+
+    def add(self, key, phrase):
+        grams = shingles(phrase)
+        self.shingles[key] = grams
+        self.phrases[key] = phrase
+        for band in self._bands(minhash(grams, self.seed)):
+            self.buckets.setdefault(band, []).append(key)
+
+    def query(self, phrase):
+        """[(similarity, key)] of indexed phrases at or above threshold,
+        most similar first."""
+        grams = shingles(phrase)
+        candidates = set()
+        for band in self._bands(minhash(grams, self.seed)):
+            candidates.update(self.buckets.get(band, ()))
+        scored = [(jaccard(grams, self.shingles[k]), k) for k in candidates]
+        return sorted((s for s in scored if s[0] >= self.threshold),
+                      key=lambda s: (-s[0], s[1]))
+
+    def pairs(self):
+        """{(key_a, key_b): similarity} for every candidate pair at or
+        above threshold."""
+        seen, found = set(), {}
+        for keys in self.buckets.values():
+            for i, a in enumerate(keys):
+                for b in keys[i + 1:]:
+                    pair = (a, b) if a <= b else (b, a)
+                    if a == b or pair in seen:
+                        continue
+                    seen.add(pair)
+                    sa, sb = self.shingles[a], self.shingles[b]
+                    # Jaccard can't exceed the size ratio — skip the set work
+                    if min(len(sa), len(sb)) < self.threshold * max(len(sa), len(sb)):
+                        continue
+                    sim = jaccard(sa, sb)
+                    if sim >= self.threshold:
+                        found[pair] = sim
+        return found
+
+
+def duplicate_clusters(phrases, threshold=DEDUPE_THRESHOLD):
+    """Group {key: phrase} into near-duplicate clusters.
+    Returns [(keys, [(similarity, key_a, key_b)])], largest first."""
+    lsh = MinHashLSH(threshold)
+    for key, phrase in phrases.items():
+        lsh.add(key, phrase)
+    pairs = lsh.pairs()
+
+    parent = {}
+
+    def find(k):
+        while parent.get(k, k) != k:
+            k = parent[k]
+        return k
+
+    for a, b in pairs:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+    clusters = {}
+    for a, b in pairs:
+        clusters.setdefault(find(a), []).append((pairs[(a, b)], a, b))
+    result = []
+    for scored in clusters.values():
+        keys = sorted({k for _, a, b in scored for k in (a, b)})
+        result.append((keys, sorted(scored, reverse=True)))
+    return sorted(result, key=lambda c: (-len(c[0]), -c[1][0][0], c[0]))
+
+
+def near_duplicates(dict_name, phrase, threshold=DEDUPE_THRESHOLD):
+    """[(similarity, key)] of entries in dict_name similar to phrase."""
+    lsh = MinHashLSH(threshold)
+    for key, existing in get_index().entries[_KIND_BY_DICT[dict_name]].items():
+        lsh.add(key, existing)
+    return lsh.query(phrase)
+
+
+def warn_near_duplicates(dict_name, phrase):
+    """Print a warning listing near-duplicates of phrase before it is added."""
+    similar = near_duplicates(dict_name, phrase)
+    if not similar:
+        return
+    entries = get_index().entries[_KIND_BY_DICT[dict_name]]
+    print(f"\nWARNING: {len(similar)} near-duplicate(s) already in {dict_name}:")
+    for sim, key in similar[:5]:
+        existing = entries[key]
+        display = existing[:60] + "..." if len(existing) > 60 else existing
+        print(f"  {sim:.2f}  {key:<35s} {display}")
+    print("  Use the existing key if it means the same thing.")
+
+
+def dedupe(targets=None, threshold=DEDUPE_THRESHOLD):
+    """Report near-duplicate clusters in each vocabulary dict."""
+    index = get_index()
+    kinds = [DEDUPE_TARGETS[t] for t in targets] if targets else list(DEDUPE_TARGETS.values())
+    start = time.perf_counter()
+    report = [(kind, duplicate_clusters(index.entries[kind], threshold))
+              for kind in kinds]
+    elapsed = time.perf_counter() - start
+    total = sum(len(index.entries[kind]) for kind in kinds)
+    found = sum(len(clusters) for _, clusters in report)
+
+    print(f"\nNear-duplicate scan — {total} phrases, similarity >= {threshold:.2f}")
+    print("=" * 70)
+    for kind, clusters in report:
+        if not clusters:
+            continue
+        entries = index.entries[kind]
+        print(f"\n  {DICT_NAMES[kind]} — {len(clusters)} cluster(s)")
+        for keys, scored in clusters:
+            print()
+            for key in keys:
+                phrase = entries[key]
+                display = phrase[:70] + "..." if len(phrase) > 70 else phrase
+                print(f"    {key:<35s} {display}")
+            for sim, a, b in scored:
+                print(f"      {sim:.2f}  {a} ~ {b}")
+    print(f"\n  {found} cluster(s) found in {elapsed * 1000:.0f} ms.")
+    if found:
+        print("  Merge duplicates into one key, or reword entries that mean different things.")
+    return report
 
 
 # ============================================================
@@ -377,7 +531,30 @@ if __name__ == '__main__':
         check_text(text)
 
     elif cmd == 'scan':
-        scan_generator()
+        sys.exit(scan(sys.argv[2:]))
+
+    elif cmd == 'migrate':
+        import vocab_migrate
+        sys.exit(vocab_migrate.main(sys.argv[2:]))
+
+    elif cmd == 'dedupe':
+        args = sys.argv[2:]
+        threshold = DEDUPE_THRESHOLD
+        if '--threshold' in args:
+            i = args.index('--threshold')
+            try:
+                threshold = float(args[i + 1])
+            except (IndexError, ValueError):
+                print("Usage: vocab_tool.py dedupe [hazards|controls|ppe|stopwork] [--threshold 0.4]")
+                sys.exit(1)
+            del args[i:i + 2]
+        targets = [t.lower() for t in args]
+        unknown = [t for t in targets if t not in DEDUPE_TARGETS]
+        if unknown:
+            print(f"Unknown dedupe target: {unknown[0]}")
+            print("Options: hazards, controls, ppe, stopwork")
+            sys.exit(1)
+        dedupe(targets, threshold)
 
     else:
         print(f"Unknown command: {cmd}")
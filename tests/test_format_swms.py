@@ -0,0 +1,99 @@
+"""
+Golden test for format_swms on complete generated documents.
+
+The golden counts and body digests were captured from the per-rule
+functions at the baseline commit, where each rule walked the whole
+document on its own. The single-pass engine must format every paragraph
+of a real document (screed: 587 paragraphs, 22smith: 628) identically.
+
+Regenerate (only when the formatting is meant to change):
+    python3 tests/test_format_swms.py
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+
+import pytest
+from lxml import etree
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import format_swms                                # noqa: E402
+import swms_22smith_spalling                      # noqa: E402
+import swms_screed_pump                           # noqa: E402
+from SWMS_BASE_GENERAL import _build_document     # noqa: E402
+
+TEMPLATE = os.path.join(ROOT, "docs", "SWMS_Template.docx")
+GOLDEN_PATH = os.path.join(HERE, "golden", "format_swms.json")
+
+JOBS = {
+    "screed": swms_screed_pump,
+    "22smith": swms_22smith_spalling,
+}
+
+# The baseline format_swms() call sequence
+PER_RULE = [
+    ("p2_normalise", format_swms.normalise_p2_respirator),
+    ("em_dashes", format_swms.bold_em_dashes),
+    ("fonts", format_swms.standardise_fonts),
+    ("labels", format_swms.bold_control_labels),
+    ("sub_labels", format_swms.bold_sub_labels),
+    ("italic_desc", format_swms.italic_bracketed_descriptions),
+    ("emergency", format_swms.highlight_emergency_response),
+]
+
+
+def _document(job_name):
+    """Populate the template for a job, unformatted."""
+    job = JOBS[job_name]
+    with contextlib.redirect_stdout(io.StringIO()):
+        doc, _ = _build_document(
+            TEMPLATE, job.TASKS, job.PROJECT, job.PPE_CONTENT,
+            job.PERMITS_CONTENT, job.QUALS_CONTENT, job.PLANT_CONTENT,
+            job.SUBSTANCES_CONTENT, job.LEGISLATION_APPEND, bullets=False,
+        )
+    return doc
+
+
+def _digest(doc):
+    return hashlib.sha256(
+        etree.tostring(doc.element.body, encoding="UTF-8")).hexdigest()
+
+
+def _formatted(job_name):
+    """{'counts': format_swms counts, 'body_sha256': digest of the body}."""
+    doc = _document(job_name)
+    counts = format_swms.format_swms(doc)
+    return {"counts": counts, "body_sha256": _digest(doc)}
+
+
+def _golden():
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("job_name", sorted(JOBS))
+def test_format_swms_matches_golden(job_name):
+    assert _formatted(job_name) == _golden()[job_name]
+
+
+def test_per_rule_functions_match_golden():
+    doc = _document("screed")
+    counts = {key: rule(doc) for key, rule in PER_RULE}
+    golden = _golden()["screed"]
+    assert counts == golden["counts"]
+    assert _digest(doc) == golden["body_sha256"]
+
+
+if __name__ == "__main__":
+    golden = {job_name: _formatted(job_name) for job_name in sorted(JOBS)}
+    with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+        json.dump(golden, f, indent=2)
+        f.write("\n")
+    print(f"  ✓ {GOLDEN_PATH}")
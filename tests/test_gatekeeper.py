@@ -0,0 +1,88 @@
+"""
+Request checks for gatekeeper serve: output names and TEMPLATE must stay
+inside the configured directories, and a broken worker pool answers 503.
+"""
+
+import json
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import gatekeeper                                 # noqa: E402
+
+TEMPLATE = os.path.join(ROOT, "docs", "SWMS_Template.docx")
+
+
+def _body(**project):
+    project = dict({"title_prefix": "Test", "output_standard": "Test_Standard",
+                    "output_ccvs": "Test_CCVS"}, **project)
+    return {"PROJECT": project, "TASKS": [{"task": "Test"}],
+            **{key: [] for key in gatekeeper.REQUIREMENT_KEYS}}
+
+
+class _BrokenPool:
+    def submit(self, *args):
+        raise BrokenProcessPool("a child process terminated abruptly")
+
+
+@pytest.fixture
+def server(tmp_path):
+    srv = gatekeeper.GatekeeperServer(("127.0.0.1", 0), _BrokenPool(), 1,
+                                      str(tmp_path), TEMPLATE, False)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _post(server, body):
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{server.server_port}/generate",
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+@pytest.mark.parametrize("name", ["../../../tmp/escape_std", "sub/name",
+                                  "..", "", "/tmp/abs"])
+def test_output_path_rejects_traversal(tmp_path, name):
+    with pytest.raises(ValueError):
+        gatekeeper.output_path(str(tmp_path), name)
+
+
+def test_output_path_plain_name(tmp_path):
+    assert (gatekeeper.output_path(str(tmp_path), "SWMS_[Job]_Standard")
+            == os.path.join(str(tmp_path), "SWMS_[Job]_Standard.docx"))
+
+
+def test_generate_rejects_escaping_output_name(server):
+    status, reply = _post(server, _body(output_ccvs="../../../tmp/escape_ccvs"))
+    assert status == 400
+    assert "plain file name" in reply["error"]
+
+
+def test_generate_rejects_template_outside_template_dir(server):
+    body = dict(_body(), TEMPLATE="../src/outputs/other.docx")
+    status, reply = _post(server, body)
+    assert status == 400
+    assert "TEMPLATE" in reply["error"]
+
+
+def test_broken_pool_is_503(server):
+    status, reply = _post(server, _body())
+    assert status == 503
+    assert "Worker pool unavailable" in reply["error"]
@@ -0,0 +1,72 @@
+"""
+NumberingRegistry: counter allocation, flush order matching the old
+one-at-a-time inserts, format lookups, opt-in abstractNum dedupe and the
+shared list strategy.
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+from lxml import etree
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import build_all_swms as B                    # noqa: E402
+from docx.oxml.ns import qn                       # noqa: E402
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _numbering():
+    numbering = etree.Element(qn("w:numbering"), nsmap={"w": W})
+    numbering.append(B.create_bullet_abstract_num(3))
+    numbering.append(B.create_decimal_abstract_num(7))
+    numbering.append(B.create_num_elem(4, 3))
+    numbering.append(B.create_num_elem(9, 7))
+    return numbering
+
+
+def _ids(numbering):
+    return [(el.tag.split("}")[1],
+             el.get(qn("w:abstractNumId")) or el.get(qn("w:numId")))
+            for el in numbering]
+
+
+def test_allocates_from_counters_and_flushes_in_order():
+    numbering = _numbering()
+    reg = B.NumberingRegistry(numbering, strategy="per-task")
+    assert reg.add_num(reg.add_abstract_num(B.create_bullet_abstract_num)) == 10
+    assert reg.add_num(reg.add_abstract_num(B.create_decimal_abstract_num)) == 11
+    assert reg.num_format(4) == "bullet" and reg.num_format(11) == "decimal"
+    assert len(numbering) == 4
+    reg.flush()
+    assert _ids(numbering) == [
+        ("abstractNum", "3"), ("abstractNum", "7"),
+        ("abstractNum", "8"), ("abstractNum", "9"),
+        ("num", "4"), ("num", "9"), ("num", "10"), ("num", "11"),
+    ]
+
+
+def test_dedupe_reuses_identical_definition():
+    reg = B.NumberingRegistry(_numbering(), dedupe=True, strategy="per-task")
+    assert reg.add_abstract_num(B.create_bullet_abstract_num) == 3
+    assert reg.add_abstract_num(B.create_decimal_abstract_num, dedupe=False) == 8
+
+
+def test_shared_strategy_restarts_numbered_lists():
+    numbering = _numbering()
+    reg = B.NumberingRegistry(numbering, strategy="shared")
+    dec = [reg.new_list(B.create_decimal_abstract_num) for _ in range(3)]
+    bul = [reg.new_list(B.create_bullet_abstract_num) for _ in range(3)]
+    assert dec == [10, 11, 12] and bul == [13, 13, 13]
+    reg.flush()
+    assert len(numbering.findall(qn("w:abstractNum"))) == 2
+    for num_id in dec:
+        num = numbering.xpath(f'w:num[@w:numId="{num_id}"]', namespaces={"w": W})[0]
+        assert num.find(qn("w:abstractNumId")).get(qn("w:val")) == "7"
+        start = num.find(f'{qn("w:lvlOverride")}/{qn("w:startOverride")}')
+        assert start.get(qn("w:val")) == "1"
@@ -0,0 +1,59 @@
+"""
+swms_catalogue: compiled *_NEW dicts equal swms_generator's, stale
+detection on source change, and the lazy TaskDict view.
+"""
+
+import contextlib
+import io
+import os
+import pickle
+import sys
+from collections.abc import Mapping
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+import swms_catalogue  # noqa: E402
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import swms_generator  # noqa: E402
+
+
+def _plain(value):
+    """Mutable copy with lists for tuples, to compare frozen and source tasks."""
+    if isinstance(value, Mapping):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def test_compiled_catalogue_matches_generator(tmp_path):
+    path = str(tmp_path / "catalogue.json")
+    tasks = swms_catalogue.compile_catalogue(path)
+    assert _plain(tasks["REMEDIAL_NEW"]) == _plain(swms_generator.REMEDIAL_NEW)
+    assert set(tasks) == {n for n in vars(swms_generator) if n.endswith("_NEW")}
+    assert swms_catalogue.check_catalogue(path) == "ok"
+
+
+def test_stale_and_missing(tmp_path, monkeypatch):
+    path = str(tmp_path / "catalogue.json")
+    assert swms_catalogue.check_catalogue(path) == "missing"
+    swms_catalogue.compile_catalogue(path)
+    monkeypatch.setattr(swms_catalogue, "source_hash", lambda: "changed")
+    assert swms_catalogue.check_catalogue(path) == "stale"
+
+
+def test_task_dict_view_is_lazy_and_picklable():
+    view = pickle.loads(pickle.dumps(swms_catalogue.task_dict("SCREED_NEW")))
+    assert _plain(view) == _plain(swms_generator.SCREED_NEW)
+    assert view["screed_pumping"]["task"] == swms_generator.SCREED_NEW["screed_pumping"]["task"]
+
+
+def test_catalogue_tasks_are_read_only():
+    task = swms_catalogue.task_dict("SCREED_NEW")["screed_pumping"]
+    with pytest.raises(TypeError):
+        task["task"] = "changed"
+    assert all(not isinstance(v, (list, dict)) for v in task.values())
@@ -0,0 +1,30 @@
+"""
+clone_document(): a clone of an already-edited Document must be fully
+independent of the original, including the cached body proxy.
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from swms_docx_io import clone_document, load_template   # noqa: E402
+
+TEMPLATE = os.path.join(ROOT, "docs", "SWMS_Template.docx")
+
+
+def test_clone_of_edited_document_is_independent():
+    doc = load_template(TEMPLATE)
+    doc.add_paragraph("original")          # caches doc's body proxy
+    before = len(doc.paragraphs)
+
+    clone = clone_document(doc)
+    clone.add_paragraph("clone only")
+
+    assert len(doc.paragraphs) == before
+    assert len(clone.paragraphs) == before + 1
+    assert clone.element.body.getparent() is clone.element
+    assert clone.part.package.main_document_part is clone.part
+    assert clone.part.package is not doc.part.package
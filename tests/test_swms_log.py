@@ -0,0 +1,72 @@
+"""
+swms_log modes: text reproduces the old print() line, json carries the
+fields, off writes nothing, and collect() sees events in every mode.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+import swms_log  # noqa: E402
+
+LOG = swms_log.get_logger("test")
+
+
+def _emit():
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        swms_log.event(LOG, swms_log.INFO, "task_row",
+                       "  Task {index}: Reused row {key}", index=4, key=5)
+    return out.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def _restore_mode():
+    yield
+    swms_log.configure("text")
+
+
+def test_text_mode_matches_print():
+    swms_log.configure("text")
+    assert _emit() == "  Task 4: Reused row 5\n"
+
+
+def test_json_mode_carries_fields():
+    swms_log.configure("json")
+    record = json.loads(_emit())
+    assert record["event"] == "task_row"
+    assert record["msg"] == "  Task 4: Reused row 5"
+    assert (record["index"], record["key"]) == (4, 5)
+
+
+def test_off_mode_writes_nothing_but_collects():
+    swms_log.configure("off")
+    with swms_log.collect() as events:
+        assert _emit() == ""
+    assert [(e["event"], e["index"]) for e in events] == [("task_row", 4)]
+
+
+def test_level_filters_events():
+    swms_log.configure("text", "warning")
+    assert _emit() == ""
+
+
+def test_exc_info_attaches_traceback():
+    swms_log.configure("off")
+    with swms_log.collect() as events:
+        try:
+            raise ValueError("bad task key")
+        except ValueError as e:
+            swms_log.event(LOG, swms_log.ERROR, "build_failed", "  ERROR: {error}",
+                           exc_info=True, name="Groundworks", error=str(e))
+    (record,) = events
+    assert (record["event"], record["level"], record["name"]) == (
+        "build_failed", "error", "Groundworks")
+    assert record["exc"].splitlines()[-1] == "ValueError: bad task key"
@@ -0,0 +1,53 @@
+"""
+generate_swms() validation: task validators reject bad task text before
+the template is loaded; validators=[] skips validation.
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import swms_screed_pump as job                                  # noqa: E402
+from SWMS_BASE_GENERAL import (SWMSValidationError, generate_swms,  # noqa: E402
+                               validate_ppe_tasks)
+
+TEMPLATE = os.path.join(ROOT, "docs", "SWMS_Template.docx")
+
+# "resp" is not normalised — a bare "gloves" there reaches the tables
+BAD_TASKS = [dict(job.TASKS[0], resp="Leading hand — issue gloves")]
+
+
+def _generate(template, output, validators=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generate_swms(
+            template, output, BAD_TASKS, False, job.PROJECT, job.PPE_CONTENT,
+            job.PERMITS_CONTENT, job.QUALS_CONTENT, job.PLANT_CONTENT,
+            job.SUBSTANCES_CONTENT, job.LEGISLATION_APPEND,
+            validators=validators)
+
+
+def test_task_validator_names_task_and_field():
+    problems = validate_ppe_tasks(BAD_TASKS)
+    assert [(p["row"], p["col"]) for p in problems] == [(1, "resp")]
+    assert problems[0]["table"].startswith("Task 1: ")
+
+
+def test_bad_task_fails_before_template_is_loaded(tmp_path):
+    output = str(tmp_path / "out.docx")
+    with pytest.raises(SWMSValidationError) as excinfo:
+        _generate(str(tmp_path / "missing_template.docx"), output)
+    assert excinfo.value.problems[0]["col"] == "resp"
+    assert not os.path.exists(output)
+
+
+def test_empty_validators_skip_validation(tmp_path):
+    output = str(tmp_path / "out.docx")
+    _generate(TEMPLATE, output, validators=[])
+    assert os.path.exists(output)
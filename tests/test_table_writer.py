@@ -0,0 +1,105 @@
+"""
+Golden-file test for the Consolidated (tables[2]) and Detail (tables[3])
+table writers in SWMS_BASE_GENERAL.
+
+The golden XML was captured from the FROZEN python-docx cell writers
+before the fast table writer replaced them. Any difference in the
+generated table XML fails the test.
+
+Regenerate (only when the table output is meant to change):
+    python3 tests/test_table_writer.py
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+from lxml import etree
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import swms_22smith_spalling                      # noqa: E402
+import swms_screed_pump                           # noqa: E402
+from SWMS_BASE_GENERAL import _build_document     # noqa: E402
+
+TEMPLATE = os.path.join(ROOT, "docs", "SWMS_Template.docx")
+GOLDEN_DIR = os.path.join(HERE, "golden")
+
+# Edge cases the job files don't reach: CCVS marker auto-prepend, every
+# risk colour, tabs/newlines/padding in run text, detail truncation.
+EDGE_TASKS = [
+    {
+        "task": "Pressure Test\n\tIsolate line, then test",
+        "hazard": "  Hose whip\tand injection injury  ",
+        "pre": 9,
+        "controls": "HOLD POINT: pump isolated\nSTOP WORK: leak found\n" + "x" * 1450,
+        "control_summary": "Engineering: whip checks; Admin: permit; PPE: face shield",
+        "post": 4,
+        "resp": "Supervisor",
+        "audit": "CCVS-9-3-ENE",
+    },
+    {
+        "task": "Surface Prep",
+        "hazard": "Dust",
+        "pre": 1,
+        "controls": "CCVS HOLD POINTS: none\nAdmin: sweep\r\nPPE: P2 mask",
+        "post": 2,
+        "resp": "Leading hand",
+        "audit": "STD-1-1-ENV",
+    },
+    {
+        "task": "Cleanup",
+        "hazard": "Slips",
+        "pre": 3,
+        "controls": "GENERAL: housekeeping",
+        "post": 1,
+        "resp": "All",
+        "audit": "STD-3-1-ENV",
+    },
+]
+
+JOBS = {
+    "screed": (swms_screed_pump, swms_screed_pump.TASKS),
+    "22smith": (swms_22smith_spalling, swms_22smith_spalling.TASKS),
+    "edge": (swms_screed_pump, EDGE_TASKS),
+}
+TABLES = {2: "consolidated", 3: "detail"}
+
+
+def _table_xml(job_name):
+    """Populate the template for a job; return {table name: tbl XML bytes}."""
+    job, tasks = JOBS[job_name]
+    with contextlib.redirect_stdout(io.StringIO()):
+        doc, _ = _build_document(
+            TEMPLATE, tasks, job.PROJECT, job.PPE_CONTENT,
+            job.PERMITS_CONTENT, job.QUALS_CONTENT, job.PLANT_CONTENT,
+            job.SUBSTANCES_CONTENT, job.LEGISLATION_APPEND, bullets=False,
+        )
+    return {
+        label: etree.tostring(doc.tables[idx]._tbl, encoding="UTF-8")
+        for idx, label in TABLES.items()
+    }
+
+
+def _golden_path(job_name, label):
+    return os.path.join(GOLDEN_DIR, f"{job_name}_{label}.xml")
+
+
+@pytest.mark.parametrize("job_name", sorted(JOBS))
+def test_tables_match_golden(job_name):
+    for label, xml in _table_xml(job_name).items():
+        with open(_golden_path(job_name, label), "rb") as f:
+            assert xml == f.read(), f"{job_name} {label} table differs from golden"
+
+
+if __name__ == "__main__":
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    for job_name in sorted(JOBS):
+        for label, xml in _table_xml(job_name).items():
+            with open(_golden_path(job_name, label), "wb") as f:
+                f.write(xml)
+            print(f"  ✓ {_golden_path(job_name, label)}")
@@ -0,0 +1,68 @@
+"""
+vocab_tool dedupe: MinHash/LSH clusters find reworded entries, leave
+unrelated ones alone, and near_duplicates() backs the add_entry warning.
+"""
+
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+import vocab_tool  # noqa: E402
+
+PHRASES = {
+    "temp_outside_range": "Temperature outside product application range",
+    "product_temp_outside": "Product temperature outside application range",
+    "services_in_path": "Services detected in cutting path",
+    "engineer_hold": "Structural engineer advises hold",
+}
+
+
+def test_clusters_reworded_phrases_only():
+    clusters = vocab_tool.duplicate_clusters(PHRASES)
+    assert len(clusters) == 1
+    keys, scored = clusters[0]
+    assert keys == ["product_temp_outside", "temp_outside_range"]
+    assert scored[0][0] > 0.7
+
+
+def test_near_duplicates_for_new_entry():
+    similar = vocab_tool.near_duplicates(
+        "STOP_WORK", "Temperature outside the product application range")
+    assert "temp_outside_range" in [key for _, key in similar]
+    assert vocab_tool.near_duplicates("STOP_WORK", "Crane boom contacts power line") == []
+
+
+def _brute_force_pairs(entries, threshold=vocab_tool.DEDUPE_THRESHOLD):
+    grams = {key: vocab_tool.shingles(phrase) for key, phrase in entries.items()}
+    keys = sorted(entries)
+    return {(a, b) for i, a in enumerate(keys) for b in keys[i + 1:]
+            if vocab_tool.jaccard(grams[a], grams[b]) >= threshold}
+
+
+def test_lsh_pairs_match_brute_force_for_every_seed():
+    index = vocab_tool.get_index()
+    for kind in vocab_tool.DEDUPE_TARGETS.values():
+        entries = index.entries[kind]
+        expected = _brute_force_pairs(entries)
+        for seed in range(8):
+            lsh = vocab_tool.MinHashLSH(seed=seed)
+            for key, phrase in entries.items():
+                lsh.add(key, phrase)
+            assert set(lsh.pairs()) == expected, (kind, seed)
+
+
+
+def test_minhash_is_stable_across_processes():
+    code = ("import vocab_tool; "
+            "print(vocab_tool.minhash(vocab_tool.shingles('Manual handling of heavy bags')))")
+    outputs = set()
+    for hash_seed in ("4", "7"):
+        env = dict(os.environ, PYTHONHASHSEED=hash_seed,
+                   PYTHONPATH=os.path.join(os.path.dirname(HERE), "src"))
+        outputs.add(subprocess.run([sys.executable, "-c", code], env=env,
+                                   capture_output=True, text=True,
+                                   check=True).stdout)
+    assert len(outputs) == 1
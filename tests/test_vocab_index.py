@@ -0,0 +1,65 @@
+"""
+VocabularyIndex: reverse lookups, normalised lookups, one-pass
+decomposition (longest phrase, word boundaries) and the disk cache.
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+import vocab_index  # noqa: E402
+
+INDEX = vocab_index.VocabularyIndex({
+    "hazard": {"silica_dust_cutting": "Silica dust from slot cutting"},
+    "ppe": {
+        "eye_protection": "Eye protection",
+        "eye_protection_goggles": "Eye protection or goggles",
+        "hard_hat": "Hard hat",
+        "p2_respirator": "P2 respirator (minimum)",
+        "p2_dust_mask": "P2 respirator (minimum)",
+    },
+    "stop_work": {"dust": "Dust extraction fails — Visible dust plume"},
+})
+
+
+def test_lookups():
+    assert INDEX.phrase("ppe", "hard_hat") == "Hard hat"
+    assert INDEX.lookup("Hard hat") == ("ppe", "hard_hat")
+    assert INDEX.lookup("hard  HAT") is None
+    assert INDEX.lookup("hard  HAT", normalised=True) == ("ppe", "hard_hat")
+    assert INDEX.lookup("dust extraction FAILS - visible dust plume",
+                        normalised=True) == ("stop_work", "dust")
+    assert INDEX.keys_for("P2 respirator (minimum)") == [
+        ("ppe", "p2_respirator"), ("ppe", "p2_dust_mask")]
+
+
+def test_count_present_counts_substring_hits_ignoring_case():
+    # "Eye protection" nested in the goggles phrase and "Hard hat" inside
+    # "hard hats" both count; the duplicated P2 phrase counts once
+    text = "EYE PROTECTION OR GOGGLES, hard hats, P2 respirator (minimum)"
+    assert INDEX.count_present(text) == 4
+
+
+def test_decompose_longest_match_and_boundaries():
+    text = "Silica dust from slot cutting. Eye protection or goggles, hard hats."
+    matches, leftovers = INDEX.decompose(text)
+    assert [(m.key, text[m.start:m.end]) for m in matches] == [
+        ("silica_dust_cutting", "Silica dust from slot cutting"),
+        ("eye_protection_goggles", "Eye protection or goggles"),
+    ]
+    assert leftovers == ["hard hats"]
+    matches, _ = INDEX.decompose(text, kinds=("ppe",))
+    assert [m.kind for m in matches] == ["ppe"]
+
+
+def test_disk_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(vocab_index, "CACHE_DIR", str(tmp_path))
+    built = vocab_index.load_index()
+    assert len(os.listdir(tmp_path)) == 1
+    cached = vocab_index.load_index()
+    assert cached.source_hash == built.source_hash
+    assert cached.entries == built.entries
+    phrase = built.phrase("ppe", "steel_cap")
+    assert [m.key for m in cached.find_all(phrase)] == ["steel_cap"]
@@ -0,0 +1,56 @@
+"""
+vocab_migrate: raw task dicts segmented into existing and proposed
+vocabulary keys, and the emitted new_task() call rebuilding the same row
+text.
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+import vocab_migrate  # noqa: E402
+from vocab_index import get_index  # noqa: E402
+
+INDEX = get_index()
+HAZARD = INDEX.phrase("hazard", "silica_dust_cutting")
+CONTROL = INDEX.phrase("control", "vacuum_blade_guard")
+PPE = INDEX.phrase("ppe", "steel_cap")
+
+TASK = {
+    "task": "Slot Cutting", "task_desc": "Cut slots in façade masonry.",
+    "hazard": f"{HAZARD}. Hidden voids in façade — Collapse. Noise.",
+    "risk_pre": "Medium (4)", "risk_post": "Low (2)", "code": "SIL-M4",
+    "resp": "Supervisor / Worker / Sub-Contract Worker", "type": "STD",
+    "control": [
+        ("Engineering:", f"{CONTROL} — Blade guard inspected — Water on hand."),
+        ("Admin:", "Permit issued."),
+        ("PPE:", f"{PPE}, Face shield"),
+        ("STOP WORK if:", "Voids found — Cracking spreads"),
+    ],
+}
+
+
+def test_segments_into_existing_and_proposed_keys():
+    migration = vocab_migrate.Migration(INDEX)
+    kwargs, _ = migration.convert(TASK)
+    assert kwargs["hazard_keys"] == [
+        "silica_dust_cutting", "hidden_voids_facade_collapse", "noise"]
+    assert kwargs["engineering"] == [
+        "vacuum_blade_guard", "blade_guard_inspected_water"]
+    assert kwargs["ppe_keys"] == ["steel_cap", "face_shield"]
+    assert len(kwargs["stop_work_keys"]) == 1
+    assert migration.proposals["hazard"]["Noise"] == "noise"
+    assert "responsibility" not in kwargs and "ccvs" not in kwargs
+
+
+def test_round_trip_rebuilds_row_text():
+    migration = vocab_migrate.Migration(INDEX)
+    kwargs, _ = migration.convert(TASK)
+    source = vocab_migrate.format_call("slot_cutting", kwargs)
+    assert vocab_migrate.round_trip(TASK, source, migration.proposals)
+    changed = dict(TASK, hazard=TASK["hazard"].replace("Noise", "Dust"))
+    assert not vocab_migrate.round_trip(changed, source, migration.proposals)
+    import swms_vocabulary
+    assert "noise" not in swms_vocabulary.HAZARDS   # proposals removed again
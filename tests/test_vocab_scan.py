@@ -0,0 +1,83 @@
+"""
+vocab_scan: task dicts and new_task() calls found through the AST —
+implicit concatenation, double quotes, \\u escapes, controls sections and
+markdown code blocks — scored against the vocabulary index.
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+import vocab_index  # noqa: E402
+import vocab_scan  # noqa: E402
+
+INDEX = vocab_index.VocabularyIndex({
+    "hazard": {"noise_cutting": "Noise from cutting"},
+    "control": {"vacuum_blade_guard": "Vacuum blade guard fitted"},
+    "ppe": {"hard_hat": "Hard hat", "steel_cap": "Steel-capped footwear"},
+    "stop_work": {"dust": "Dust extraction fails"},
+})
+
+SOURCE = '''
+TASKS = [
+    {
+        "task": "Slot Cutting\\nCut slots.",
+        "hazard": (
+            "Noise from "
+            "cutting. Flying debris."
+        ),
+        "controls": (
+            "SIL (High): Controls in place.\\n"
+            "Engineering: Vacuum blade guard fitted.\\n"
+            "PPE: Hard hat, Steel\\u2011capped footwear.\\n"
+            "STOP WORK if: Dust extraction fails."
+        ),
+    },
+    new_task(name='Vocab', hazard_keys=['noise_cutting'],
+             engineering=['vacuum_blade_guard', 'Raw control'],
+             admin=[], ppe_keys=['hard_hat', 'missing_key'],
+             stop_work_keys=['dust']),
+    {"task": name, "hazard": hazard_string},
+]
+'''
+
+
+def test_scan_source_resolves_fields():
+    tasks = vocab_scan.scan_source(SOURCE, "job.py", INDEX)["tasks"]
+    assert [(t["line"], t["style"], t["name"]) for t in tasks] == [
+        (3, "dict", "Slot Cutting"), (16, "new_task", "Vocab")]
+    raw, vocab = tasks
+    assert raw["fields"]["hazard"]["leftovers"] == ["Flying debris"]
+    assert {k: f["covered"] == f["total"] for k, f in raw["fields"].items()} == {
+        "hazard": False, "control": True, "ppe": True, "stop_work": True}
+    assert vocab["fields"]["control"]["leftovers"] == ["Raw control"]
+    assert vocab["unknown_keys"] == [["ppe", "missing_key"]]
+
+
+def test_markdown_blocks_keep_file_line_numbers():
+    text = "# Library\n\n```python\n{\n    'task': 'T',\n    'hazard': 'Noise from cutting',\n},\n```\n"
+    result = vocab_scan.scan_source(text, "LIB.md", INDEX)
+    assert [t["line"] for t in result["tasks"]] == [4]
+    assert vocab_scan.coverage([t["fields"] for t in result["tasks"]]) == 1.0
+
+
+def test_forwarding_new_task_call_is_not_a_definition():
+    source = "def rebuild(kwargs):  # hazard_keys etc.\n    return B.new_task(**kwargs)\n"
+    assert vocab_scan.scan_source(source, "tool.py", INDEX)["tasks"] == []
+    source = "new_task(name='Vocab', hazard_keys=['noise_cutting'])\n"
+    assert len(vocab_scan.scan_source(source, "job.py", INDEX)["tasks"]) == 1
+
+
+def test_cache_key_covers_index_and_matcher_code(tmp_path, monkeypatch):
+    for filename in vocab_scan.CACHE_SOURCES:
+        with open(os.path.join(vocab_scan._script_dir, filename), "rb") as f:
+            (tmp_path / filename).write_bytes(f.read())
+    monkeypatch.setattr(vocab_scan, "_script_dir", str(tmp_path))
+    keys = {vocab_scan._cache_key(INDEX)}
+    for filename in ("vocab_index.py", "phrase_matcher.py"):
+        with open(tmp_path / filename, "a") as f:
+            f.write("\n# changed\n")
+        keys.add(vocab_scan._cache_key(INDEX))
+    assert len(keys) == 3